@@ -0,0 +1,161 @@
+#!/bin/python
+# version 3.8 required
+
+from typing import Dict, List, Tuple
+from dimod import DiscreteQuadraticModel # type: ignore
+import numpy as np # type: ignore
+from scipy.sparse import csr_matrix # type: ignore
+
+from Annealing_QUBO.sparse_qubo import SparseQUBO
+
+
+class CaseTables(object):
+  '''
+  holds the biases of a discrete model as flat tables over the cases of all variables
+  the cases of variable v have the indices case_starts[v] to case_starts[v + 1] - 1
+  the energy of a sample x (case of every variable) is the sum of linear[x_v]
+  and the couplings between the cases x_u and x_v of every pair of variables u < v
+  '''
+  case_starts: np.ndarray # index of the first case of every variable, the last entry is the number of cases
+  linear: np.ndarray # linear bias of every case
+  couplings: csr_matrix # symmetric matrix of the quadratic biases between cases
+
+  def __init__(self, case_starts: np.ndarray, linear: np.ndarray, rows: np.ndarray, cols: np.ndarray,
+               values: np.ndarray) -> None:
+    '''
+    initializes the tables
+
+    :case_starts: index of the first case of every variable, the last entry is the number of cases
+    :linear: linear bias of every case
+    :rows: first case of every quadratic bias (without duplicates of the pair in reversed order)
+    :cols: second case of every quadratic bias
+    :values: weights of the quadratic biases
+    '''
+    self.case_starts = np.asarray(case_starts, dtype=np.int64)
+    self.linear = np.asarray(linear, dtype=np.float64)
+
+    num_cases: int = len(self.linear)
+    couplings: csr_matrix = csr_matrix((values, (rows, cols)), shape=(num_cases, num_cases))
+    self.couplings = (couplings + couplings.T).tocsr()
+
+  @staticmethod
+  def from_dqm(dqm: DiscreteQuadraticModel):
+    '''
+    creates the tables of a DQM, the variables are ordered like dqm.variables
+
+    :dqm: DQM instance
+    '''
+    vectors: Tuple = dqm.to_numpy_vectors()
+    case_starts, linear, (rows, cols, values) = vectors[:3]
+
+    return CaseTables(np.append(case_starts, len(linear)), linear, rows, cols, values)
+
+  @staticmethod
+  def from_qubo(qubo: SparseQUBO):
+    '''
+    creates the tables of a QUBO, every binary variable has the cases 0 and 1
+    only the case 1 has biases
+
+    :qubo: QUBO instance
+    '''
+    rows, cols, values = qubo.to_coo()
+    diagonal: np.ndarray = rows == cols
+
+    linear: np.ndarray = np.zeros(2 * qubo.num_variables)
+    np.add.at(linear, 2 * rows[diagonal] + 1, values[diagonal])
+
+    return CaseTables(
+      np.arange(0, 2 * qubo.num_variables + 1, 2), linear,
+      2 * rows[~diagonal] + 1, 2 * cols[~diagonal] + 1, values[~diagonal]
+    )
+
+  @property
+  def num_variables(self) -> int:
+    '''
+    number of discrete variables
+    '''
+    return len(self.case_starts) - 1
+
+  @property
+  def num_cases(self) -> int:
+    '''
+    number of cases of all variables
+    '''
+    return len(self.linear)
+
+  def get_variable_blocks(self) -> List[Tuple[np.ndarray, np.ndarray]]:
+    '''
+    returns for every variable the cases interacting with it
+    and the dense block of the couplings with the shape (number of cases of the variable, number of interacting cases)
+    '''
+    blocks: List[Tuple[np.ndarray, np.ndarray]] = []
+
+    for v in range(self.num_variables):
+      rows: csr_matrix = self.couplings[self.case_starts[v]:self.case_starts[v + 1]]
+      neighbours: np.ndarray = np.unique(rows.indices)
+      blocks.append((neighbours, rows[:, neighbours].toarray()))
+
+    return blocks
+
+  def get_interactions(self) -> Dict[Tuple[int, int], np.ndarray]:
+    '''
+    returns the dense blocks of the couplings between all pairs of interacting variables u < v
+    the block of (u, v) has the shape (number of cases of u, number of cases of v)
+    '''
+    coo = self.couplings.tocoo()
+    upper: np.ndarray = coo.row < coo.col
+    rows: np.ndarray = np.searchsorted(self.case_starts, coo.row[upper], side='right') - 1
+    cols: np.ndarray = np.searchsorted(self.case_starts, coo.col[upper], side='right') - 1
+
+    interactions: Dict[Tuple[int, int], np.ndarray] = {}
+    for u, v in sorted(set(zip(rows.tolist(), cols.tolist()))):
+      interactions[u, v] = self.couplings[
+        self.case_starts[u]:self.case_starts[u + 1], self.case_starts[v]:self.case_starts[v + 1]
+      ].toarray()
+
+    return interactions
+
+  def get_fields(self, x: np.ndarray) -> np.ndarray:
+    '''
+    computes the energy of every case given the cases of all other variables in several samples
+
+    :x: case of every variable (not offset by the case starts) with the shape (number of variables, number of samples)
+    '''
+    active: np.ndarray = self.case_starts[:-1, None] + x
+    num_samples: int = x.shape[1]
+
+    indicators: csr_matrix = csr_matrix(
+      (np.ones(active.size), (active.ravel(), np.tile(np.arange(num_samples), self.num_variables))),
+      shape=(self.num_cases, num_samples)
+    )
+
+    return self.linear[:, None] + (self.couplings @ indicators).toarray()
+
+  def compute_energies(self, x: np.ndarray) -> np.ndarray:
+    '''
+    computes the energies of several samples
+
+    :x: case of every variable with the shape (number of variables, number of samples)
+    '''
+    active: np.ndarray = self.case_starts[:-1, None] + x
+    fields: np.ndarray = np.take_along_axis(self.get_fields(x), active, axis=0)
+
+    # every coupling is contained in the fields of both variables
+    return np.sum(self.linear[active] + fields, axis=0) / 2
+
+  def get_beta_range(self) -> Tuple[float, float]:
+    '''
+    chooses the inverse temperatures such that at the start the largest possible energy change
+    is accepted with probability 1/2 and at the end the smallest bias is accepted with probability 1/100
+    '''
+    magnitudes: np.ndarray = np.concatenate((np.abs(self.linear), np.abs(self.couplings.data)))
+    magnitudes = magnitudes[magnitudes > 0]
+
+    if len(magnitudes) == 0:
+      return 1., 1.
+
+    case_deltas: np.ndarray = np.abs(self.linear) + np.asarray(abs(self.couplings).sum(axis=1)).ravel()
+    max_delta: float = 2 * float(np.max(case_deltas))
+    min_delta: float = float(np.min(magnitudes))
+
+    return np.log(2) / max_delta, np.log(100) / min_delta
@@ -1,13 +1,18 @@
 #!/bin/python
 # version 3.8 required
 
-from typing import Any, List
+from dataclasses import asdict
+from typing import Any, Dict, List, Optional, Tuple
 from dimod import DiscreteQuadraticModel # type: ignore
 from dimod.sampleset import SampleSet # type: ignore
 import numpy as np # type: ignore
 
+from Annealing_QUBO.qubo_indices import QUBOIndices
+from UCP.model_cache import ModelCache
+from UCP.model_statistics import ModelStatistics, get_nbytes
 from UCP.unit_commitment_problem import CombustionPlant, UCP, UCPSolution
 from Util.logging import debug_msg_time
+from Util.timing import Timings
 
 
 class UCP_DQM(object):
@@ -18,6 +23,14 @@ class UCP_DQM(object):
   ucp: UCP
   p: List[List[Any]] # variables of model
   P: List[np.ndarray] # discretizised power levels
+  cases: QUBOIndices # indices of the cases of all variables
+  case_starts: np.ndarray # index of the first case of every variable
+  linear_components: Dict[str, np.ndarray] # unscaled linear biases of every case
+  quadratic_components: Dict[str, np.ndarray] # unscaled quadratic biases, stored in blocks
+  quadratic_block_starts: np.ndarray # first quadratic bias of every block, the last entry is the number of biases
+  quadratic_block_variables: List[Tuple[int, int]] # pair of interacting variables of every block
+  factors: Dict[str, float] # factors of the components
+  timings: Timings # time of building the DQM
 
   def map_indices(self, i: int, t: int) -> int:
     '''
@@ -28,6 +41,13 @@ class UCP_DQM(object):
     '''
     return i * self.ucp.parameters.num_loads + t
 
+  def get_time_layers(self) -> List[List[int]]:
+    '''
+    returns the labels of the variables of every time step
+    variables only interact inside a time step or with the same plant in the neighbouring time steps
+    '''
+    return [[self.p[i][t] for i in range(self.ucp.parameters.num_plants)] for t in range(self.ucp.parameters.num_loads)]
+
   def discretizise_plants(self, max_h: float) -> None:
     '''
     discretizes the power levels of all plants
@@ -38,17 +58,20 @@ class UCP_DQM(object):
 
   def init_variables(self) -> None:
     '''
-    instantiates the variables of the DQM
+    instantiates the labels of the variables and the indices of their cases
+    the case k of variable p[i][t] has the index cases[i, t, k]
     '''
-    self.p = []
+    self.p = [[self.map_indices(i, t) for t in range(self.ucp.parameters.num_loads)]
+                                      for i in range(self.ucp.parameters.num_plants)]
 
-    for i in range(self.ucp.parameters.num_plants):
-      p_i: List[Any] = []
-      var_size: int = len(self.P[i])
+    self.cases = QUBOIndices([len(P_i) for P_i in self.P], self.ucp.parameters.num_loads)
 
-      for _ in range(self.ucp.parameters.num_loads):
-        p_i.append(self.model.add_variable(var_size))
-      self.p.append(p_i)
+    # the variables are ordered as specified by map_indices
+    self.case_starts = self.cases.to_index(
+      np.repeat(np.arange(self.ucp.parameters.num_plants), self.ucp.parameters.num_loads),
+      np.tile(np.arange(self.ucp.parameters.num_loads), self.ucp.parameters.num_plants),
+      0
+    )
 
   def calculate_F_i(self, plant: CombustionPlant, i: int) -> np.array:
     '''
@@ -65,34 +88,37 @@ class UCP_DQM(object):
 
     return np.array(F_i)
 
-  def set_linear(self, y_c: float, y_s: float, y_d: float) -> None:
+  def build_linear(self) -> None:
     '''
-    sets the linear biases for the DQM
+    builds the unscaled linear biases of the cost, demand and startup and shutdown components
     '''
-    for i in range(len(self.p)):
+    self.linear_components = {name: np.zeros(self.cases.num_variables) for name in ('c', 'd', 's')}
+    loads: np.ndarray = np.array(self.ucp.loads, dtype=float)
+
+    for i in range(self.ucp.parameters.num_plants):
       P_i: np.ndarray = self.P[i]
       plant: CombustionPlant = self.ucp.plants[i]
-      F_i: np.ndarray = self.calculate_F_i(plant, i)
-
-      for t in range(len(self.p[i])):
-        linear_biases: np.ndarray = y_c * F_i + y_d * (
-          P_i * P_i - self.ucp.loads[t] * P_i
-        ) # implements formula for linear biases of the report
+      cases_i: np.ndarray = self.cases.get_plant_indices(i)
 
-        if t == 0: # if t is 0, add initial startup or shutdown costs
-          if plant.initially_on:
-            linear_biases[0] += y_s * plant.AD
+      # implements formula for linear biases of the report
+      self.linear_components['c'][cases_i] = self.calculate_F_i(plant, i)
+      self.linear_components['d'][cases_i] = P_i * P_i - loads[:, np.newaxis] * P_i
 
-          else:
-            for k in range(1, len(linear_biases)):
-              linear_biases[k] += y_s * plant.AU
+      # add initial startup or shutdown costs at t = 0
+      if plant.initially_on:
+        self.linear_components['s'][cases_i[0, 0]] = plant.AD
 
-        self.model.set_linear(self.p[i][t], linear_biases)
+      else:
+        self.linear_components['s'][cases_i[0, 1:]] = plant.AU
 
-  def set_quadratic_startup(self, y_s: float) -> None:
+  def build_quadratic_startup(self) -> Tuple[List[Tuple[int, int]], List[np.ndarray]]:
     '''
-    sets the quadratic biases for the startup costs for the DQM
+    builds the unscaled quadratic biases for the startup costs
+    returns the pairs of interacting variables and their flattened biases
     '''
+    variables: List[Tuple[int, int]] = []
+    values: List[np.ndarray] = []
+
     for i in range(self.ucp.parameters.num_plants):
       # compute once for every plant i
       plant: CombustionPlant = self.ucp.plants[i]
@@ -103,27 +129,132 @@ class UCP_DQM(object):
         quadratic_biases[0, k] = plant.AU
         quadratic_biases[k, 0] = plant.AD
 
-      quadratic_biases *= y_s
-
+      # apply for one plant i at every time t > 0
       for t in range(1, self.ucp.parameters.num_loads):
-        # apply for one plant i at every time t > 0
-        self.model.set_quadratic(self.p[i][t-1], self.p[i][t], quadratic_biases)
+        variables.append((self.p[i][t-1], self.p[i][t]))
+        values.append(quadratic_biases.ravel())
+
+    return variables, values
 
-  def set_quadratic_demand(self, y_d: float) -> None:
+  def build_quadratic_demand(self) -> Tuple[List[Tuple[int, int]], List[np.ndarray]]:
     '''
-    sets the quadratic biases for the demand for the DQM
+    builds the unscaled quadratic biases for the demand
+    returns the pairs of interacting variables and their flattened biases
     '''
+    variables: List[Tuple[int, int]] = []
+    values: List[np.ndarray] = []
+
     for j in range(1, self.ucp.parameters.num_plants):
       for i in range(j):
         # compute once for every pair of plants i, j (i < j)
         quadratic_biases: np.ndarray = np.tensordot(self.P[i], self.P[j], axes=0)
-        quadratic_biases *= y_d
 
+        # apply for one pair of plants i, j at every time t
         for t in range(self.ucp.parameters.num_loads):
-          # apply for one pair of plants i, j at every time t
-          self.model.set_quadratic(self.p[i][t], self.p[j][t], quadratic_biases)
+          variables.append((self.p[i][t], self.p[j][t]))
+          values.append(quadratic_biases.ravel())
+
+    return variables, values
 
-  def __init__(self, ucp: UCP, y_c: float = 1, y_s: float = 1, y_d: float = 1, max_h: float = 10) -> None:
+  def build_components(self) -> None:
+    '''
+    builds the unscaled components of the DQM
+    the components are combined in the order cost, demand, startup and shutdown
+    the quadratic biases of every pair of interacting variables are stored contiguously in blocks
+    '''
+    self.build_linear()
+
+    startup_variables, startup_values = self.build_quadratic_startup()
+    demand_variables, demand_values = self.build_quadratic_demand()
+
+    block_values: List[np.ndarray] = startup_values + demand_values
+    self.quadratic_block_variables = startup_variables + demand_variables
+    self.quadratic_block_starts = np.cumsum([0] + [len(values) for values in block_values]).astype(np.int64)
+
+    # the quadratic biases of the components do not overlap
+    num_startup: int = int(self.quadratic_block_starts[len(startup_values)])
+    num_biases: int = int(self.quadratic_block_starts[-1])
+    self.quadratic_components = {name: np.zeros(num_biases) for name in ('c', 'd', 's')}
+
+    self.quadratic_components['s'][:num_startup] = np.concatenate(startup_values or [np.zeros(0)])
+    self.quadratic_components['d'][num_startup:] = np.concatenate(demand_values or [np.zeros(0)])
+
+  def load_components(self, cache: ModelCache, max_h: float) -> None:
+    '''
+    loads the unscaled components from a cache or builds and stores them
+    the components do not depend on the factors, so one entry serves all factors
+
+    :cache: cache of encoded models
+    :max_h: maximum difference of non-zero power levels
+    '''
+    key: str = cache.get_key(self.ucp, 'dqm', max_h=max_h)
+    arrays: Optional[Dict[str, np.ndarray]] = cache.load(key)
+
+    if arrays is not None:
+      self.linear_components = {name: arrays['linear_' + name] for name in ('c', 'd', 's')}
+      self.quadratic_components = {name: arrays['quadratic_' + name] for name in ('c', 'd', 's')}
+      self.quadratic_block_starts = arrays['quadratic_block_starts']
+      self.quadratic_block_variables = [(int(u), int(v)) for u, v in arrays['quadratic_block_variables']]
+
+    else:
+      self.build_components()
+      cache.store(key, {
+        **{'linear_' + name: values for name, values in self.linear_components.items()},
+        **{'quadratic_' + name: values for name, values in self.quadratic_components.items()},
+        'quadratic_block_starts': self.quadratic_block_starts,
+        'quadratic_block_variables': np.array(self.quadratic_block_variables, dtype=np.int64).reshape(-1, 2)
+      })
+
+  def reweight(self, y_c: Optional[float] = None, y_s: Optional[float] = None,
+               y_d: Optional[float] = None) -> DiscreteQuadraticModel:
+    '''
+    combines the unscaled components to the DQM with new factors
+    factors that are not specified keep their current value
+    there is no factor for the power level constraints, because the DQM variables take exactly one case
+
+    :y_c: factor of objective function
+    :y_s: factor of startup and shutdown cost
+    :y_d: factor of demand constraints
+    '''
+    for name, factor in (('c', y_c), ('s', y_s), ('d', y_d)):
+      if factor is not None:
+        self.factors[name] = factor
+
+    linear: np.ndarray = np.zeros(self.cases.num_variables)
+    quadratic: np.ndarray = np.zeros(int(self.quadratic_block_starts[-1]))
+    for name in ('c', 'd', 's'):
+      linear = linear + self.factors[name] * self.linear_components[name]
+      quadratic = quadratic + self.factors[name] * self.quadratic_components[name]
+
+    self.model = DiscreteQuadraticModel.from_numpy_vectors(
+      self.case_starts, linear, (np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64), np.zeros(0))
+    )
+
+    # set the quadratic biases of every pair of interacting variables at once
+    for (u, v), start, end in zip(self.quadratic_block_variables,
+                                  self.quadratic_block_starts[:-1].tolist(), self.quadratic_block_starts[1:].tolist()):
+      self.model.set_quadratic(u, v, quadratic[start:end].reshape(self.model.num_cases(u), self.model.num_cases(v)))
+
+    return self.model
+
+  def get_statistics(self) -> ModelStatistics:
+    '''
+    returns the size of the DQM, the variables are the cases of the discrete variables
+    the memory contains the unscaled components and the DQM as numpy vectors
+    (case starts, linear biases and the coordinates and values of the quadratic biases)
+    '''
+    num_cases: int = self.model.num_cases()
+    couplers: int = self.model.num_case_interactions()
+
+    components: int = get_nbytes([
+      *self.linear_components.values(), *self.quadratic_components.values(), self.quadratic_block_starts
+    ])
+    vectors: int = self.case_starts.nbytes + num_cases * 8 + couplers * (8 + 2 * self.case_starts.itemsize)
+
+    return ModelStatistics.from_quadratic(num_cases, couplers, components + vectors)
+
+  def __init__(self, ucp: UCP, y_c: float = 1, y_s: float = 1, y_d: float = 1, max_h: float = 10,
+               cache: Optional[ModelCache] = None) -> None:
     '''
     generates a MINLP from an UCP instance using the ocean-sdk
 
@@ -132,16 +263,41 @@ class UCP_DQM(object):
     :y_s: factor of startup and shutdown cost
     :y_d: factor of demand constraints
     :max_h: maximum difference of non-zero power levels, default: 10
+    :cache: cache of encoded models, default: the cache given by the environment variable UCP_MODEL_CACHE (if set)
     '''
-    self.model = DiscreteQuadraticModel()
     self.ucp = ucp
+    self.factors = {'c': y_c, 's': y_s, 'd': y_d}
+    self.timings = Timings()
+
+    with self.timings.phase('build'):
+      self.discretizise_plants(max_h)
+      self.init_variables()
+
+      cache = cache or ModelCache.get_default()
+      if cache is not None:
+        self.load_components(cache, max_h)
+      else:
+        self.build_components()
+
+      self.reweight()
+
+  def get_variables_from_samples(self, samples: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    '''
+    computes the UCP variables from several DQM solutions at once
+    returns the commitment and power output of plants with the shape (number of solutions, number of plants, number of loads)
 
-    self.discretizise_plants(max_h)
-    self.init_variables()
+    :samples: DQM solutions with the shape (number of solutions, number of variables), ordered by the variable labels
+    '''
+    cases: np.ndarray = np.atleast_2d(np.asarray(samples)).astype(np.int64)
+    cases = cases.reshape(cases.shape[0], self.ucp.parameters.num_plants, self.ucp.parameters.num_loads)
+
+    # power levels of all plants padded to the same number of cases
+    levels: np.ndarray = np.zeros((self.ucp.parameters.num_plants, max(len(P_i) for P_i in self.P)))
+    for i, P_i in enumerate(self.P):
+      levels[i, :len(P_i)] = P_i
 
-    self.set_linear(y_c, y_s, y_d)
-    self.set_quadratic_startup(y_s)
-    self.set_quadratic_demand(y_d)
+    p: np.ndarray = levels[np.arange(self.ucp.parameters.num_plants)[:, np.newaxis], cases]
+    return p > 0, p
 
   def get_variables_from_sample(self, sample: List[float], u: List[List[bool]], p: List[List[float]]) -> None:
     '''
@@ -151,38 +307,36 @@ class UCP_DQM(object):
     :u: commitment of plants (output variable)
     :p: power output of plants (output variable)
     '''
-    for i in range(self.ucp.parameters.num_plants):
-      u.append([])
-      p.append([])
+    u_batch, p_batch = self.get_variables_from_samples(np.asarray(sample)[np.newaxis, :])
 
-      for t in range(self.ucp.parameters.num_loads):
-        value_index: int = int(sample[self.map_indices(i, t)])
-        value: float = self.P[i][value_index]
-
-        p[i].append(value)
-        u[i].append((bool) (p[i][t] > 0))
+    u.extend(u_batch[0].tolist())
+    p.extend(p_batch[0].tolist())
 
   def optimize(self, sampler, adjust: bool = True) -> UCPSolution:
     '''
     optimizes the DQM using a specified sampler
+    all samples returned by the sampler are decoded and the best (feasible) one is chosen
 
     :sampler: sampler used to optimize the DQM
-    :adjust: whether the result should be adjusted to meet power demand at all times
+    :adjust: whether the results should be adjusted to meet power demand at all times
     '''
+    timings: Timings = Timings()
+
     debug_msg_time('Start Solver')
-    samples: SampleSet = sampler.sample_dqm(self.model)
-    sample: List[float] = samples.record[0][0]
+    with timings.phase('solve'):
+      samples: SampleSet = sampler.sample_dqm(self.model)
     debug_msg_time('Solver Finished')
 
-    u: List[List[bool]] = []
-    p: List[List[float]] = []
-
-    self.get_variables_from_sample(sample, u, p)
+    with timings.phase('decode'):
+      # order the columns of the samples by the variable labels
+      order: List[int] = [samples.variables.index(v) for v in range(self.model.num_variables())]
+      u, p = self.get_variables_from_samples(samples.record.sample[:, order])
 
     time: float = samples.info['run_time'] / (10 ** 6)
-    solution: UCPSolution = UCPSolution(self.ucp, time, True, self.ucp.calculate_o(u, p), u, p)
+    with timings.phase('adjust'):
+      solution: UCPSolution = UCPSolution.from_samples(self.ucp, time, u, p, adjust)
 
-    if adjust:
-      solution.adjust_variables()
+    solution.timings = {**self.timings.to_dict(), **timings.to_dict()}
+    solution.metrics = {**solution.metrics, 'model': asdict(self.get_statistics())}
 
     return solution
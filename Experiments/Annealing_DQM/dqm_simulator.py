@@ -1,59 +1,122 @@
 #!/bin/python
 # version 3.8 required
 
+from functools import cmp_to_key
+import heapq
+from multiprocessing import Pool
 import sys
-from typing import List
+import time
+from typing import Iterator, List, Optional, Tuple
 from dimod import DiscreteQuadraticModel # type: ignore
 from dimod.sampleset import SampleSet # type: ignore
 from dimod.vartypes import DISCRETE # type: ignore
 import numpy as np # type: ignore
 
+from Annealing_DQM.case_tables import CaseTables
+
 
 class DQMSimulator(object):
   '''
   solves DQMs via brute force (for testing purposes)
+  the biases are extracted once into tables and the inputs are enumerated in reflected mixed-radix Gray code order,
+  so that consecutive inputs differ in one variable and the energy can be updated by a delta
   '''
   dqm: DiscreteQuadraticModel
+  quadratic: bool # whether the quadratic biases are part of the energy function
+  tables: CaseTables
+  blocks: List[Tuple[np.ndarray, np.ndarray]] # cases interacting with every variable and the couplings to them
+  weights: List[int] # weight of every variable in the lexicographic rank of an input (v[0] changes fastest)
+  num_reads: int # number of inputs with the lowest energies that are returned
+  num_processes: int # number of processes the search is split over
+  samples: List[List[int]] # best inputs sorted by energy
+  energies: List[float] # energies of the best inputs
   v: List[int]
   c: List[int]
   o: float
 
-  def __init__(self) -> None:
+  def __init__(self, quadratic: bool = False, num_reads: int = 1, num_processes: int = 1) -> None:
+    '''
+    initializes the simulator
+
+    :quadratic: whether the quadratic biases are part of the energy function,
+                by default only the linear biases are used (the energy function of the previous implementation)
+    :num_reads: number of inputs with the lowest energies that are returned
+    :num_processes: number of processes the search is split over
+    '''
+    self.quadratic = quadratic
+    self.num_reads = num_reads
+    self.num_processes = num_processes
+    self.samples = []
+    self.energies = []
     self.v = []
     self.c = []
     self.o = sys.float_info.max
 
   def initialize_variables(self) -> None:
     '''
-    instantiates the variables
+    instantiates the variables and extracts the biases of the DQM
     '''
-    for i in range(len(self.dqm.variables)):
-      self.v.append(0)
-      self.c.append(len(self.dqm.get_linear(self.dqm.variables[i])))
+    self.tables = CaseTables.from_dqm(self.dqm)
+    if not self.quadratic:
+      self.tables = CaseTables(self.tables.case_starts, self.tables.linear, [], [], [])
+
+    self.blocks = self.tables.get_variable_blocks()
+
+    self.v = [0] * self.tables.num_variables
+    self.c = np.diff(self.tables.case_starts).tolist()
+    self.weights = np.concatenate(([1], np.cumprod(self.c[:-1], dtype=object))).tolist() if self.c else []
 
-  def possible_v(self):
+  def get_digits(self, rank: int) -> Tuple[List[int], List[int]]:
     '''
-    generates possible inputs to the DQM
+    returns the input at a position of the Gray code order and the directions in which its cases move next
+
+    :rank: position in the Gray code order
     '''
-    self.v[0] = -1
+    v: List[int] = []
+    directions: List[int] = []
+
+    for c_i in self.c:
+      rank, position = divmod(rank, c_i)
 
-    while True:
-      add: bool = True
+      # every case moves up and down alternately while the slower variables change
+      if rank % 2 == 0:
+        v.append(position)
+        directions.append(1)
 
-      for i in range(len(self.v)):
-        if add:
-          if self.v[i] < self.c[i] - 1:
-            self.v[i] += 1
-            add = False
+      else:
+        v.append(c_i - 1 - position)
+        directions.append(-1)
 
-          else:
-            self.v[i] = 0
-            add = True
+    return v, directions
 
-      if add:
-        break
+  def possible_v(self, start: int = 0, end: Optional[int] = None) -> Iterator[Tuple[List[int], int, int]]:
+    '''
+    generates possible inputs to the DQM in reflected mixed-radix Gray code order
+    yields the input, the variable that changed and its previous case (-1 for the first input)
+
+    :start: position of the first input in the Gray code order
+    :end: position after the last input (all inputs if not given)
+    '''
+    self.v, directions = self.get_digits(start)
+    yield self.v, -1, -1
 
-      yield self.v
+    for _ in range(start + 1, self.get_num_inputs() if end is None else end):
+      i: int = 0
+
+      while not 0 <= self.v[i] + directions[i] < self.c[i]:
+        directions[i] = -directions[i]
+        i += 1
+
+      previous: int = self.v[i]
+      self.v[i] += directions[i]
+
+      yield self.v, i, previous
+
+  def get_num_inputs(self) -> int:
+    '''
+    returns the number of possible inputs to the DQM
+    '''
+    return int(np.prod(self.c, dtype=object)) if self.c else 1
 
   def compute_o(self, v: List[int]) -> float:
     '''
@@ -61,51 +124,141 @@ class DQMSimulator(object):
 
     :v: input for DQM
     '''
+    return float(self.tables.compute_energies(np.array(v, dtype=np.int64)[:, np.newaxis])[0])
+
+  def search_range(self, start: int, end: int) -> List[Tuple[float, int, List[int]]]:
+    '''
+    searches the inputs at the positions start to end - 1 of the Gray code order
+    returns the num_reads best inputs with their (accumulated) energies and lexicographic ranks
+
+    :start: position of the first input
+    :end: position after the last input
+    '''
+    # heap of the best inputs, the worst one (highest energy, then highest rank) is at the top
+    best: List[Tuple[float, int, List[int]]] = []
+    fields: np.ndarray = np.zeros(0)
     o: float = 0
+    rank: int = 0
 
-    for i in range(len(self.dqm.variables)):
-      linear_bias: np.ndarray = self.dqm.get_linear(self.dqm.variables[i])
-      o += linear_bias[v[i]]
+    for v, i, previous in self.possible_v(start, end):
+      if i < 0:
+        fields = self.tables.get_fields(np.array(v, dtype=np.int64)[:, np.newaxis])[:, 0]
+        o = self.compute_o(v)
+        rank = sum(v_i * weight for v_i, weight in zip(v, self.weights))
 
-    for j in range(len(self.dqm.variables)):
-      for i in range(j):
-        try:
-          quadratic_bias: np.ndarray = self.dqm.get_quadratic(
-            self.dqm.variables[i],
-            self.dqm.variables[j]
-          )
-          o += quadratic_bias[v[i]][v[j]]
+      else:
+        # only the biases of the changed variable are affected
+        case_start: int = self.tables.case_starts[i]
+        o += fields[case_start + v[i]] - fields[case_start + previous]
+        rank += (v[i] - previous) * self.weights[i]
 
-        except:
-          pass
+        neighbours, couplings = self.blocks[i]
+        fields[neighbours] += couplings[v[i]] - couplings[previous]
 
-    return o
+      if len(best) < self.num_reads:
+        heapq.heappush(best, (-o, -rank, v.copy()))
+        continue
+
+      # the energies are accumulated, so they are compared with a tolerance
+      worst_o: float = -best[0][0]
+      tolerance: float = 1e-9 * max(1., abs(worst_o))
+      if o < worst_o - tolerance or (o <= worst_o + tolerance and rank < -best[0][1]):
+        heapq.heapreplace(best, (-o, -rank, v.copy()))
+
+    return [(-o, -rank, v) for o, rank, v in best]
 
   def brute_force_solution(self) -> None:
     '''
-    search for the optimal input to the DQM
+    search for the optimal inputs to the DQM
+    of inputs with the same energy the first one in lexicographic order (v[0] changes fastest) is chosen
+    the inputs are split into contiguous ranges of the Gray code order that are searched in parallel
     '''
-    optimal_v: List[int] = self.v.copy()
+    num_inputs: int = self.get_num_inputs()
+    num_ranges: int = max(1, min(self.num_processes, num_inputs))
+    bounds: List[int] = [num_inputs * j // num_ranges for j in range(num_ranges + 1)]
+
+    candidates: List[Tuple[float, int, List[int]]]
+    if num_ranges == 1:
+      candidates = self.search_range(0, num_inputs)
 
-    for v in self.possible_v():
-      o = self.compute_o(v)
-      if o < self.o:
-        self.o = o
-        optimal_v = v.copy()
+    else:
+      with Pool(num_ranges, initialize_worker, (self.tables, self.blocks, self.c, self.weights, self.num_reads)) as pool:
+        candidates = [candidate for result in pool.starmap(search_range, zip(bounds[:-1], bounds[1:]))
+                                for candidate in result]
 
-    self.v = optimal_v.copy()
+    # merge the candidates using their exact energies
+    energies: np.ndarray = self.tables.compute_energies(np.array([v for _, _, v in candidates], dtype=np.int64).T)
+    merged: List[Tuple[float, int, List[int]]] = [
+      (float(o), rank, v) for o, (_, rank, v) in zip(energies, candidates)
+    ]
+    merged.sort(key=cmp_to_key(compare_candidates))
+    merged = merged[:self.num_reads]
+
+    self.samples = [v for _, _, v in merged]
+    self.energies = [o for o, _, _ in merged]
+    self.v = self.samples[0].copy()
+    self.o = self.energies[0]
 
   def sample_dqm(self, dqm: DiscreteQuadraticModel) -> SampleSet:
     '''
-    search for the optimal input to a DQM
+    search for the optimal inputs to a DQM
+    returns the num_reads inputs with the lowest energies
 
     :dqm: dqm instance
     '''
+    start: float = time.perf_counter()
     self.dqm = dqm
 
     self.initialize_variables()
     self.brute_force_solution()
 
-    samples: SampleSet = SampleSet.from_samples(self.v, DISCRETE, self.o)
-    samples.info['run_time'] = 0
+    samples: SampleSet = SampleSet.from_samples((self.samples, list(dqm.variables)), DISCRETE, self.energies)
+    samples.info['run_time'] = (time.perf_counter() - start) * 10 ** 6
     return samples
+
+
+def compare_candidates(a: Tuple[float, int, List[int]], b: Tuple[float, int, List[int]]) -> int:
+  '''
+  orders inputs by energy (with a tolerance) and then by lexicographic rank
+
+  :a: energy, rank and input
+  :b: energy, rank and input
+  '''
+  tolerance: float = 1e-9 * max(1., abs(a[0]), abs(b[0]))
+  if abs(a[0] - b[0]) > tolerance:
+    return -1 if a[0] < b[0] else 1
+
+  return (a[1] > b[1]) - (a[1] < b[1])
+
+
+# simulator of the worker processes, the tables are only transferred once per process
+worker_simulator: Optional[DQMSimulator] = None
+
+def initialize_worker(tables: CaseTables, blocks: List[Tuple[np.ndarray, np.ndarray]], c: List[int],
+                      weights: List[int], num_reads: int) -> None:
+  '''
+  initializes the simulator of a worker process with the tables of the DQM
+
+  :tables: biases of the DQM
+  :blocks: cases interacting with every variable and the couplings to them
+  :c: number of cases of every variable
+  :weights: weight of every variable in the lexicographic rank
+  :num_reads: number of inputs to keep
+  '''
+  global worker_simulator
+
+  worker_simulator = DQMSimulator(num_reads=num_reads)
+  worker_simulator.tables = tables
+  worker_simulator.blocks = blocks
+  worker_simulator.c = c
+  worker_simulator.weights = weights
+
+def search_range(start: int, end: int) -> List[Tuple[float, int, List[int]]]:
+  '''
+  searches a range of the Gray code order in a worker process
+
+  :start: position of the first input
+  :end: position after the last input
+  '''
+  assert worker_simulator is not None
+  return worker_simulator.search_range(start, end)
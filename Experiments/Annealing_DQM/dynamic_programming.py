@@ -0,0 +1,272 @@
+#!/bin/python
+# version 3.8 required
+
+import time
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+from dimod import DiscreteQuadraticModel # type: ignore
+from dimod.sampleset import SampleSet # type: ignore
+from dimod.vartypes import DISCRETE # type: ignore
+import numpy as np # type: ignore
+
+from Annealing_DQM.case_tables import CaseTables
+
+
+Interaction = Tuple[int, int, np.ndarray] # positions of two variables in their layers and their couplings
+
+
+def expand(values: np.ndarray, axes: Tuple[int, ...], ndim: int) -> np.ndarray:
+  '''
+  inserts axes of size one, so that the axes of values are at the given positions of an array with ndim dimensions
+
+  :values: array to expand
+  :axes: new position of every axis of values, they have to be increasing
+  :ndim: number of dimensions of the result
+  '''
+  shape: List[int] = [1] * ndim
+  for axis, size in zip(axes, values.shape):
+    shape[axis] = size
+
+  return values.reshape(shape)
+
+
+class DynamicProgrammingSolver(object):
+  '''
+  solves DQMs exactly via dynamic programming over layers of variables (e.g. the time steps of the UCP)
+  variables may only interact inside their layer or with variables of the neighbouring layers
+  the state of a layer is the joint case vector of its variables
+  states that can not improve an upper bound of the optimum are pruned (branch and bound)
+  '''
+  layers: Optional[List[List[Hashable]]] # labels of the variables of every layer
+  prune: bool
+  info: Dict[str, Any] # information about the last run
+
+  def __init__(self, layers: Optional[List[List[Hashable]]] = None, prune: bool = True) -> None:
+    '''
+    initializes the solver
+
+    :layers: labels of the variables of every layer (all variables form a single layer if not given)
+    :prune: whether states should be pruned using the bounds of the optimum
+    '''
+    self.layers = layers
+    self.prune = prune
+    self.info = {}
+
+  def split_interactions(self, tables: CaseTables, layer_of: np.ndarray, position_of: np.ndarray,
+                         num_layers: int) -> Tuple[List[List[Interaction]], List[List[Interaction]]]:
+    '''
+    assigns every interaction to a layer (inside the layer) or to a transition (between layer t - 1 and t)
+
+    :tables: biases of the model
+    :layer_of: layer of every variable
+    :position_of: position of every variable inside its layer
+    :num_layers: number of layers
+    '''
+    inside: List[List[Interaction]] = [[] for _ in range(num_layers)]
+    transitions: List[List[Interaction]] = [[] for _ in range(num_layers)]
+
+    for (u, v), block in tables.get_interactions().items():
+      if layer_of[u] > layer_of[v] or (layer_of[u] == layer_of[v] and position_of[u] > position_of[v]):
+        u, v, block = v, u, block.T
+
+      if layer_of[u] == layer_of[v]:
+        inside[layer_of[u]].append((position_of[u], position_of[v], block))
+
+      elif layer_of[v] == layer_of[u] + 1:
+        transitions[layer_of[v]].append((position_of[u], position_of[v], block))
+
+      else:
+        raise ValueError('Variables {} and {} of non-neighbouring layers interact'.format(u, v))
+
+    return inside, transitions
+
+  @staticmethod
+  def get_layer_costs(linear: List[np.ndarray], inside: List[Interaction]) -> np.ndarray:
+    '''
+    computes the energy of every state of a layer (without the transitions)
+
+    :linear: linear biases of the variables of the layer
+    :inside: interactions inside the layer
+    '''
+    ndim: int = len(linear)
+    costs: np.ndarray = np.zeros([len(values) for values in linear])
+
+    for axis, values in enumerate(linear):
+      costs += expand(values, (axis,), ndim)
+
+    for a, b, block in inside:
+      costs += expand(block, (a, b), ndim)
+
+    return costs
+
+  @staticmethod
+  def minimize_transition(values: np.ndarray, transitions: List[Interaction], shape: Tuple[int, ...]) -> np.ndarray:
+    '''
+    computes for every state of the next layer the minimum over all states of the previous layer
+    of their value plus the transition energy
+
+    :values: value of every state of the previous layer
+    :transitions: interactions between the previous and the next layer
+    :shape: number of cases of every variable of the next layer
+    '''
+    previous: List[int] = [a for a, _, _ in transitions]
+    following: List[int] = [b for _, b, _ in transitions]
+
+    if len(set(previous)) == len(previous) and len(set(following)) == len(following):
+      # every variable interacts with at most one variable of the other layer (e.g. the same plant),
+      # so the previous variables can be eliminated one after another
+      for a, _, block in transitions:
+        values = np.moveaxis(values, a, -1)
+        values = np.moveaxis(np.min(values[..., :, np.newaxis] + block, axis=-2), -1, a)
+
+      uncoupled: Tuple[int, ...] = tuple(a for a in range(values.ndim) if a not in previous)
+      values = np.min(values, axis=uncoupled) if uncoupled else values
+
+      # the remaining axes belong to the next variables in the order of the previous variables
+      remaining_following: List[int] = [b for _, b in sorted(zip(previous, following))]
+      values = np.transpose(values, np.argsort(remaining_following))
+      return np.broadcast_to(expand(values, tuple(sorted(following)), len(shape)), shape)
+
+    # general case: compute the transition energies between all remaining previous states and all next states
+    remaining: np.ndarray = np.flatnonzero(np.isfinite(values))
+    if len(remaining) == 0:
+      return np.full(shape, np.inf)
+
+    digits: Tuple[np.ndarray, ...] = np.unravel_index(remaining, values.shape)
+
+    energies: np.ndarray = expand(values.ravel()[remaining], (0,), len(shape) + 1) + np.zeros((1,) + shape)
+    for a, b, block in transitions:
+      energies = energies + expand(block[digits[a]], (0, b + 1), len(shape) + 1)
+
+    return np.min(energies, axis=0)
+
+  @staticmethod
+  def get_transition_energies(transitions: List[Interaction], shape: Tuple[int, ...], state: Tuple[int, ...],
+                              forward: bool) -> np.ndarray:
+    '''
+    computes the transition energies between a fixed state and all states of the other layer
+
+    :transitions: interactions between the previous and the next layer
+    :shape: number of cases of every variable of the other layer
+    :state: fixed state
+    :forward: whether the fixed state belongs to the previous layer
+    '''
+    energies: np.ndarray = np.zeros(shape)
+
+    for a, b, block in transitions:
+      if forward:
+        energies = energies + expand(block[state[a]], (b,), len(shape))
+
+      else:
+        energies = energies + expand(block[:, state[b]], (a,), len(shape))
+
+    return energies
+
+  def get_upper_bound(self, costs: List[np.ndarray], transitions: List[List[Interaction]]) -> float:
+    '''
+    computes the energy of a greedy solution that chooses the best state of every layer given the previous one
+
+    :costs: energy of every state of every layer
+    :transitions: interactions between the layers
+    '''
+    state: Tuple[int, ...] = np.unravel_index(np.argmin(costs[0]), costs[0].shape)
+    upper_bound: float = float(costs[0][state])
+
+    for t in range(1, len(costs)):
+      energies: np.ndarray = costs[t] + self.get_transition_energies(transitions[t], costs[t].shape, state, True)
+      state = np.unravel_index(np.argmin(energies), energies.shape)
+      upper_bound += float(energies[state])
+
+    return upper_bound
+
+  def solve(self, tables: CaseTables, layers: List[List[int]]) -> np.ndarray:
+    '''
+    computes the optimal case of every variable
+
+    :tables: biases of the model
+    :layers: indices of the variables of every layer
+    '''
+    layer_of: np.ndarray = np.full(tables.num_variables, -1)
+    position_of: np.ndarray = np.full(tables.num_variables, -1)
+
+    for t, layer in enumerate(layers):
+      layer_of[layer] = t
+      position_of[layer] = np.arange(len(layer))
+
+    if np.any(layer_of < 0) or sum(len(layer) for layer in layers) != tables.num_variables:
+      raise ValueError('Every variable has to be part of exactly one layer')
+
+    inside, transitions = self.split_interactions(tables, layer_of, position_of, len(layers))
+    costs: List[np.ndarray] = [
+      self.get_layer_costs(
+        [tables.linear[tables.case_starts[v]:tables.case_starts[v + 1]] for v in layer], inside[t]
+      ) for t, layer in enumerate(layers)
+    ]
+
+    # lower bound of the energy of all layers after layer t
+    lower_bounds: np.ndarray = np.zeros(len(layers))
+    for t in range(len(layers) - 1, 0, -1):
+      lower_bounds[t - 1] = (
+        lower_bounds[t] + np.min(costs[t]) + sum(np.min(block) for _, _, block in transitions[t])
+      )
+
+    upper_bound: float = self.get_upper_bound(costs, transitions) if self.prune else np.inf
+    tolerance: float = 1e-9 * max(1., abs(upper_bound)) if self.prune else 0.
+
+    values: List[np.ndarray] = []
+    num_pruned: int = 0
+
+    for t in range(len(layers)):
+      value: np.ndarray = costs[t].copy()
+      if t > 0:
+        value += self.minimize_transition(values[-1], transitions[t], costs[t].shape)
+
+      if self.prune:
+        pruned: np.ndarray = value + lower_bounds[t] > upper_bound + tolerance
+        num_pruned += int(np.count_nonzero(pruned & np.isfinite(value)))
+        value[pruned] = np.inf
+
+      values.append(value)
+
+    # backtrack the optimal states starting with the last layer
+    x: np.ndarray = np.zeros(tables.num_variables, dtype=np.int64)
+    state: Tuple[int, ...] = np.unravel_index(np.argmin(values[-1]), values[-1].shape)
+    x[layers[-1]] = state
+
+    for t in range(len(layers) - 1, 0, -1):
+      energies: np.ndarray = values[t - 1] + self.get_transition_energies(
+        transitions[t], values[t - 1].shape, state, False
+      )
+      state = np.unravel_index(np.argmin(energies), energies.shape)
+      x[layers[t - 1]] = state
+
+    self.info = {
+      'num_states': [value.size for value in values],
+      'num_pruned': num_pruned,
+      'upper_bound': upper_bound
+    }
+
+    return x
+
+  def sample_dqm(self, dqm: DiscreteQuadraticModel) -> SampleSet:
+    '''
+    search for the optimal input to a DQM
+
+    :dqm: dqm instance
+    '''
+    start: float = time.perf_counter()
+
+    labels: List[Hashable] = list(dqm.variables)
+    index_of: Dict[Hashable, int] = {label: v for v, label in enumerate(labels)}
+    layers: List[List[int]] = (
+      [[index_of[label] for label in layer] for layer in self.layers] if self.layers is not None
+      else [list(range(len(labels)))]
+    )
+
+    tables: CaseTables = CaseTables.from_dqm(dqm)
+    x: np.ndarray = self.solve(tables, layers)
+    energy: float = float(tables.compute_energies(x[:, np.newaxis])[0])
+
+    samples: SampleSet = SampleSet.from_samples(([x], labels), DISCRETE, energy)
+    samples.info['run_time'] = (time.perf_counter() - start) * 10 ** 6
+    samples.info.update(self.info)
+    return samples
@@ -0,0 +1,257 @@
+#!/bin/python
+# version 3.8 required
+
+from dataclasses import dataclass
+from multiprocessing import Pool
+import time
+from typing import Any, Dict, List, Optional, Tuple
+from dimod import DiscreteQuadraticModel # type: ignore
+from dimod.sampleset import SampleSet # type: ignore
+from dimod.vartypes import DISCRETE # type: ignore
+import numpy as np # type: ignore
+
+from Annealing_DQM.case_tables import CaseTables
+from Annealing_QUBO.simulated_annealing import SamplerResponse
+from Annealing_QUBO.sparse_qubo import SparseQUBO
+
+
+@dataclass
+class TemperingResult(object):
+  '''
+  result of the parallel tempering chains of one process
+  '''
+  states: np.ndarray # best state of every chain with the shape (number of variables, number of chains)
+  energies: np.ndarray # energy of the best state of every chain
+  move_accepts: np.ndarray # accepted case changes at every temperature
+  move_attempts: np.ndarray # attempted case changes at every temperature
+  exchange_accepts: np.ndarray # accepted exchanges between every pair of neighbouring temperatures
+  exchange_attempts: np.ndarray # attempted exchanges between every pair of neighbouring temperatures
+
+
+def run_chains(tables: CaseTables, blocks: List[Tuple[np.ndarray, np.ndarray]], betas: np.ndarray,
+               num_chains: int, num_sweeps: int, exchange_interval: int, seed: Any) -> TemperingResult:
+  '''
+  runs several parallel tempering chains, all replicas of all chains are updated at once as columns of arrays
+  the replica of temperature m of chain c starts in column c * M + m, where M is the number of temperatures
+  replica exchanges swap the temperatures of the columns, so the states never have to be copied
+
+  :tables: biases of the model
+  :blocks: cases interacting with every variable and the couplings to them
+  :betas: inverse temperatures of the ladder in ascending order
+  :num_chains: number of independent chains
+  :num_sweeps: number of sweeps over all variables
+  :exchange_interval: number of sweeps between two rounds of replica exchanges
+  :seed: seed of the random number generator
+  '''
+  rng: np.random.Generator = np.random.default_rng(seed)
+  num_temperatures: int = len(betas)
+  num_columns: int = num_chains * num_temperatures
+  columns: np.ndarray = np.arange(num_columns)
+  num_cases: np.ndarray = np.diff(tables.case_starts)
+
+  # ladder[c, m] is the column of chain c at temperature m
+  ladder: np.ndarray = columns.reshape(num_chains, num_temperatures).copy()
+  temperature: np.ndarray = np.tile(np.arange(num_temperatures), num_chains)
+
+  x: np.ndarray = (rng.random((tables.num_variables, num_columns)) * num_cases[:, None]).astype(np.int64)
+  fields: np.ndarray = tables.get_fields(x)
+  energies: np.ndarray = tables.compute_energies(x)
+
+  best_states: np.ndarray = x[:, ladder[:, -1]].copy()
+  best_energies: np.ndarray = energies[ladder[:, -1]].copy()
+
+  move_accepts: np.ndarray = np.zeros(num_temperatures, dtype=np.int64)
+  exchange_accepts: np.ndarray = np.zeros(max(num_temperatures - 1, 0), dtype=np.int64)
+  exchange_attempts: np.ndarray = np.zeros(max(num_temperatures - 1, 0), dtype=np.int64)
+
+  for sweep in range(num_sweeps):
+    column_betas: np.ndarray = betas[temperature]
+    changes: np.ndarray = np.zeros(num_columns, dtype=np.int64)
+
+    for v in range(tables.num_variables):
+      start: int = tables.case_starts[v]
+      case_fields: np.ndarray = fields[start:tables.case_starts[v + 1]]
+      old: np.ndarray = x[v]
+
+      # heat bath: choose the new case with its Boltzmann probability given all other variables
+      weights: np.ndarray = np.exp(-column_betas * (case_fields - np.min(case_fields, axis=0)))
+      cumulative: np.ndarray = np.cumsum(weights, axis=0)
+      new: np.ndarray = np.minimum(
+        np.sum(cumulative < rng.random(num_columns) * cumulative[-1], axis=0), num_cases[v] - 1
+      )
+
+      changed: np.ndarray = new != old
+      if not changed.any():
+        continue
+
+      energies += case_fields[new, columns] - case_fields[old, columns]
+      changes += changed
+
+      # difference of the indicators of the old and new case
+      difference: np.ndarray = np.zeros(case_fields.shape)
+      difference[new[changed], columns[changed]] += 1
+      difference[old[changed], columns[changed]] -= 1
+
+      neighbours, couplings = blocks[v]
+      fields[neighbours] += couplings.T @ difference
+      x[v] = new
+
+    move_accepts += np.bincount(temperature, weights=changes, minlength=num_temperatures).astype(np.int64)
+
+    chain_energies: np.ndarray = energies.reshape(num_chains, num_temperatures)
+    best_columns: np.ndarray = columns.reshape(num_chains, num_temperatures)[
+      np.arange(num_chains), np.argmin(chain_energies, axis=1)
+    ]
+    improved: np.ndarray = energies[best_columns] < best_energies
+    best_states[:, improved] = x[:, best_columns[improved]]
+    best_energies[improved] = energies[best_columns[improved]]
+
+    if (sweep + 1) % exchange_interval != 0:
+      continue
+
+    # exchange the replicas of neighbouring temperatures, alternating between even and odd pairs
+    for m in range(sweep // exchange_interval % 2, num_temperatures - 1, 2):
+      cold: np.ndarray = ladder[:, m + 1].copy()
+      hot: np.ndarray = ladder[:, m].copy()
+      accept: np.ndarray = (
+        np.log(1 - rng.random(num_chains)) <= (betas[m + 1] - betas[m]) * (energies[cold] - energies[hot])
+      )
+
+      exchange_attempts[m] += num_chains
+      exchange_accepts[m] += np.count_nonzero(accept)
+
+      ladder[accept, m], ladder[accept, m + 1] = cold[accept], hot[accept]
+      temperature[ladder[:, m]] = m
+      temperature[ladder[:, m + 1]] = m + 1
+
+  move_attempts: np.ndarray = np.full(num_temperatures, num_sweeps * num_chains * tables.num_variables, dtype=np.int64)
+
+  return TemperingResult(best_states, best_energies, move_accepts, move_attempts, exchange_accepts, exchange_attempts)
+
+
+class ParallelTemperingSampler(object):
+  '''
+  solves DQMs and QUBOs locally via parallel tempering (replica exchange Monte Carlo)
+  every chain holds one replica per temperature of the ladder, the chains are distributed over a process pool
+  whole chains are distributed instead of the temperatures of one ladder, since the replicas of a chain are updated
+  together as the columns of one array and exchanging replicas between processes would need communication every round,
+  so replicas are only exchanged within a chain and every process runs at least one chain
+  '''
+  num_reads: int
+  num_sweeps: int
+  num_temperatures: int
+  beta_range: Optional[Tuple[float, float]] # smallest and largest inverse temperature of the ladder
+  exchange_interval: int
+  num_processes: int
+  seed: Optional[int]
+  statistics: Dict[str, Any] # acceptance statistics of the last run
+
+  def __init__(self, num_reads: int = 10, num_sweeps: int = 1000, num_temperatures: int = 16,
+               beta_range: Optional[Tuple[float, float]] = None, exchange_interval: int = 1,
+               num_processes: int = 1, seed: Optional[int] = None) -> None:
+    '''
+    initializes the sampler
+
+    :num_reads: number of independent chains, every chain returns its best sample
+    :num_sweeps: number of sweeps over all variables
+    :num_temperatures: number of temperatures of the geometric ladder
+    :beta_range: smallest and largest inverse temperature of the ladder (derived from the biases if not given)
+    :exchange_interval: number of sweeps between two rounds of replica exchanges
+    :num_processes: number of processes the chains are distributed over (at most the number of reads)
+    :seed: seed of the random number generator
+    '''
+    if num_processes > num_reads:
+      raise ValueError('num_processes ({}) exceeds num_reads ({}), every process runs at least one chain'.format(
+        num_processes, num_reads
+      ))
+
+    self.num_reads = num_reads
+    self.num_sweeps = num_sweeps
+    self.num_temperatures = num_temperatures
+    self.beta_range = beta_range
+    self.exchange_interval = exchange_interval
+    self.num_processes = num_processes
+    self.seed = seed
+    self.statistics = {}
+
+  def get_betas(self, tables: CaseTables) -> np.ndarray:
+    '''
+    returns the inverse temperatures of the ladder in ascending order
+
+    :tables: biases of the model
+    '''
+    beta_min, beta_max = self.beta_range or tables.get_beta_range()
+    return np.geomspace(beta_min, beta_max, self.num_temperatures)
+
+  def sample_tables(self, tables: CaseTables) -> Tuple[np.ndarray, np.ndarray]:
+    '''
+    runs the chains and returns their best samples with the shape (number of reads, number of variables)
+    and their energies, both sorted by energy
+
+    :tables: biases of the model
+    '''
+    betas: np.ndarray = self.get_betas(tables)
+    blocks: List[Tuple[np.ndarray, np.ndarray]] = tables.get_variable_blocks()
+
+    num_processes: int = max(1, self.num_processes)
+    chains: List[int] = [len(part) for part in np.array_split(np.arange(self.num_reads), num_processes)]
+    seeds: List[np.random.SeedSequence] = np.random.SeedSequence(self.seed).spawn(num_processes)
+
+    arguments: List[Tuple[Any, ...]] = [
+      (tables, blocks, betas, num_chains, self.num_sweeps, self.exchange_interval, seed)
+      for num_chains, seed in zip(chains, seeds)
+    ]
+
+    results: List[TemperingResult]
+    if num_processes == 1:
+      results = [run_chains(*arguments[0])]
+
+    else:
+      with Pool(num_processes) as pool:
+        results = pool.starmap(run_chains, arguments)
+
+    states: np.ndarray = np.concatenate([result.states for result in results], axis=1)
+
+    # the energies of the chains are accumulated during the sweeps, so they are recomputed without rounding errors
+    energies: np.ndarray = tables.compute_energies(states)
+
+    move_attempts: np.ndarray = sum(result.move_attempts for result in results)
+    exchange_attempts: np.ndarray = sum(result.exchange_attempts for result in results)
+
+    self.statistics = {
+      'betas': betas.tolist(),
+      'move_acceptance': (sum(result.move_accepts for result in results) / np.maximum(move_attempts, 1)).tolist(),
+      'exchange_acceptance': (
+        sum(result.exchange_accepts for result in results) / np.maximum(exchange_attempts, 1)
+      ).tolist()
+    }
+
+    order: np.ndarray = np.argsort(energies, kind='stable')
+    return states[:, order].T, energies[order]
+
+  def sample_dqm(self, dqm: DiscreteQuadraticModel) -> SampleSet:
+    '''
+    samples from a DQM
+
+    :dqm: DQM instance
+    '''
+    start: float = time.perf_counter()
+    states, energies = self.sample_tables(CaseTables.from_dqm(dqm))
+    run_time: float = (time.perf_counter() - start) * 10 ** 6
+
+    samples: SampleSet = SampleSet.from_samples((states, list(dqm.variables)), DISCRETE, energies)
+    samples.info['run_time'] = run_time
+    samples.info['statistics'] = self.statistics
+    return samples
+
+  def sample_qubo(self, qubo: SparseQUBO) -> SamplerResponse:
+    '''
+    samples from a QUBO
+
+    :qubo: QUBO instance
+    '''
+    start: float = time.perf_counter()
+    states, energies = self.sample_tables(CaseTables.from_qubo(qubo))
+    timing: float = (time.perf_counter() - start) * 10 ** 6
+
+    return SamplerResponse(states.tolist(), energies.tolist(), timing, {'statistics': self.statistics})
@@ -200,3 +200,18 @@ class TestDQMBiases(unittest.TestCase):
           for t1 in range(2):
             if i0 != i1 and t0 != t1:
               self.no_quadratic_biases(dqm, i0, t0, i1, t1)
+
+  def test_reweight(self):
+    dqm: UCP_DQM = UCP_DQM(self.ucp_instance_2)
+    dqm.reweight(y_c=2)
+    self.linear_biases(dqm, 0, 0, [0, -170, -150, 70])
+
+    dqm.reweight(y_c=1, y_d=2)
+    self.linear_biases(dqm, 1, 1, [0, -790, -1180, -1170])
+
+    dqm.reweight(y_d=1, y_s=2)
+    self.linear_biases(dqm, 1, 0, [40, -190, -180, 30])
+    self.quadratic_biases(dqm, 0, 0, 0, 1, [[ 0, 20, 20, 20],
+                                            [40,  0,  0,  0],
+                                            [40,  0,  0,  0],
+                                            [40,  0,  0,  0]])
@@ -0,0 +1,89 @@
+#!/bin/python
+# version 3.8 required
+
+import itertools
+from typing import List
+from dimod import DiscreteQuadraticModel # type: ignore
+from dimod.sampleset import SampleSet # type: ignore
+import numpy as np # type: ignore
+from numpy.testing import assert_array_almost_equal, assert_array_equal # type: ignore
+import unittest
+
+from Annealing_DQM.case_tables import CaseTables
+from Annealing_DQM.dqm_simulator import DQMSimulator
+from Annealing_DQM.dynamic_programming import DynamicProgrammingSolver
+
+class TestDQMSimulator(unittest.TestCase):
+  '''
+  tests the enumeration of the brute force simulator
+  '''
+
+  def random_dqm(self, rng: np.random.Generator) -> DiscreteQuadraticModel:
+    dqm: DiscreteQuadraticModel = DiscreteQuadraticModel()
+    num_variables: int = int(rng.integers(1, 5))
+
+    for v in range(num_variables):
+      dqm.add_variable(int(rng.integers(1, 4)), label=v)
+      dqm.set_linear(v, rng.integers(-2, 3, size=dqm.num_cases(v)).astype(float))
+
+    for u in range(num_variables):
+      for v in range(u + 1, num_variables):
+        if rng.random() < 0.6:
+          dqm.set_quadratic(u, v, rng.integers(-2, 3, size=(dqm.num_cases(u), dqm.num_cases(v))).astype(float))
+
+    return dqm
+
+  def test_gray_code(self):
+    simulator: DQMSimulator = DQMSimulator()
+    simulator.c = [2, 3, 2]
+    simulator.v = [0, 0, 0]
+
+    inputs: List[List[int]] = [v.copy() for v, _, _ in simulator.possible_v()]
+
+    self.assertEqual(len(inputs), 12)
+    self.assertEqual(len(set(map(tuple, inputs))), 12)
+    for previous, current in zip(inputs, inputs[1:]):
+      self.assertEqual(sum(abs(a - b) for a, b in zip(previous, current)), 1)
+
+    for rank, v in enumerate(inputs):
+      self.assertEqual(simulator.get_digits(rank)[0], v)
+      self.assertEqual([v.copy() for v, _, _ in simulator.possible_v(rank, 12)], inputs[rank:])
+
+  def test_linear(self):
+    rng: np.random.Generator = np.random.default_rng(0)
+
+    for _ in range(20):
+      dqm: DiscreteQuadraticModel = self.random_dqm(rng)
+      simulator: DQMSimulator = DQMSimulator()
+      simulator.sample_dqm(dqm)
+
+      # without the quadratic biases the first minimum of every variable is optimal
+      self.assertEqual(simulator.v, [int(np.argmin(dqm.get_linear(v))) for v in dqm.variables])
+
+  def test_quadratic(self):
+    rng: np.random.Generator = np.random.default_rng(1)
+
+    for _ in range(20):
+      dqm: DiscreteQuadraticModel = self.random_dqm(rng)
+      energy: float = DQMSimulator(quadratic=True).sample_dqm(dqm).first.energy
+
+      self.assertAlmostEqual(energy, DynamicProgrammingSolver().sample_dqm(dqm).first.energy)
+
+  def test_partitioned(self):
+    rng: np.random.Generator = np.random.default_rng(2)
+
+    for _ in range(10):
+      dqm: DiscreteQuadraticModel = self.random_dqm(rng)
+      tables: CaseTables = CaseTables.from_dqm(dqm)
+      inputs: np.ndarray = np.array(list(itertools.product(*[range(c) for c in np.diff(tables.case_starts)]))).T
+      energies: np.ndarray = np.sort(tables.compute_energies(inputs))[:3]
+
+      single: SampleSet = DQMSimulator(quadratic=True, num_reads=3).sample_dqm(dqm)
+      partitioned: SampleSet = DQMSimulator(quadratic=True, num_reads=3, num_processes=3).sample_dqm(dqm)
+
+      assert_array_almost_equal(single.record.energy, energies)
+      assert_array_equal(single.record.sample, partitioned.record.sample)
+      self.assertGreater(partitioned.info['run_time'], 0)
+
+if __name__ == '__main__':
+  unittest.main()
@@ -0,0 +1,88 @@
+#!/bin/python
+# version 3.8 required
+
+import itertools
+from typing import List
+from dimod import DiscreteQuadraticModel # type: ignore
+import numpy as np # type: ignore
+import unittest
+
+from Annealing_DQM.case_tables import CaseTables
+from Annealing_DQM.dqm import UCP_DQM
+from Annealing_DQM.dynamic_programming import DynamicProgrammingSolver
+from Annealing_DQM.parallel_tempering import ParallelTemperingSampler
+from Data.build_ucp import build_random_ucp
+from UCP.unit_commitment_problem import CombustionPlant, ExperimentParameters, UCP
+
+class TestDynamicProgramming(unittest.TestCase):
+  '''
+  tests the exact dynamic programming solver against brute force
+  '''
+
+  def brute_force(self, dqm: DiscreteQuadraticModel) -> float:
+    tables: CaseTables = CaseTables.from_dqm(dqm)
+    samples: np.ndarray = np.array(list(itertools.product(*[range(k) for k in np.diff(tables.case_starts)]))).T
+    return float(np.min(tables.compute_energies(samples)))
+
+  def test_ucp(self):
+    rng: np.random.Generator = np.random.default_rng(0)
+
+    for _ in range(10):
+      dqm: UCP_DQM = UCP_DQM(build_random_ucp(rng, int(rng.integers(1, 3)), int(rng.integers(1, 4))))
+      optimum: float = self.brute_force(dqm.model)
+
+      for layers in (dqm.get_time_layers(), None):
+        for prune in (True, False):
+          energy: float = DynamicProgrammingSolver(layers, prune).sample_dqm(dqm.model).first.energy
+          self.assertAlmostEqual(energy, optimum, delta=1e-9 * max(1, abs(optimum)))
+
+  def test_general_transitions(self):
+    rng: np.random.Generator = np.random.default_rng(1)
+    layers: List[List[int]] = [[0, 1], [2, 3, 4], [5, 6]]
+    layer_of: List[int] = [0, 0, 1, 1, 1, 2, 2]
+
+    for _ in range(10):
+      dqm: DiscreteQuadraticModel = DiscreteQuadraticModel()
+      for v in range(7):
+        dqm.add_variable(int(rng.integers(2, 4)), label=v)
+        dqm.set_linear(v, rng.normal(size=dqm.num_cases(v)))
+
+      # variables of neighbouring layers interact with several variables of the other layer
+      for u, v in itertools.combinations(range(7), 2):
+        if abs(layer_of[u] - layer_of[v]) <= 1 and rng.random() < 0.7:
+          dqm.set_quadratic(u, v, rng.normal(size=(dqm.num_cases(u), dqm.num_cases(v))))
+
+      energy: float = DynamicProgrammingSolver(layers).sample_dqm(dqm).first.energy
+      self.assertAlmostEqual(energy, self.brute_force(dqm))
+
+  def test_invalid_layers(self):
+    dqm: DiscreteQuadraticModel = DiscreteQuadraticModel()
+    for v in range(3):
+      dqm.add_variable(2, label=v)
+    dqm.set_quadratic(0, 2, {(1, 1): 1})
+
+    self.assertRaises(ValueError, DynamicProgrammingSolver([[0], [1], [2]]).sample_dqm, dqm)
+    self.assertRaises(ValueError, DynamicProgrammingSolver([[0], [1]]).sample_dqm, dqm)
+
+  def test_large_instance(self):
+    rng: np.random.Generator = np.random.default_rng(2)
+    ucp: UCP = UCP(
+      ExperimentParameters(24, 3),
+      rng.integers(20, 100, 24).tolist(),
+      [
+        CombustionPlant(10, 1, 0.1, 10, 50, 5, 5),
+        CombustionPlant(20, 2, 0.05, 10, 40, 10, 5, True),
+        CombustionPlant(5, 3, 0.01, 10, 30, 2, 2)
+      ]
+    )
+
+    dqm: UCP_DQM = UCP_DQM(ucp)
+    solver: DynamicProgrammingSolver = DynamicProgrammingSolver(dqm.get_time_layers())
+    energy: float = solver.sample_dqm(dqm.model).first.energy
+
+    sampler: ParallelTemperingSampler = ParallelTemperingSampler(num_reads=2, num_sweeps=20, num_temperatures=4, seed=0)
+    self.assertLessEqual(energy, sampler.sample_dqm(dqm.model).first.energy)
+    self.assertLessEqual(energy, solver.info['upper_bound'])
+
+if __name__ == '__main__':
+  unittest.main()
@@ -0,0 +1,89 @@
+#!/bin/python
+# version 3.8 required
+
+import itertools
+import numpy as np # type: ignore
+from numpy.testing import assert_array_almost_equal # type: ignore
+import unittest
+from dimod.sampleset import SampleSet # type: ignore
+
+from Annealing_DQM.case_tables import CaseTables
+from Annealing_DQM.dqm import UCP_DQM
+from Annealing_DQM.parallel_tempering import ParallelTemperingSampler
+from Annealing_QUBO.qubo import UCP_QUBO
+from Annealing_QUBO.simulated_annealing import SamplerResponse
+from UCP.unit_commitment_problem import CombustionPlant, ExperimentParameters, UCP, UCPSolution
+
+class TestParallelTempering(unittest.TestCase):
+  '''
+  tests the local parallel tempering sampler
+  '''
+
+  ucp_instance: UCP = UCP(
+    ExperimentParameters(2, 2),
+    [3, 1],
+    [
+      CombustionPlant(0, 1, 0, 1, 2, 0, 0),
+      CombustionPlant(0, 2, 0, 1, 2, 0, 0)
+    ]
+  )
+
+  def test_case_tables_dqm(self):
+    dqm: UCP_DQM = UCP_DQM(self.ucp_instance)
+    tables: CaseTables = CaseTables.from_dqm(dqm.model)
+
+    samples: np.ndarray = np.array(list(itertools.product(range(4), repeat=4))).T
+    energies: np.ndarray = tables.compute_energies(samples)
+
+    assert_array_almost_equal(energies, dqm.model.energies((samples.T, list(dqm.model.variables))))
+
+  def test_case_tables_qubo(self):
+    qubo: UCP_QUBO = UCP_QUBO(self.ucp_instance)
+    tables: CaseTables = CaseTables.from_qubo(qubo.biases)
+    matrix: np.ndarray = qubo.biases.to_csr().toarray()
+
+    samples: np.ndarray = np.random.default_rng(0).integers(0, 2, size=(16, 20))
+    energies: np.ndarray = tables.compute_energies(samples)
+
+    for sample, energy in zip(samples.T, energies):
+      self.assertAlmostEqual(energy, sample @ matrix @ sample)
+
+  def test_sample_dqm(self):
+    dqm: UCP_DQM = UCP_DQM(self.ucp_instance)
+    sampler: ParallelTemperingSampler = ParallelTemperingSampler(num_reads=4, num_sweeps=50, num_temperatures=4, seed=0)
+    samples: SampleSet = sampler.sample_dqm(dqm.model)
+
+    optimum: float = np.min(
+      CaseTables.from_dqm(dqm.model).compute_energies(np.array(list(itertools.product(range(4), repeat=4))).T)
+    )
+
+    self.assertEqual(samples.first.energy, optimum)
+    self.assertEqual(len(samples), 4)
+    self.assertEqual(len(samples.info['statistics']['move_acceptance']), 4)
+    self.assertEqual(len(samples.info['statistics']['exchange_acceptance']), 3)
+
+    solution: UCPSolution = dqm.optimize(sampler, adjust=False)
+    self.assertGreaterEqual(solution.time, 0)
+
+  def test_sample_qubo(self):
+    qubo: UCP_QUBO = UCP_QUBO(self.ucp_instance, y_d=100, y_p=100)
+    matrix: np.ndarray = qubo.biases.to_csr().toarray()
+    optimum: float = min(float(np.array(x) @ matrix @ np.array(x)) for x in itertools.product([0, 1], repeat=16))
+
+    sampler: ParallelTemperingSampler = ParallelTemperingSampler(
+      num_reads=4, num_sweeps=50, num_temperatures=4, num_processes=2, seed=0
+    )
+    response: SamplerResponse = sampler.sample_qubo(qubo.biases)
+
+    self.assertEqual(response.energies[0], optimum)
+    self.assertEqual(response.energies, sorted(response.energies))
+    self.assertEqual(response.solutions, sampler.sample_qubo(qubo.biases).solutions)
+
+    qubo.optimize(None, sampler, adjust=False)
+    self.assertEqual(qubo.answer.energies[0], optimum)
+
+  def test_num_processes(self):
+    self.assertRaises(ValueError, ParallelTemperingSampler, num_reads=2, num_processes=3)
+
+if __name__ == '__main__':
+  unittest.main()
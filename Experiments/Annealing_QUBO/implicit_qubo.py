@@ -0,0 +1,223 @@
+#!/bin/python
+# version 3.8 required
+
+from typing import Dict, List, Tuple
+import numpy as np # type: ignore
+
+from Annealing_QUBO.qubo_indices import QUBOIndices
+from Annealing_QUBO.qubo_operators import get_beta_range
+from UCP.unit_commitment_problem import UCP
+
+
+class ImplicitUCPQUBOState(object):
+  '''
+  samples of an implicit UCP QUBO with the aggregates the energy depends on
+  '''
+  operator: 'ImplicitUCPQUBO'
+  x: np.ndarray # samples with the shape (number of variables, number of samples)
+  total_power: np.ndarray # power of all plants at every time t (T, samples)
+  plant_power: np.ndarray # power of every plant i at every time t (N, T, samples)
+  active_levels: np.ndarray # number of active power levels of every plant at every time (N, T, samples)
+  off: np.ndarray # whether the power level 0 of every plant at every time is active (N, T, samples)
+
+  def __init__(self, operator: 'ImplicitUCPQUBO', x: np.ndarray) -> None:
+    '''
+    computes the aggregates of the samples
+
+    :operator: QUBO of the samples
+    :x: samples with the shape (number of variables, number of samples)
+    '''
+    self.operator = operator
+    self.x = x
+    self.total_power, self.plant_power, self.active_levels, self.off = operator.get_aggregates(x)
+
+  def get_deltas(self, v: int) -> np.ndarray:
+    '''
+    returns the energy change of flipping variable v in every sample
+
+    :v: variable index
+    '''
+    operator: ImplicitUCPQUBO = self.operator
+    i, t, k = operator.plant[v], operator.time[v], operator.level[v]
+    AU, AD = operator.AU[i], operator.AD[i]
+
+    # interactions of the variable with the other variables of the same plant in the neighbouring time steps
+    if k == 0:
+      on: np.ndarray = self.active_levels[i] - self.off[i]
+      startup: np.ndarray = (AU * on[t + 1] if t + 1 < operator.num_loads else 0) + (AD * on[t - 1] if t > 0 else 0)
+
+    else:
+      startup = (AU * self.off[i, t - 1] if t > 0 else 0) + (AD * self.off[i, t + 1] if t + 1 < operator.num_loads else 0)
+
+    interactions: np.ndarray = (
+      operator.factors['d'] * operator.power[v] * (self.total_power[t] - self.plant_power[i, t])
+      + operator.factors['p'] * (self.active_levels[i, t] - self.x[v])
+      + operator.factors['s'] * startup
+    )
+
+    return (1 - 2 * self.x[v]) * (operator.linear[v] + interactions)
+
+  def flip(self, v: int, accept: np.ndarray) -> None:
+    '''
+    flips variable v in the samples where accept is true
+
+    :v: variable index
+    :accept: whether the flip is applied to every sample
+    '''
+    operator: ImplicitUCPQUBO = self.operator
+    i, t, k = operator.plant[v], operator.time[v], operator.level[v]
+
+    change: np.ndarray = (1 - 2 * self.x[v]) * accept
+    self.x[v] += change
+
+    self.total_power[t] += operator.power[v] * change
+    self.plant_power[i, t] += operator.power[v] * change
+    self.active_levels[i, t] += change
+
+    if k == 0:
+      self.off[i, t] += change
+
+
+class ImplicitUCPQUBO(object):
+  '''
+  QUBO of an UCP that only stores the power levels, the loads and the coefficients of the plants
+  the demand penalty and the one-hot penalty are squares of sums of the variables of a time step,
+  so energies and flip deltas are computed from these sums instead of the couplings
+  the variables and the energy function are the same as of UCP_QUBO
+  '''
+  num_variables: int
+  num_loads: int
+  P: List[np.ndarray] # discretizised power levels
+  m: QUBOIndices
+  factors: Dict[str, float] # factors of the components like in UCP_QUBO
+  loads: np.ndarray
+  AU: np.ndarray # startup costs of every plant
+  AD: np.ndarray # shutdown costs of every plant
+  plant: np.ndarray # plant index of every variable
+  time: np.ndarray # time index of every variable
+  level: np.ndarray # power level index of every variable
+  power: np.ndarray # power level of every variable
+  linear: np.ndarray # scaled linear bias of every variable
+
+  def __init__(self, ucp: UCP, y_c: float = 1, y_s: float = 1, y_d: float = 1, y_p: float = 1, max_h: float = 10) -> None:
+    '''
+    builds the implicit QUBO of an UCP
+
+    :ucp: UCP instance
+    :y_c: factor of objective function
+    :y_s: factor of startup and shutdown cost
+    :y_d: factor of demand constraints
+    :y_p: factor of constraints making sure only one power level is active per unit and time
+    :max_h: maximum difference of non-zero power levels, default: 10
+    '''
+    self.num_loads = ucp.parameters.num_loads
+    self.P = ucp.get_discretized_power_levels(max_h)
+    self.m = QUBOIndices([len(P_i) for P_i in self.P], self.num_loads)
+    self.num_variables = self.m.num_variables
+    self.factors = {'c': y_c, 's': y_s, 'd': y_d, 'p': y_p}
+
+    self.loads = np.array(ucp.loads, dtype=float)
+    self.AU = np.array([plant.AU for plant in ucp.plants], dtype=float)
+    self.AD = np.array([plant.AD for plant in ucp.plants], dtype=float)
+
+    self.plant, self.time, self.level = self.m.from_index(np.arange(self.num_variables))
+    self.power = np.concatenate([np.tile(P_i, self.num_loads) for P_i in self.P])
+
+    A: np.ndarray = np.array([plant.A for plant in ucp.plants], dtype=float)[self.plant]
+    B: np.ndarray = np.array([plant.B for plant in ucp.plants], dtype=float)[self.plant]
+    C: np.ndarray = np.array([plant.C for plant in ucp.plants], dtype=float)[self.plant]
+    is_on: np.ndarray = self.level > 0
+
+    # linear biases of the cost, demand and startup and shutdown components
+    cost: np.ndarray = np.where(is_on, A + B * self.power + C * (self.power ** 2), 0)
+    demand: np.ndarray = np.where(is_on, self.power ** 2 - self.loads[self.time] * self.power, 0)
+
+    initially_on: np.ndarray = np.array([plant.initially_on for plant in ucp.plants], dtype=bool)[self.plant]
+    startup: np.ndarray = np.where(
+      self.time == 0,
+      np.where(initially_on, np.where(is_on, 0, self.AD[self.plant]), np.where(is_on, self.AU[self.plant], 0)),
+      0
+    )
+
+    self.linear = self.factors['c'] * cost + self.factors['d'] * demand + self.factors['s'] * startup
+
+  def get_aggregates(self, x: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    '''
+    computes the power of all plants, the power of every plant, the number of active power levels
+    and whether the power level 0 is active at every time step for several samples
+
+    :x: samples with the shape (number of variables, number of samples)
+    '''
+    num_plants: int = len(self.P)
+    num_samples: int = x.shape[1]
+
+    plant_power: np.ndarray = np.zeros((num_plants, self.num_loads, num_samples))
+    active_levels: np.ndarray = np.zeros((num_plants, self.num_loads, num_samples))
+    np.add.at(plant_power, (self.plant, self.time), self.power[:, np.newaxis] * x)
+    np.add.at(active_levels, (self.plant, self.time), x)
+
+    off: np.ndarray = x[self.m.to_index(
+      np.arange(num_plants)[:, np.newaxis], np.arange(self.num_loads)[np.newaxis, :], 0
+    )].astype(float)
+
+    return np.sum(plant_power, axis=0), plant_power, active_levels, off
+
+  def create_state(self, x: np.ndarray) -> ImplicitUCPQUBOState:
+    '''
+    creates the state of several samples
+
+    :x: samples with the shape (number of variables, number of samples)
+    '''
+    return ImplicitUCPQUBOState(self, x)
+
+  def compute_energies(self, x: np.ndarray) -> np.ndarray:
+    '''
+    computes the energies of several samples in O(number of variables) per sample
+
+    :x: samples with the shape (number of variables, number of samples)
+    '''
+    total_power, plant_power, active_levels, off = self.get_aggregates(x)
+    on: np.ndarray = active_levels - off
+
+    # products of the power levels of different plants at the same time
+    demand: np.ndarray = 0.5 * (np.sum(total_power ** 2, axis=0) - np.sum(plant_power ** 2, axis=(0, 1)))
+
+    # products of different power levels of the same plant at the same time
+    one_hot: np.ndarray = 0.5 * np.sum(active_levels ** 2 - active_levels, axis=(0, 1))
+
+    # startup after being off at t - 1 and shutdown after being on at t - 1
+    startup: np.ndarray = np.sum(
+      self.AU[:, np.newaxis, np.newaxis] * off[:, :-1] * on[:, 1:]
+      + self.AD[:, np.newaxis, np.newaxis] * on[:, :-1] * off[:, 1:],
+      axis=(0, 1)
+    )
+
+    return (
+      self.linear @ x + self.factors['d'] * demand + self.factors['p'] * one_hot + self.factors['s'] * startup
+    )
+
+  def get_beta_range(self) -> Tuple[float, float]:
+    '''
+    returns suitable inverse temperatures at the start and end of an anneal
+    '''
+    num_levels: np.ndarray = self.m.num_levels[self.plant]
+    max_powers: np.ndarray = np.array([np.max(P_i) for P_i in self.P])
+
+    # upper bound of the energy change of every flip
+    max_deltas: np.ndarray = (
+      np.abs(self.linear)
+      + self.factors['d'] * self.power * (np.sum(max_powers) - max_powers[self.plant])
+      + self.factors['p'] * (num_levels - 1)
+      + self.factors['s'] * (self.AU + self.AD)[self.plant] * (num_levels - 1)
+    )
+
+    positive_powers: np.ndarray = self.power[self.power > 0]
+    magnitudes: np.ndarray = np.concatenate((
+      np.abs(self.linear),
+      [self.factors['p']],
+      self.factors['s'] * np.concatenate((self.AU, self.AD)),
+      [self.factors['d'] * np.min(positive_powers) ** 2] if len(self.P) > 1 and len(positive_powers) > 0 else []
+    ))
+    magnitudes = magnitudes[magnitudes > 0]
+
+    return get_beta_range(float(np.max(max_deltas, initial=0)), float(np.min(magnitudes)) if len(magnitudes) else 0)
@@ -0,0 +1,39 @@
+#!/bin/python
+# version 3.8 required
+
+import os
+from sys import argv
+from Annealing_QUBO.qubo import UCP_QUBO
+from Annealing_QUBO.simulated_annealing import SimulatedAnnealingSampler
+from UCP.unit_commitment_problem import UCP, UCPSolution
+from UCP.experiments import experiments_main
+
+'''
+this file is the experiment runner for the annealing optimizations using QUBOs and the local simulated annealing sampler
+'''
+
+def optimize_annealing_qubo_local(ucp: UCP) -> UCPSolution:
+  '''
+  performs the simulated annealing optimization for an UCP using QUBOs
+
+  :ucp: UCP instance
+  '''
+  ucp_qubo: UCP_QUBO = UCP_QUBO(ucp)
+  solution: UCPSolution = ucp_qubo.optimize(None, SimulatedAnnealingSampler())
+  solution.check_validity()
+
+  return solution
+
+if __name__ == "__main__":
+  '''
+  calls the experiment runner with
+  - the optimization function,
+  - the path and prefix for the result files, and
+  - the command-line arguments
+  '''
+  experiments_main(
+    optimize_annealing_qubo_local,
+    os.path.join('Annealing_QUBO', 'Solutions_Local'),
+    'simulated_annealing',
+    *argv[1:]
+  )
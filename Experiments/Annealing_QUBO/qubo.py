@@ -1,37 +1,42 @@
 #!/bin/python
 # version 3.8 required
 
-from typing import Dict, List, Tuple
+from dataclasses import asdict
+from typing import Callable, Dict, List, Optional, Tuple, Union
 import numpy as np # type: ignore
 
+from Annealing_QUBO.qubo_indices import QUBOIndices
+from Annealing_QUBO.simulated_annealing import QUBOSampler, SamplerResponse
+from Annealing_QUBO.sparse_qubo import QUBOComponents, SparseQUBO
+from UCP.model_cache import ModelCache
+from UCP.model_statistics import ModelStatistics, get_nbytes
 from UCP.unit_commitment_problem import CombustionPlant, UCP, UCPSolution
 from uqo.Problem import Qubo # type: ignore
 from uqo.Response import Response # type: ignore
 from uqo.client.config import Config # type: ignore
 from Util.logging import debug_msg, debug_msg_time
+from Util.timing import Timings
 
 
 class UCP_QUBO(object):
   '''
   handles the generation of QUBOs using the UQO framework
   '''
-  model: Dict[Tuple[int, int], float]
+  biases: SparseQUBO
+  components: QUBOComponents # unscaled components of the QUBO
+  factors: Dict[str, float] # factors of the components
   ucp: UCP
-  m: Dict[Tuple[int, int, int], int] # indices of variables
+  m: QUBOIndices # indices of variables
   P: List[np.ndarray] # discretized power levels
+  timings: Timings # time of building the QUBO
+  _model: Optional[Dict[Tuple[int, int], float]] # QUBO in the dictionary format of the UQO framework (built when accessed)
 
   def init_indices_mapping(self) -> None:
     '''
-    implements the mapping m' of the report using a dictionary m
+    implements the mapping m' of the report using offsets of the variables of every plant
     '''
-    self.m = {}
-    current_m: int = 0
-    for i in range(self.ucp.parameters.num_plants):
-      num_power_levels: int = len(self.P[i])
-      for t in range(self.ucp.parameters.num_loads):
-        for k in range(num_power_levels):
-          self.m[i, t, k] = current_m
-          current_m += 1
+    num_levels: List[int] = [len(P_i) for P_i in self.P]
+    self.m = QUBOIndices(num_levels, self.ucp.parameters.num_loads)
 
   def discretizise_plants(self, max_h: float) -> None:
     '''
@@ -41,41 +46,56 @@ class UCP_QUBO(object):
     '''
     self.P = self.ucp.get_discretized_power_levels(max_h)
 
-  def add_linear_bias(self,
-                      i: int, t: int, k: int,
-                      value: float) -> None:
+  def get_level_template(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
     '''
-    adds a linear bias to the QUBO
-
-    :i: plant index
-    :t: time index
-    :k: power level index
-    :value: weight of the bias
+    returns the plant index, the power level index, the power level,
+    the variable index at time 0 and the index stride in time of every power level of every plant
+    the variable index of a power level at time t is given by index + t * stride
     '''
-    m: int = self.m[i, t, k]
+    plant: np.ndarray = np.repeat(np.arange(self.ucp.parameters.num_plants), self.m.num_levels)
+    level: np.ndarray = np.concatenate([np.arange(len(P_i)) for P_i in self.P])
+    power: np.ndarray = np.concatenate(self.P)
+    index: np.ndarray = self.m.to_index(plant, 0, level)
+    stride: np.ndarray = self.m.num_levels[plant]
 
-    bias: float = self.model.get((m, m), 0)
-    self.model[m, m] = bias + value
+    return plant, level, power, index, stride
 
-  def add_linear(self, y_c: float, y_d: float) -> None:
+  def add_linear_cost(self, biases: SparseQUBO) -> None:
     '''
-    sets the linear biases for the QUBO
+    adds the unscaled linear biases of the objective function to the QUBO
+
+    :biases: QUBO to add the biases to
     '''
     for i in range(self.ucp.parameters.num_plants):
       plant: CombustionPlant = self.ucp.plants[i]
-      for t in range(self.ucp.parameters.num_loads):
-        for k in range(1, len(self.P[i])):
-          value: float = 0
+      P_i: np.ndarray = self.P[i][1:]
+
+      # implements the cost part of the formula for linear biases of the report for every t and k > 0
+      values: np.ndarray = plant.A + plant.B * P_i + plant.C * (P_i ** 2)
+
+      biases.add_linear_biases(self.m.get_plant_indices(i)[:, 1:], values)
+
+  def add_linear_demand(self, biases: SparseQUBO) -> None:
+    '''
+    adds the unscaled linear biases of the demand constraints to the QUBO
+
+    :biases: QUBO to add the biases to
+    '''
+    loads: np.ndarray = np.array(self.ucp.loads, dtype=float)
 
-          # implements the formula for linear biases of the report
-          value += y_c * (plant.A + plant.B * self.P[i][k] + plant.C * (self.P[i][k] ** 2))
-          value += y_d * (self.P[i][k] ** 2 - self.ucp.loads[t] * self.P[i][k])
+    for i in range(self.ucp.parameters.num_plants):
+      P_i: np.ndarray = self.P[i][1:]
+
+      # implements the demand part of the formula for linear biases of the report for every t and k > 0
+      values: np.ndarray = P_i ** 2 - loads[:, np.newaxis] * P_i
 
-          self.add_linear_bias(i, t, k, value)
+      biases.add_linear_biases(self.m.get_plant_indices(i)[:, 1:], values)
 
-  def add_linear_startup_shutdown(self, y_s: float) -> None:
+  def add_linear_startup_shutdown(self, biases: SparseQUBO) -> None:
     '''
-    sets the linear biases for the QUBO regarding startup and shutdown costs
+    adds the unscaled linear biases regarding startup and shutdown costs to the QUBO
+
+    :biases: QUBO to add the biases to
     '''
     for i in range(self.ucp.parameters.num_plants):
       # compute once for every plant i
@@ -83,75 +103,126 @@ class UCP_QUBO(object):
 
       if is_initially_on:
         A_D: float = self.ucp.plants[i].AD
-        self.add_linear_bias(i, 0, 0, y_s * A_D)
+        biases.add_linear_biases(self.m[i, 0, 0], A_D)
 
       else:
         A_U: float = self.ucp.plants[i].AU
-        for k in range(1, len(self.P[i])):
-          self.add_linear_bias(i, 0, k, y_s * A_U)
+        biases.add_linear_biases(self.m.get_plant_indices(i)[0, 1:], A_U)
 
-  def add_quadratic_bias(self,
-                         i1: int, t1: int, k1: int,
-                         i2: int, t2: int, k2: int,
-                         value: float) -> None:
+  def add_quadratic_startup_shutdown(self, biases: SparseQUBO) -> None:
     '''
-    adds a quadratic bias to the QUBO
+    adds the unscaled quadratic biases for the startup costs to the QUBO
 
-    :i1: plant index source
-    :t1: time index source
-    :k1: power level index source
-    :i2: plant index target
-    :t2: time index target
-    :k2: power level index target
-    :value: weight of the bias
-    '''
-    m1: int = self.m[i1, t1, k1]
-    m2: int = self.m[i2, t2, k2]
-
-    bias: float = self.model.get((m1, m2), 0)
-    self.model[m1, m2] = bias + value
-
-  def add_quadratic_startup_shutdown(self, y_s: float) -> None:
-    '''
-    sets the quadratic biases for the startup costs for the QUBO
+    :biases: QUBO to add the biases to
     '''
     for i in range(self.ucp.parameters.num_plants):
       # compute once for every plant i
       AU: float = self.ucp.plants[i].AU
       AD: float = self.ucp.plants[i].AD
+      indices_i: np.ndarray = self.m.get_plant_indices(i)
+
+      # apply for one plant i at every time t > 0 and every power level k > 0
+      biases.add_quadratic_biases(indices_i[:-1, :1], indices_i[1:, 1:], AU)
+      biases.add_quadratic_biases(indices_i[:-1, 1:], indices_i[1:, :1], AD)
+
+  def add_quadratic_demand(self, biases: SparseQUBO) -> None:
+    '''
+    adds the unscaled quadratic biases for the demand to the QUBO
+
+    :biases: QUBO to add the biases to
+    '''
+    plant, _, power, index, stride = self.get_level_template()
 
-      for t in range(1, self.ucp.parameters.num_loads):
-        # apply for one plant i at every time t > 0
-        for k in range(1, len(self.P[i])):
-          self.add_quadratic_bias(i, t-1, 0, i, t, k, AU * y_s)
-          self.add_quadratic_bias(i, t-1, k, i, t, 0, AD * y_s)
+    # every pair of power levels k, l of every pair of plants i, j (i < j)
+    k, l = np.nonzero(plant[:, np.newaxis] < plant[np.newaxis, :])
+    values: np.ndarray = power[l] * power[k]
 
-  def add_quadratic_demand(self, y_d: float) -> None:
+    # apply to every time t
+    t: np.ndarray = np.arange(self.ucp.parameters.num_loads)[:, np.newaxis]
+    biases.add_quadratic_biases(index[k] + t * stride[k], index[l] + t * stride[l], values)
+
+  def add_quadratic_discretized(self, biases: SparseQUBO) -> None:
     '''
-    sets the quadratic biases for the demand for the QUBO
+    adds the unscaled quadratic biases for making sure only one power level is active per unit and time to the QUBO
+
+    :biases: QUBO to add the biases to
     '''
-    for j in range(self.ucp.parameters.num_plants):
-      for i in range(j):
-        for l in range(len(self.P[j])):
-          for k in range(len(self.P[i])):
-            # compute for every quadruplet i, j, k, l (i < j) (i, j plant indices, k, l power output level indices)
-            value: float = self.P[j][l] * self.P[i][k]
-            for t in range(self.ucp.parameters.num_loads):
-              # apply to every time t
-              self.add_quadratic_bias(i, t, k, j, t, l, value * y_d)
+    plant, level, _, index, stride = self.get_level_template()
 
-  def add_quadratic_discretized(self, y_d: float) -> None:
+    # every pair of power output levels k, l (k < l) of every plant i
+    k, l = np.nonzero(
+      (plant[:, np.newaxis] == plant[np.newaxis, :]) & (level[:, np.newaxis] < level[np.newaxis, :])
+    )
+
+    # apply to every time t
+    t: np.ndarray = np.arange(self.ucp.parameters.num_loads)[:, np.newaxis]
+    biases.add_quadratic_biases(index[k] + t * stride[k], index[l] + t * stride[l], 1)
+
+  def build_component(self, *add_functions: Callable[[SparseQUBO], None]) -> SparseQUBO:
     '''
-    sets the quadratic biases for making sure only one power level is active per unit and time
+    builds an unscaled component of the QUBO
+
+    :add_functions: functions adding the biases of the component
     '''
-    for i in range(self.ucp.parameters.num_plants):
-      for t in range(self.ucp.parameters.num_loads):
-        for l in range(len(self.P[i])):
-          for k in range(l):
-            # apply for every pair of power output levels k, l (k < l) for every plant i at every time t
-            self.add_quadratic_bias(i, t, k, i, t, l, y_d)
+    biases: SparseQUBO = SparseQUBO(self.m.num_variables)
+
+    for add_function in add_functions:
+      add_function(biases)
+
+    return biases
+
+  def build_components(self) -> None:
+    '''
+    builds the unscaled components of the QUBO
+    the components are combined in the order cost, demand, startup and shutdown, power levels
+    '''
+    self.components = QUBOComponents({
+      'c': self.build_component(self.add_linear_cost),
+      'd': self.build_component(self.add_linear_demand, self.add_quadratic_demand),
+      's': self.build_component(self.add_linear_startup_shutdown, self.add_quadratic_startup_shutdown),
+      'p': self.build_component(self.add_quadratic_discretized)
+    })
+
+  def reweight(self, y_c: Optional[float] = None, y_s: Optional[float] = None,
+               y_d: Optional[float] = None, y_p: Optional[float] = None) -> SparseQUBO:
+    '''
+    combines the unscaled components to the QUBO with new factors
+    factors that are not specified keep their current value
+
+    :y_c: factor of objective function
+    :y_s: factor of startup and shutdown cost
+    :y_d: factor of demand constraints
+    :y_p: factor of constraints making sure only one power level is active per unit and time
+    '''
+    for name, factor in (('c', y_c), ('s', y_s), ('d', y_d), ('p', y_p)):
+      if factor is not None:
+        self.factors[name] = factor
+
+    self.biases = self.components.combine(self.factors)
+    self._model = None
+
+    return self.biases
+
+  def load_components(self, cache: ModelCache, max_h: float) -> None:
+    '''
+    loads the unscaled components from a cache or builds and stores them
+    the components do not depend on the factors, so one entry serves all factors
+
+    :cache: cache of encoded models
+    :max_h: maximum difference of non-zero power levels
+    '''
+    key: str = cache.get_key(self.ucp, 'qubo', max_h=max_h)
+    arrays: Optional[Dict[str, np.ndarray]] = cache.load(key)
 
-  def __init__(self, ucp: UCP, y_c: float = 1, y_s: float = 1, y_d: float = 1, y_p: float = 1, max_h: float = 10) -> None:
+    if arrays is not None:
+      self.components = QUBOComponents.from_arrays(arrays)
+
+    else:
+      self.build_components()
+      cache.store(key, self.components.to_arrays())
+
+  def __init__(self, ucp: UCP, y_c: float = 1, y_s: float = 1, y_d: float = 1, y_p: float = 1, max_h: float = 10,
+               cache: Optional[ModelCache] = None) -> None:
     '''
     builds a QUBO from an UCP using the UQO framework
 
@@ -161,19 +232,76 @@ class UCP_QUBO(object):
     :y_d: factor of demand constraints
     :y_p: factor of constraints making sure only one power level is active per unit and time
     :max_h: maximum difference of non-zero power levels, default: 10
+    :cache: cache of encoded models, default: the cache given by the environment variable UCP_MODEL_CACHE (if set)
     '''
-    self.model = {}
     self.ucp = ucp
+    self.factors = {'c': y_c, 's': y_s, 'd': y_d, 'p': y_p}
+    self._model = None
+    self.timings = Timings()
+
+    with self.timings.phase('build'):
+      self.discretizise_plants(max_h)
+      self.init_indices_mapping()
+
+      cache = cache or ModelCache.get_default()
+      if cache is not None:
+        self.load_components(cache, max_h)
+      else:
+        self.build_components()
+
+      self.reweight()
+
+  @property
+  def model(self) -> Dict[Tuple[int, int], float]:
+    '''
+    the QUBO in the dictionary format of the UQO framework
+    it is only generated when it is accessed for the first time
+    '''
+    if self._model is None:
+      self._model = self.biases.to_dict()
 
-    self.discretizise_plants(max_h)
-    self.init_indices_mapping()
+    return self._model
 
-    self.add_quadratic_startup_shutdown(y_s)
-    self.add_quadratic_demand(y_d)
-    self.add_quadratic_discretized(y_p)
+  def get_statistics(self) -> ModelStatistics:
+    '''
+    returns the size of the QUBO
+    the memory contains the biases and the unscaled components
+    '''
+    rows, cols, values = self.biases.to_coo()
+    couplers: int = int(np.count_nonzero((rows != cols) & (values != 0)))
+
+    return ModelStatistics.from_quadratic(self.biases.num_variables, couplers, get_nbytes([
+      rows, cols, values, self.components.rows, self.components.cols, *self.components.values.values()
+    ]))
+
+  def get_variables_from_results(self, results: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    '''
+    computes the UCP variables from several QUBO solutions at once
+    returns the commitment and power output of units with the shape (number of solutions, number of plants, number of loads)
+
+    :results: QUBO solutions with the shape (number of solutions, number of variables)
+    '''
+    x: np.ndarray = np.atleast_2d(np.asarray(results))
+    p: np.ndarray = np.zeros((x.shape[0], self.ucp.parameters.num_plants, self.ucp.parameters.num_loads))
+
+    for i in range(self.ucp.parameters.num_plants):
+      # every power level k possible at time t for plant i
+      active: np.ndarray = x[:, self.m.get_plant_indices(i)] == 1
+      num_indices: np.ndarray = active.sum(axis=2)
 
-    self.add_linear(y_c, y_d)
-    self.add_linear_startup_shutdown(y_s)
+      # choose median power level
+      median: np.ndarray = np.argmax(active & (np.cumsum(active, axis=2) == num_indices[..., np.newaxis] // 2 + 1), axis=2)
+      p[:, i] = np.where(num_indices > 0, self.P[i][median], 0.)
+
+      if x.shape[0] == 1:
+        for t in np.nonzero(num_indices[0] > 1)[0]:
+          debug_msg('Warning: {} possible power levels for plant {} detected'.format(num_indices[0, t], i))
+
+      elif np.any(num_indices > 1):
+        debug_msg('Warning: multiple possible power levels for plant {} detected in {} of {} solutions'.format(
+          i, np.count_nonzero(np.any(num_indices > 1, axis=1)), x.shape[0]))
+
+    return p > 0, p
 
   def get_variables_from_result(self, result: List[int], u: List[List[bool]], p: List[List[float]]) -> None:
     '''
@@ -183,55 +311,62 @@ class UCP_QUBO(object):
     :u: commitment of units (output variable)
     :p: power output of units (output variable)
     '''
-    for i in range(self.ucp.parameters.num_plants):
-      u.append([])
-      p.append([])
-
-      for t in range(self.ucp.parameters.num_loads):
-        # store every power level k possible at time t for plant i
-        value_indices: List[int] = []
-        for k in range(len(self.P[i])):
-          if result[self.m[i, t, k]] == 1:
-            value_indices.append(k)
+    u_batch, p_batch = self.get_variables_from_results(np.asarray(result)[np.newaxis, :])
 
-        value: float = 0
-        num_indices: int = len(value_indices)
-        if num_indices > 0:
-          # choose median power level
-          value = self.P[i][value_indices[(int) (num_indices / 2)]]
-          if num_indices > 1:
-            debug_msg('Warning: {} possible power levels for plant {} detected'.format(num_indices, i))
+    u.extend(u_batch[0].tolist())
+    p.extend(p_batch[0].tolist())
 
-        p[i].append(value)
-        u[i].append((bool) (p[i][t] > 0))
-
-  def optimize(self, config: Config, sampler: str, shots: int = 1, adjust: bool = True):
+  def optimize(self, config: Optional[Config], sampler: Union[str, QUBOSampler], shots: int = 1,
+               adjust: bool = True):
     '''
     optimizes the QUBO using a specified sampler
+    all solutions returned by the sampler are decoded and the best (feasible) one is chosen
 
-    :config: QUO config
-    :sampler: sampler used to optimize the QUBO
-    :shots: number of shots the sampler should run
-    :adjust: whether the result should be adjusted to meet power demand at all times
+    :config: QUO config (not needed for local samplers)
+    :sampler: name of the sampler of the UQO framework or a local sampler used to optimize the QUBO
+    :shots: number of shots the sampler of the UQO framework should run
+    :adjust: whether the results should be adjusted to meet power demand at all times
     '''
-    problem: Qubo = Qubo(config, self.model).with_platform('dwave').with_solver(sampler)
-    print(problem.find_pegasus_embedding())
-    debug_msg_time('Start Solver')
-    self.answer: Response = problem.solve(shots)
-    debug_msg_time('Solver finished')
+    timings: Timings = Timings()
+
+    if isinstance(sampler, str):
+      with timings.phase('embedding'):
+        problem: Qubo = Qubo(config, self.model).with_platform('dwave').with_solver(sampler)
+        print(problem.find_pegasus_embedding())
+
+      debug_msg_time('Start Solver')
+      with timings.phase('submission'):
+        self.answer: Union[Response, SamplerResponse] = problem.solve(shots)
+      debug_msg_time('Solver finished')
+
+      # the UQO framework does not report the run time of the solver
+      time: float = timings.get_wall('submission')
 
-    sample: List[int] = self.answer.solutions[0]
+    else:
+      debug_msg_time('Start Solver')
+      with timings.phase('solve'):
+        self.answer = sampler.sample_qubo(self.biases)
+      debug_msg_time('Solver finished')
 
-    u: List[List[bool]] = []
-    p: List[List[float]] = []
+      time = self.answer.timing / (10 ** 6)
 
-    self.get_variables_from_result(sample, u, p)
+    with timings.phase('decode'):
+      u, p = self.get_variables_from_results(np.array(self.answer.solutions))
 
-    time: float = -1 #answer.timing / (10 ** 6)
-    solution: UCPSolution = UCPSolution(self.ucp, time, True, self.ucp.calculate_o(u, p), u, p)
+    with timings.phase('adjust'):
+      solution: UCPSolution = UCPSolution.from_samples(self.ucp, time, u, p, adjust)
 
     if adjust:
-      solution.check_validity()
-      solution.adjust_variables()
+      # the violations of the selected sample are reported as returned by the sampler (before the adjustment)
+      selected: int = solution.statistics['selected_sample']
+      sample: UCPSolution = UCPSolution(
+        self.ucp, time, True, self.ucp.calculate_o(u[selected].tolist(), p[selected].tolist()),
+        u[selected].tolist(), p[selected].tolist()
+      )
+      with timings.phase('check_validity'):
+        sample.check_validity()
+
+    solution.timings = {**self.timings.to_dict(), **timings.to_dict()}
+    solution.metrics = {**solution.metrics, 'model': asdict(self.get_statistics())}
 
     return solution
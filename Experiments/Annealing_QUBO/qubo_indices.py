@@ -0,0 +1,88 @@
+#!/bin/python
+# version 3.8 required
+
+from typing import Any, List, Tuple
+import numpy as np # type: ignore
+
+
+class QUBOIndices(object):
+  '''
+  implements the mapping m' of the report arithmetically
+  the variable of plant i at time t with power level k has the index offsets[i] + t * K_i + k
+  where K_i is the number of power levels of plant i
+  '''
+  num_loads: int
+  num_levels: np.ndarray # number of power levels K_i of every plant i
+  offsets: np.ndarray # index of the first variable of every plant i, the last entry is the number of variables
+
+  def __init__(self, num_levels: List[int], num_loads: int) -> None:
+    '''
+    initializes the mapping
+
+    :num_levels: number of power levels of every plant
+    :num_loads: number of loads (time steps)
+    '''
+    self.num_loads = num_loads
+    self.num_levels = np.array(num_levels, dtype=np.int64)
+    self.offsets = np.concatenate(([0], np.cumsum(self.num_levels * num_loads))).astype(np.int64)
+
+  @property
+  def num_variables(self) -> int:
+    '''
+    number of binary variables of the QUBO
+    '''
+    return int(self.offsets[-1])
+
+  @staticmethod
+  def unwrap(value: np.ndarray) -> Any:
+    '''
+    converts zero-dimensional arrays to python integers
+
+    :value: array to convert
+    '''
+    if np.ndim(value) == 0:
+      return int(value)
+
+    return value
+
+  def to_index(self, i: Any, t: Any, k: Any) -> Any:
+    '''
+    maps plant, time and power level indices to variable indices
+    works with scalars and arrays (broadcast against each other)
+
+    :i: plant index
+    :t: time index
+    :k: power level index
+    '''
+    i = np.asarray(i, dtype=np.int64)
+    return self.unwrap(self.offsets[i] + np.asarray(t, dtype=np.int64) * self.num_levels[i] + np.asarray(k, dtype=np.int64))
+
+  def from_index(self, m: Any) -> Tuple[Any, Any, Any]:
+    '''
+    maps variable indices back to plant, time and power level indices
+    works with scalars and arrays
+
+    :m: variable index
+    '''
+    m = np.asarray(m, dtype=np.int64)
+    i: np.ndarray = np.searchsorted(self.offsets, m, side='right') - 1
+    t, k = np.divmod(m - self.offsets[i], self.num_levels[i])
+
+    return self.unwrap(i), self.unwrap(t), self.unwrap(k)
+
+  def __getitem__(self, key: Tuple[Any, Any, Any]) -> Any:
+    '''
+    allows to use the mapping like the dictionary m[i, t, k]
+
+    :key: plant, time and power level index
+    '''
+    i, t, k = key
+    return self.to_index(i, t, k)
+
+  def get_plant_indices(self, i: int) -> np.ndarray:
+    '''
+    returns the indices of all variables of plant i with the shape (number of loads, K_i)
+
+    :i: plant index
+    '''
+    return np.arange(self.offsets[i], self.offsets[i + 1]).reshape(self.num_loads, self.num_levels[i])
@@ -0,0 +1,157 @@
+#!/bin/python
+# version 3.8 required
+
+from typing import Protocol, Tuple
+import numpy as np # type: ignore
+from scipy.sparse import csr_matrix # type: ignore
+
+from Annealing_QUBO.sparse_qubo import SparseQUBO
+
+
+class QUBOState(Protocol):
+  '''
+  interface of the samples of a QUBO operator that local samplers modify by single flips
+  '''
+  x: np.ndarray # samples with the shape (number of variables, number of samples)
+
+  def get_deltas(self, v: int) -> np.ndarray:
+    '''
+    returns the energy change of flipping variable v in every sample
+    '''
+    ...
+
+  def flip(self, v: int, accept: np.ndarray) -> None:
+    '''
+    flips variable v in the samples where accept is true
+    '''
+    ...
+
+
+class QUBOOperator(Protocol):
+  '''
+  interface of QUBOs that local samplers can work on without knowing how the biases are stored
+  '''
+  num_variables: int
+
+  def create_state(self, x: np.ndarray) -> QUBOState:
+    '''
+    creates the state of several samples with the shape (number of variables, number of samples)
+    '''
+    ...
+
+  def compute_energies(self, x: np.ndarray) -> np.ndarray:
+    '''
+    computes the energies of several samples with the shape (number of variables, number of samples)
+    '''
+    ...
+
+  def get_beta_range(self) -> Tuple[float, float]:
+    '''
+    returns suitable inverse temperatures at the start and end of an anneal
+    '''
+    ...
+
+
+def get_beta_range(max_delta: float, min_delta: float) -> Tuple[float, float]:
+  '''
+  chooses the inverse temperatures such that at the start the largest possible energy increase
+  is accepted with probability 1/2 and at the end the smallest bias is accepted with probability 1/100
+
+  :max_delta: upper bound of the energy change of a single flip
+  :min_delta: smallest non-zero bias
+  '''
+  if max_delta <= 0 or min_delta <= 0:
+    return 1., 1.
+
+  return np.log(2) / max_delta, np.log(100) / min_delta
+
+
+class ExplicitQUBOState(object):
+  '''
+  samples of an explicit QUBO with the local field of every variable
+  the energy change of flipping x_v is (1 - 2 x_v) * field_v
+  '''
+  operator: 'ExplicitQUBOOperator'
+  x: np.ndarray
+  field: np.ndarray
+
+  def __init__(self, operator: 'ExplicitQUBOOperator', x: np.ndarray) -> None:
+    '''
+    computes the local fields of the samples
+
+    :operator: QUBO of the samples
+    :x: samples with the shape (number of variables, number of samples)
+    '''
+    self.operator = operator
+    self.x = x
+    self.field = operator.linear[:, np.newaxis] + operator.couplings @ x
+
+  def get_deltas(self, v: int) -> np.ndarray:
+    '''
+    returns the energy change of flipping variable v in every sample
+
+    :v: variable index
+    '''
+    return (1 - 2 * self.x[v]) * self.field[v]
+
+  def flip(self, v: int, accept: np.ndarray) -> None:
+    '''
+    flips variable v in the samples where accept is true
+
+    :v: variable index
+    :accept: whether the flip is applied to every sample
+    '''
+    change: np.ndarray = (1 - 2 * self.x[v]) * accept
+    self.x[v] += change
+
+    # only the neighbours of v are affected by the flip
+    couplings: csr_matrix = self.operator.couplings
+    start, end = couplings.indptr[v], couplings.indptr[v + 1]
+    self.field[couplings.indices[start:end]] += couplings.data[start:end, np.newaxis] * change
+
+
+class ExplicitQUBOOperator(object):
+  '''
+  QUBO stored as linear biases and a sparse symmetric matrix of the couplings
+  '''
+  num_variables: int
+  linear: np.ndarray
+  couplings: csr_matrix
+
+  def __init__(self, qubo: SparseQUBO) -> None:
+    '''
+    extracts the biases of a QUBO
+
+    :qubo: QUBO instance
+    '''
+    self.num_variables = qubo.num_variables
+    self.linear, self.couplings = qubo.to_linear_and_couplings()
+
+  def create_state(self, x: np.ndarray) -> ExplicitQUBOState:
+    '''
+    creates the state of several samples
+
+    :x: samples with the shape (number of variables, number of samples)
+    '''
+    return ExplicitQUBOState(self, x)
+
+  def compute_energies(self, x: np.ndarray) -> np.ndarray:
+    '''
+    computes the energies of several samples
+
+    :x: samples with the shape (number of variables, number of samples)
+    '''
+    return self.linear @ x + 0.5 * np.sum(x * (self.couplings @ x), axis=0)
+
+  def get_beta_range(self) -> Tuple[float, float]:
+    '''
+    returns suitable inverse temperatures at the start and end of an anneal
+    '''
+    magnitudes: np.ndarray = np.concatenate((np.abs(self.linear), np.abs(self.couplings.data)))
+    magnitudes = magnitudes[magnitudes > 0]
+
+    if len(magnitudes) == 0:
+      return 1., 1.
+
+    max_delta: float = float(np.max(np.abs(self.linear) + np.asarray(abs(self.couplings).sum(axis=1)).ravel()))
+    return get_beta_range(max_delta, float(np.min(magnitudes)))
@@ -0,0 +1,116 @@
+#!/bin/python
+# version 3.8 required
+
+from dataclasses import dataclass, field
+import time
+from typing import Any, Dict, List, Optional, Protocol, Tuple, Union
+import numpy as np # type: ignore
+
+from Annealing_QUBO.qubo_operators import ExplicitQUBOOperator, QUBOOperator, QUBOState
+from Annealing_QUBO.sparse_qubo import SparseQUBO
+
+
+@dataclass
+class SamplerResponse(object):
+  '''
+  result of a local sampler in the same shape as the response of the UQO framework
+  '''
+  solutions: List[List[int]] # samples sorted by energy, the first one has the lowest energy
+  energies: List[float] # energy of every sample
+  timing: float # run time of the sampler in microseconds
+  info: Dict[str, Any] = field(default_factory=dict) # additional information of the sampler (e.g. statistics)
+
+
+class QUBOSampler(Protocol):
+  '''
+  interface of local samplers that can be passed to UCP_QUBO.optimize
+  '''
+  def sample_qubo(self, qubo: SparseQUBO) -> SamplerResponse: ...
+
+
+class SimulatedAnnealingSampler(object):
+  '''
+  solves QUBOs locally via simulated annealing
+  all replicas (reads) are annealed at once as columns of NumPy arrays
+  the QUBO is accessed through a QUBO operator that provides the energy change of single flips
+  '''
+  num_reads: int
+  num_sweeps: int
+  beta_range: Optional[Tuple[float, float]] # inverse temperatures at the start and end of the anneal
+  beta_schedule_type: str # 'geometric' or 'linear'
+  seed: Optional[int]
+
+  def __init__(self, num_reads: int = 100, num_sweeps: int = 1000, beta_range: Optional[Tuple[float, float]] = None,
+               beta_schedule_type: str = 'geometric', seed: Optional[int] = None) -> None:
+    '''
+    initializes the sampler
+
+    :num_reads: number of independent replicas
+    :num_sweeps: number of sweeps over all variables, the temperature is lowered after each sweep
+    :beta_range: inverse temperatures at the start and end of the anneal (derived from the biases if not given)
+    :beta_schedule_type: interpolation between the inverse temperatures, 'geometric' or 'linear'
+    :seed: seed of the random number generator
+    '''
+    if beta_schedule_type not in ('geometric', 'linear'):
+      raise ValueError('Unknown beta schedule type {}'.format(beta_schedule_type))
+
+    self.num_reads = num_reads
+    self.num_sweeps = num_sweeps
+    self.beta_range = beta_range
+    self.beta_schedule_type = beta_schedule_type
+    self.seed = seed
+
+  def get_beta_schedule(self, operator: QUBOOperator) -> np.ndarray:
+    '''
+    returns the inverse temperature of every sweep
+
+    :operator: QUBO to anneal
+    '''
+    beta_start, beta_end = self.beta_range or operator.get_beta_range()
+
+    if self.beta_schedule_type == 'geometric':
+      return np.geomspace(beta_start, beta_end, self.num_sweeps)
+
+    return np.linspace(beta_start, beta_end, self.num_sweeps)
+
+  def anneal(self, operator: QUBOOperator, rng: np.random.Generator) -> np.ndarray:
+    '''
+    performs the sweeps on all replicas and returns the final states
+
+    :operator: QUBO to anneal
+    :rng: random number generator
+    '''
+    num_variables: int = operator.num_variables
+    state: QUBOState = operator.create_state(
+      rng.integers(0, 2, size=(num_variables, self.num_reads)).astype(np.float64)
+    )
+
+    for beta in self.get_beta_schedule(operator):
+      thresholds: np.ndarray = np.log(1 - rng.random((num_variables, self.num_reads))) / beta
+
+      for v in range(num_variables):
+        accept: np.ndarray = -state.get_deltas(v) >= thresholds[v]
+
+        if accept.any():
+          state.flip(v, accept)
+
+    return state.x
+
+  def sample_qubo(self, qubo: Union[SparseQUBO, Dict[Tuple[int, int], float], QUBOOperator]) -> SamplerResponse:
+    '''
+    samples from a QUBO
+
+    :qubo: QUBO as sparse QUBO, in the dictionary format of the UQO framework or as QUBO operator
+           (e.g. an implicit UCP QUBO)
+    '''
+    start: float = time.perf_counter()
+
+    model: Union[SparseQUBO, QUBOOperator] = SparseQUBO.from_dict(qubo) if isinstance(qubo, dict) else qubo
+    operator: QUBOOperator = ExplicitQUBOOperator(model) if isinstance(model, SparseQUBO) else model
+    x: np.ndarray = self.anneal(operator, np.random.default_rng(self.seed))
+    energies: np.ndarray = operator.compute_energies(x)
+
+    timing: float = (time.perf_counter() - start) * 10 ** 6
+
+    order: np.ndarray = np.argsort(energies, kind='stable')
+    return SamplerResponse(x[:, order].T.astype(np.int64).tolist(), energies[order].tolist(), timing)
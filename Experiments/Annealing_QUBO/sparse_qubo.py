@@ -0,0 +1,214 @@
+#!/bin/python
+# version 3.8 required
+
+from typing import Dict, List, Tuple, Union
+import numpy as np # type: ignore
+from scipy.sparse import csr_matrix # type: ignore
+
+
+class SparseQUBO(object):
+  '''
+  holds the biases of a QUBO as blocks of coordinate arrays (row, col, value)
+  linear biases are stored on the diagonal (row == col)
+  '''
+  num_variables: int
+  rows: List[np.ndarray]
+  cols: List[np.ndarray]
+  values: List[np.ndarray]
+  is_canonical: bool # whether the QUBO consists of a single block without duplicates, sorted by (row, col)
+
+  def __init__(self, num_variables: int) -> None:
+    '''
+    initializes an empty QUBO
+
+    :num_variables: number of binary variables of the QUBO
+    '''
+    self.num_variables = num_variables
+    self.rows = []
+    self.cols = []
+    self.values = []
+    self.is_canonical = False
+
+  @staticmethod
+  def from_coo(num_variables: int, rows: np.ndarray, cols: np.ndarray, values: np.ndarray):
+    '''
+    creates a QUBO from coordinate arrays without duplicates, sorted by (row, col)
+
+    :num_variables: number of binary variables of the QUBO
+    :rows: source variable indices
+    :cols: target variable indices
+    :values: weights of the biases
+    '''
+    qubo: SparseQUBO = SparseQUBO(num_variables)
+    qubo.rows = [rows]
+    qubo.cols = [cols]
+    qubo.values = [values]
+    qubo.is_canonical = True
+
+    return qubo
+
+  @staticmethod
+  def from_dict(model: Dict[Tuple[int, int], float]):
+    '''
+    creates a QUBO from the dictionary format of the UQO framework
+
+    :model: biases by pair of variable indices
+    '''
+    num_variables: int = 1 + max((max(key) for key in model), default=-1)
+    qubo: SparseQUBO = SparseQUBO(num_variables)
+
+    if model:
+      coordinates: np.ndarray = np.array(list(model.keys()), dtype=np.int64)
+      qubo.add_quadratic_biases(coordinates[:, 0], coordinates[:, 1], np.array(list(model.values()), dtype=np.float64))
+
+    return qubo
+
+  def add_quadratic_biases(self, rows: np.ndarray, cols: np.ndarray, values: Union[float, np.ndarray]) -> None:
+    '''
+    adds a block of quadratic biases to the QUBO
+    biases with the same coordinates are summed up
+
+    :rows: source variable indices
+    :cols: target variable indices
+    :values: weights of the biases (broadcast to the shape of the indices)
+    '''
+    rows, cols, values = np.broadcast_arrays(rows, cols, values)
+
+    self.rows.append(np.asarray(rows, dtype=np.int64).ravel())
+    self.cols.append(np.asarray(cols, dtype=np.int64).ravel())
+    self.values.append(np.asarray(values, dtype=np.float64).ravel())
+    self.is_canonical = False
+
+  def add_linear_biases(self, indices: np.ndarray, values: Union[float, np.ndarray]) -> None:
+    '''
+    adds a block of linear biases to the QUBO
+
+    :indices: variable indices
+    :values: weights of the biases (broadcast to the shape of the indices)
+    '''
+    self.add_quadratic_biases(indices, indices, values)
+
+  def to_coo(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    '''
+    returns the QUBO as coordinate arrays (row, col, value) without duplicates, sorted by (row, col)
+    '''
+    if not self.rows:
+      return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64), np.zeros(0)
+
+    if not self.is_canonical:
+      rows: np.ndarray = np.concatenate(self.rows)
+      cols: np.ndarray = np.concatenate(self.cols)
+      values: np.ndarray = np.concatenate(self.values)
+
+      # sum up duplicate coordinates in the order they were added
+      keys: np.ndarray = rows * self.num_variables + cols
+      unique_keys, inverse = np.unique(keys, return_inverse=True)
+      summed_values: np.ndarray = np.bincount(inverse.ravel(), weights=values, minlength=len(unique_keys))
+
+      # replace the blocks by the result, so the conversion is only done once
+      self.rows = [unique_keys // self.num_variables]
+      self.cols = [unique_keys % self.num_variables]
+      self.values = [summed_values]
+      self.is_canonical = True
+
+    return self.rows[0], self.cols[0], self.values[0]
+
+  def to_csr(self) -> csr_matrix:
+    '''
+    returns the QUBO as upper triangular sparse matrix in CSR format
+    '''
+    rows, cols, values = self.to_coo()
+    return csr_matrix((values, (rows, cols)), shape=(self.num_variables, self.num_variables))
+
+  def to_linear_and_couplings(self) -> Tuple[np.ndarray, csr_matrix]:
+    '''
+    returns the linear biases and the symmetric matrix of the couplings (without diagonal)
+    the energy of a sample x is linear @ x + x @ couplings @ x / 2
+    '''
+    rows, cols, values = self.to_coo()
+    diagonal: np.ndarray = rows == cols
+
+    linear: np.ndarray = np.bincount(rows[diagonal], weights=values[diagonal], minlength=self.num_variables)
+    couplings: csr_matrix = csr_matrix(
+      (values[~diagonal], (rows[~diagonal], cols[~diagonal])), shape=(self.num_variables, self.num_variables)
+    )
+
+    return linear, (couplings + couplings.T).tocsr()
+
+  def to_dict(self) -> Dict[Tuple[int, int], float]:
+    '''
+    converts the QUBO to the dictionary format expected by the UQO framework
+    '''
+    rows, cols, values = self.to_coo()
+    return dict(zip(zip(rows.tolist(), cols.tolist()), values.tolist()))
+
+
+class QUBOComponents(object):
+  '''
+  holds several unscaled QUBOs on a common sparsity pattern
+  so that weighted sums of them can be computed without rebuilding the QUBOs
+  '''
+  num_variables: int
+  rows: np.ndarray
+  cols: np.ndarray
+  values: Dict[str, np.ndarray] # values of every component on the common sparsity pattern
+
+  def __init__(self, components: Dict[str, SparseQUBO]) -> None:
+    '''
+    aligns the components on the union of their sparsity patterns
+
+    :components: unscaled QUBOs by name, they have to share the same number of variables
+    '''
+    self.num_variables = next(iter(components.values())).num_variables
+    coo: Dict[str, Tuple[np.ndarray, np.ndarray, np.ndarray]] = {
+      name: component.to_coo() for name, component in components.items()
+    }
+
+    keys: Dict[str, np.ndarray] = {name: rows * self.num_variables + cols for name, (rows, cols, _) in coo.items()}
+    unique_keys: np.ndarray = np.unique(np.concatenate(list(keys.values())))
+
+    self.rows = unique_keys // self.num_variables
+    self.cols = unique_keys % self.num_variables
+    self.values = {}
+
+    for name, (_, _, values) in coo.items():
+      aligned_values: np.ndarray = np.zeros(len(unique_keys))
+      aligned_values[np.searchsorted(unique_keys, keys[name])] = values
+      self.values[name] = aligned_values
+
+  def to_arrays(self) -> Dict[str, np.ndarray]:
+    '''
+    returns the components as arrays (for example to store them in a file)
+    '''
+    return {
+      'num_variables': np.array(self.num_variables), 'rows': self.rows, 'cols': self.cols,
+      **{'values_' + name: values for name, values in self.values.items()}
+    }
+
+  @staticmethod
+  def from_arrays(arrays: Dict[str, np.ndarray]):
+    '''
+    restores components from their arrays
+
+    :arrays: arrays as returned by to_arrays
+    '''
+    components: QUBOComponents = QUBOComponents.__new__(QUBOComponents)
+    components.num_variables = int(arrays['num_variables'])
+    components.rows = arrays['rows']
+    components.cols = arrays['cols']
+    components.values = {name[len('values_'):]: values for name, values in arrays.items() if name.startswith('values_')}
+
+    return components
+
+  def combine(self, factors: Dict[str, float]) -> SparseQUBO:
+    '''
+    computes the weighted sum of the components
+    components are added in the order they were passed to the constructor
+
+    :factors: factor of every component by name
+    '''
+    values: np.ndarray = np.zeros(len(self.rows))
+    for name, component_values in self.values.items():
+      values = values + factors[name] * component_values
+
+    return SparseQUBO.from_coo(self.num_variables, self.rows, self.cols, values)
@@ -0,0 +1,71 @@
+#!/bin/python
+# version 3.8 required
+
+import numpy as np # type: ignore
+from numpy.testing import assert_allclose # type: ignore
+import unittest
+
+from Annealing_QUBO.implicit_qubo import ImplicitUCPQUBO
+from Annealing_QUBO.qubo import UCP_QUBO
+from Annealing_QUBO.qubo_operators import ExplicitQUBOOperator, QUBOState
+from Annealing_QUBO.simulated_annealing import SamplerResponse, SimulatedAnnealingSampler
+from UCP.unit_commitment_problem import CombustionPlant, ExperimentParameters, UCP
+
+class TestImplicitQUBO(unittest.TestCase):
+  '''
+  tests the implicit QUBO against the explicit QUBO of UCP_QUBO
+  '''
+
+  ucp_instance: UCP = UCP(
+    ExperimentParameters(3, 3),
+    [20, 45, 30],
+    [
+      CombustionPlant(1, 0.5, 1, 10, 30, 1, 2),
+      CombustionPlant(2, 1, 2, 10, 30, 2, 1, True),
+      CombustionPlant(3, 2, 3, 20, 80, 3, 4)
+    ]
+  )
+
+  factors = {'y_c': 2, 'y_s': 3, 'y_d': 5, 'y_p': 7}
+
+  def random_samples(self, num_variables: int) -> np.ndarray:
+    return np.random.default_rng(0).integers(0, 2, size=(num_variables, 30)).astype(float)
+
+  def test_energies(self):
+    implicit: ImplicitUCPQUBO = ImplicitUCPQUBO(self.ucp_instance, **self.factors)
+    explicit: ExplicitQUBOOperator = ExplicitQUBOOperator(UCP_QUBO(self.ucp_instance, **self.factors).biases)
+
+    x: np.ndarray = self.random_samples(implicit.num_variables)
+    assert_allclose(implicit.compute_energies(x), explicit.compute_energies(x))
+
+  def test_deltas(self):
+    implicit: ImplicitUCPQUBO = ImplicitUCPQUBO(self.ucp_instance, **self.factors)
+    explicit: ExplicitQUBOOperator = ExplicitQUBOOperator(UCP_QUBO(self.ucp_instance, **self.factors).biases)
+
+    x: np.ndarray = self.random_samples(implicit.num_variables)
+    implicit_state: QUBOState = implicit.create_state(x.copy())
+    explicit_state: QUBOState = explicit.create_state(x.copy())
+    rng: np.random.Generator = np.random.default_rng(1)
+
+    for v in rng.integers(0, implicit.num_variables, size=200):
+      assert_allclose(implicit_state.get_deltas(v), explicit_state.get_deltas(v))
+
+      accept: np.ndarray = rng.random(x.shape[1]) < 0.5
+      implicit_state.flip(v, accept)
+      explicit_state.flip(v, accept)
+
+    assert_allclose(implicit_state.x, explicit_state.x)
+    assert_allclose(implicit.compute_energies(implicit_state.x), explicit.compute_energies(explicit_state.x))
+
+  def test_sample(self):
+    implicit: ImplicitUCPQUBO = ImplicitUCPQUBO(self.ucp_instance)
+    sampler: SimulatedAnnealingSampler = SimulatedAnnealingSampler(num_reads=10, num_sweeps=50, beta_range=(1e-3, 1), seed=0)
+
+    implicit_response: SamplerResponse = sampler.sample_qubo(implicit)
+    explicit_response: SamplerResponse = sampler.sample_qubo(UCP_QUBO(self.ucp_instance).biases)
+
+    self.assertEqual(implicit_response.solutions, explicit_response.solutions)
+    assert_allclose(implicit_response.energies, explicit_response.energies)
+
+if __name__ == '__main__':
+  unittest.main()
@@ -232,3 +232,29 @@ class TestQUBOBiases(unittest.TestCase):
           for t1 in range(2):
             if i0 != i1 and t0 != t1:
               self.no_quadratic_biases(qubo, i0, t0, i1, t1)
+
+  def test_reweight(self):
+    qubo: UCP_QUBO = UCP_QUBO(self.ucp_instance_1)
+
+    for factors in [(2, 1, 1, 1), (1, 2, 1, 1), (1, 1, 2, 1), (1, 1, 1, 2), (0.5, 3, 0.25, 10)]:
+      qubo.reweight(*factors)
+      self.assertEqual(qubo.model, UCP_QUBO(self.ucp_instance_1, *factors).model)
+
+  def test_reweight_2(self):
+    qubo: UCP_QUBO = UCP_QUBO(self.ucp_instance_2)
+    qubo.reweight(y_c=2)
+    self.linear_biases(qubo, 0, 0, [0, -170, -150, 70])
+
+    qubo.reweight(y_c=1, y_d=2)
+    self.linear_biases(qubo, 1, 1, [0, -790, -1180, -1170])
+
+    qubo.reweight(y_d=1, y_s=2)
+    self.linear_biases(qubo, 1, 0, [40, -190, -180, 30])
+    self.quadratic_biases(qubo, 0, 0, 0, 1, [[ 0, 20, 20, 20],
+                                             [40,  0,  0,  0],
+                                             [40,  0,  0,  0],
+                                             [40,  0,  0,  0]])
+
+    # factors that are not specified keep their value
+    qubo.reweight(y_c=2, y_d=2)
+    self.linear_biases(qubo, 0, 0, [0, -360, -340, 80])
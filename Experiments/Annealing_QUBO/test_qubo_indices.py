@@ -0,0 +1,39 @@
+#!/bin/python
+# version 3.8 required
+
+import numpy as np # type: ignore
+from numpy.testing import assert_array_equal # type: ignore
+import unittest
+
+from Annealing_QUBO.qubo_indices import QUBOIndices
+
+class TestQUBOIndices(unittest.TestCase):
+  '''
+  tests the arithmetic mapping of plant, time and power level indices to variable indices
+  '''
+  indices: QUBOIndices = QUBOIndices([4, 2, 8], 3)
+
+  def test_scalar(self):
+    self.assertEqual(self.indices.num_variables, 42)
+
+    self.assertEqual(self.indices[0, 0, 0], 0)
+    self.assertEqual(self.indices[0, 2, 3], 11)
+    self.assertEqual(self.indices[1, 0, 1], 13)
+    self.assertEqual(self.indices[2, 1, 5], 31)
+
+    self.assertEqual(self.indices.from_index(31), (2, 1, 5))
+
+  def test_consecutive(self):
+    m: int = 0
+    for i in range(3):
+      for t in range(3):
+        for k in range(self.indices.num_levels[i]):
+          self.assertEqual(self.indices[i, t, k], m)
+          m += 1
+
+  def test_arrays(self):
+    m: np.ndarray = np.arange(self.indices.num_variables)
+    i, t, k = self.indices.from_index(m)
+
+    assert_array_equal(self.indices.to_index(i, t, k), m)
+    assert_array_equal(self.indices.get_plant_indices(1), [[12, 13], [14, 15], [16, 17]])
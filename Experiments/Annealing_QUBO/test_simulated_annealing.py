@@ -0,0 +1,100 @@
+#!/bin/python
+# version 3.8 required
+
+import itertools
+import numpy as np # type: ignore
+import unittest
+from unittest import mock
+
+from Annealing_QUBO.qubo import UCP_QUBO
+from Annealing_QUBO.qubo_operators import ExplicitQUBOOperator
+from Annealing_QUBO.simulated_annealing import SamplerResponse, SimulatedAnnealingSampler
+from Annealing_QUBO.sparse_qubo import SparseQUBO
+from UCP.unit_commitment_problem import CombustionPlant, ExperimentParameters, UCP, UCPSolution
+
+class TestSimulatedAnnealing(unittest.TestCase):
+  '''
+  tests the local simulated annealing sampler
+  '''
+
+  def build_qubo(self) -> SparseQUBO:
+    rng: np.random.Generator = np.random.default_rng(0)
+    rows, cols = np.triu_indices(8)
+
+    return SparseQUBO.from_coo(8, rows, cols, rng.integers(-5, 6, size=len(rows)).astype(np.float64))
+
+  def brute_force(self, qubo: SparseQUBO) -> float:
+    matrix: np.ndarray = qubo.to_csr().toarray()
+    return min(
+      float(x @ matrix @ x) for x in (np.array(x) for x in itertools.product([0, 1], repeat=qubo.num_variables))
+    )
+
+  def test_ground_state(self):
+    qubo: SparseQUBO = self.build_qubo()
+    response: SamplerResponse = SimulatedAnnealingSampler(num_reads=20, num_sweeps=200, seed=1).sample_qubo(qubo)
+
+    self.assertEqual(response.energies[0], self.brute_force(qubo))
+    self.assertEqual(response.energies, sorted(response.energies))
+    self.assertGreater(response.timing, 0)
+
+    matrix: np.ndarray = qubo.to_csr().toarray()
+    for solution, energy in zip(response.solutions, response.energies):
+      x: np.ndarray = np.array(solution)
+      self.assertEqual(float(x @ matrix @ x), energy)
+
+  def test_seed(self):
+    qubo: SparseQUBO = self.build_qubo()
+
+    response_0: SamplerResponse = SimulatedAnnealingSampler(num_reads=5, num_sweeps=10, seed=2).sample_qubo(qubo)
+    response_1: SamplerResponse = SimulatedAnnealingSampler(num_reads=5, num_sweeps=10, seed=2).sample_qubo(qubo.to_dict())
+
+    self.assertEqual(response_0.solutions, response_1.solutions)
+    self.assertEqual(response_0.energies, response_1.energies)
+
+  def test_linear_schedule(self):
+    sampler: SimulatedAnnealingSampler = SimulatedAnnealingSampler(num_sweeps=3, beta_range=(1, 3), beta_schedule_type='linear')
+    operator: ExplicitQUBOOperator = ExplicitQUBOOperator(self.build_qubo())
+
+    self.assertEqual(sampler.get_beta_schedule(operator).tolist(), [1, 2, 3])
+    self.assertRaises(ValueError, SimulatedAnnealingSampler, beta_schedule_type='exponential')
+
+  def test_optimize(self):
+    ucp: UCP = UCP(
+      ExperimentParameters(2, 2),
+      [3, 1],
+      [
+        CombustionPlant(0, 1, 0, 1, 2, 0, 0),
+        CombustionPlant(0, 2, 0, 1, 2, 0, 0)
+      ]
+    )
+
+    qubo: UCP_QUBO = UCP_QUBO(ucp, y_d=100, y_p=100)
+    solution: UCPSolution = qubo.optimize(None, SimulatedAnnealingSampler(num_reads=10, num_sweeps=100, seed=0), adjust=False)
+
+    self.assertEqual(qubo.answer.energies[0], self.brute_force(qubo.biases))
+    self.assertEqual(len(solution.p), 2)
+    self.assertEqual(len(solution.p[0]), 2)
+    self.assertGreaterEqual(solution.time, 0)
+    self.assertTrue({'build', 'solve', 'decode', 'adjust'} <= set(solution.timings))
+
+  def test_validity_before_adjustment(self):
+    ucp: UCP = UCP(
+      ExperimentParameters(2, 2),
+      [3, 1],
+      [
+        CombustionPlant(0, 1, 0, 1, 2, 0, 0),
+        CombustionPlant(0, 2, 0, 1, 2, 0, 0)
+      ]
+    )
+    checked: list = []
+
+    qubo: UCP_QUBO = UCP_QUBO(ucp, y_d=0.1)
+    with mock.patch.object(UCPSolution, 'check_validity', autospec=True, side_effect=checked.append):
+      solution: UCPSolution = qubo.optimize(None, SimulatedAnnealingSampler(num_reads=10, num_sweeps=100, seed=0))
+
+    _, p = qubo.get_variables_from_results(np.array(qubo.answer.solutions))
+    self.assertEqual(len(checked), 1)
+    self.assertEqual(checked[0].p, p[solution.statistics['selected_sample']].tolist())
+
+if __name__ == '__main__':
+  unittest.main()
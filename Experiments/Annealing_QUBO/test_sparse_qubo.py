@@ -0,0 +1,43 @@
+#!/bin/python
+# version 3.8 required
+
+import numpy as np # type: ignore
+from numpy.testing import assert_array_equal # type: ignore
+import unittest
+
+from Annealing_QUBO.sparse_qubo import SparseQUBO
+
+class TestSparseQUBO(unittest.TestCase):
+  '''
+  tests the conversion of QUBOs stored as coordinate arrays
+  '''
+
+  def build_qubo(self) -> SparseQUBO:
+    qubo: SparseQUBO = SparseQUBO(4)
+    qubo.add_linear_biases(np.array([0, 1, 2]), np.array([1., 2., 3.]))
+    qubo.add_quadratic_biases(np.array([[0], [1]]), np.array([[2, 3]]), 5)
+    qubo.add_linear_biases(np.array([2]), 4)
+
+    return qubo
+
+  def test_duplicates_summed(self):
+    rows, cols, values = self.build_qubo().to_coo()
+
+    assert_array_equal(rows, [0, 0, 0, 1, 1, 1, 2])
+    assert_array_equal(cols, [0, 2, 3, 1, 2, 3, 2])
+    assert_array_equal(values, [1, 5, 5, 2, 5, 5, 7])
+
+  def test_dict(self):
+    self.assertEqual(self.build_qubo().to_dict(), {
+      (0, 0): 1, (0, 2): 5, (0, 3): 5,
+      (1, 1): 2, (1, 2): 5, (1, 3): 5,
+      (2, 2): 7
+    })
+
+  def test_csr(self):
+    matrix: np.ndarray = self.build_qubo().to_csr().toarray()
+
+    assert_array_equal(matrix, [[1, 0, 5, 5],
+                                [0, 2, 5, 5],
+                                [0, 0, 7, 0],
+                                [0, 0, 0, 0]])
@@ -0,0 +1,237 @@
+#!/bin/python
+# version 3.8 required
+
+from multiprocessing.pool import Pool
+import time
+from typing import List, Optional, Tuple
+import numpy as np # type: ignore
+
+from UCP.ucp_arrays import PlantArrays, UCPArrays
+from UCP.unit_commitment_problem import UCP, UCPSolution
+from Util.logging import debug_msg, debug_msg_time
+from Util.timing import Timings
+
+
+def solve_plant_subproblems(A: np.ndarray, B: np.ndarray, C: np.ndarray, Pmin: np.ndarray, Pmax: np.ndarray,
+                            AU: np.ndarray, AD: np.ndarray, initially_on: np.ndarray,
+                            lambdas: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+  '''
+  solves the single plant problems of the relaxed UCP for several plants
+  every plant sells its power at the prices lambda and pays its costs and startup and shutdown costs
+  returns the commitment and power output with the shape (number of plants, number of loads)
+  and the minimal costs of every plant
+
+  :A: constant cost coefficients with the shape (number of plants,)
+  :B: linear cost coefficients
+  :C: quadratic cost coefficients
+  :Pmin: minimal power outputs
+  :Pmax: maximal power outputs
+  :AU: startup costs
+  :AD: shutdown costs
+  :initially_on: whether the plants are on before the first time
+  :lambdas: prices of the power at every time with the shape (number of loads,)
+  '''
+  A, B, C, Pmin, Pmax, AU, AD = (a[:, np.newaxis] for a in (A, B, C, Pmin, Pmax, AU, AD))
+  num_loads: int = len(lambdas)
+
+  # best power output and costs of every plant at every time if it is on
+  p: np.ndarray = np.where(C > 0, np.clip((lambdas - B) / np.where(C > 0, 2 * C, 1), Pmin, Pmax),
+                           np.where(lambdas > B, Pmax, Pmin))
+  on_costs: np.ndarray = A + B * p + C * p ** 2 - lambdas * p
+
+  # dynamic programming over the states off and on of every plant
+  off_value: np.ndarray = np.where(initially_on, AD[:, 0], 0.)
+  on_value: np.ndarray = np.where(initially_on, 0., AU[:, 0]) + on_costs[:, 0]
+  stays_off: np.ndarray = np.ones((len(A), num_loads), dtype=bool) # whether the best way to be off at t is off at t - 1
+  stays_on: np.ndarray = np.ones((len(A), num_loads), dtype=bool)
+
+  for t in range(1, num_loads):
+    stays_off[:, t] = off_value <= on_value + AD[:, 0]
+    stays_on[:, t] = on_value <= off_value + AU[:, 0]
+
+    off_value, on_value = (
+      np.where(stays_off[:, t], off_value, on_value + AD[:, 0]),
+      np.where(stays_on[:, t], on_value, off_value + AU[:, 0]) + on_costs[:, t]
+    )
+
+  u: np.ndarray = np.zeros((len(A), num_loads), dtype=bool)
+  if num_loads > 0:
+    u[:, -1] = on_value < off_value
+
+  for t in range(num_loads - 1, 0, -1):
+    u[:, t - 1] = np.where(u[:, t], stays_on[:, t], ~stays_off[:, t])
+
+  return u, np.where(u, p, 0.), np.minimum(off_value, on_value)
+
+def solve_plant_group(arguments: Tuple[np.ndarray, ...]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+  '''
+  solves the single plant problems of a group of plants in a worker process
+
+  :arguments: arguments of solve_plant_subproblems
+  '''
+  return solve_plant_subproblems(*arguments)
+
+
+class UCP_LagrangianRelaxation(object):
+  '''
+  solves UCPs by relaxing the load constraints with prices lambda (Lagrangian relaxation)
+  the relaxed problem decomposes into independent single plant problems that are solved by dynamic programming,
+  the prices are updated by subgradient steps and every commitment is repaired into a feasible solution
+  the objective function includes the startup and shutdown costs from the initial states like UCP_MINLP
+  '''
+  ucp: UCP
+  arrays: UCPArrays
+  order: np.ndarray # plant indices ordered by the average costs at full load
+  max_iterations: int
+  tolerance: float # relative gap at which the search stops
+  num_processes: int
+  lambdas: np.ndarray # prices of the power at every time
+  dual_bound: float # best lower bound of the objective function
+  history: List[Tuple[float, float]] # dual bound and objective function of the best solution after every iteration
+
+  def __init__(self, ucp: UCP, max_iterations: int = 200, tolerance: float = 1e-4, num_processes: int = 1) -> None:
+    '''
+    initializes the relaxation of an UCP
+
+    :ucp: UCP instance
+    :max_iterations: maximum number of subgradient steps
+    :tolerance: relative gap at which the search stops
+    :num_processes: number of processes the single plant problems are split over
+    '''
+    self.ucp = ucp
+    self.arrays = ucp.to_arrays()
+    self.max_iterations = max_iterations
+    self.tolerance = tolerance
+    self.num_processes = num_processes
+
+    average_costs: np.ndarray = self.arrays.plants.get_average_costs()
+    self.order = self.arrays.plants.get_priority_order()
+
+    self.lambdas = np.full(len(self.arrays.loads), float(np.mean(average_costs)) if len(average_costs) else 0.)
+    self.dual_bound = -np.inf
+    self.history = []
+
+  def get_plant_groups(self) -> List[Tuple[np.ndarray, ...]]:
+    '''
+    splits the parameters of the plants into one group per process
+    '''
+    plants: PlantArrays = self.arrays.plants
+    groups: List[np.ndarray] = np.array_split(np.arange(len(plants)), max(1, min(self.num_processes, len(plants))))
+
+    return [
+      tuple(getattr(plants, name)[group] for name in ('A', 'B', 'C', 'Pmin', 'Pmax', 'AU', 'AD', 'initially_on'))
+      for group in groups
+    ]
+
+  def solve_relaxation(self, groups: List[Tuple[np.ndarray, ...]], pool: Optional[Pool]) -> Tuple[np.ndarray, np.ndarray, float]:
+    '''
+    solves the relaxed problem for the current prices
+    returns the commitment, the power output and the value of the dual function
+
+    :groups: parameters of the groups of plants
+    :pool: worker processes (None if the problems are solved in this process)
+    '''
+    arguments: List[Tuple[np.ndarray, ...]] = [group + (self.lambdas,) for group in groups]
+    results: List[Tuple[np.ndarray, np.ndarray, np.ndarray]] = (
+      pool.map(solve_plant_group, arguments) if pool is not None else [solve_plant_group(a) for a in arguments]
+    )
+
+    u: np.ndarray = np.concatenate([result[0] for result in results])
+    p: np.ndarray = np.concatenate([result[1] for result in results])
+    value: float = float(np.sum(np.concatenate([result[2] for result in results])) + self.lambdas @ self.arrays.loads)
+
+    return u, p, value
+
+  def repair_commitment(self, u: np.ndarray) -> np.ndarray:
+    '''
+    commits the cheapest plants of the priority list while the capacity does not meet the load demand
+    and decommits the most expensive plants while the minimal power outputs exceed it
+
+    :u: commitment of units
+    '''
+    plants: PlantArrays = self.arrays.plants
+    loads: np.ndarray = self.arrays.loads
+    u = u.copy()
+
+    for i in self.order:
+      missing: np.ndarray = plants.Pmax @ u < loads
+      u[i] |= missing
+
+    for i in self.order[::-1]:
+      excess: np.ndarray = (plants.Pmin @ u > loads) & (plants.Pmax @ u - plants.Pmax[i] >= loads)
+      u[i] &= ~excess
+
+    return u
+
+  def optimize(self) -> UCPSolution:
+    '''
+    optimizes the UCP by subgradient steps on the prices
+    the statistics of the solution contain the dual bound and the relative gap
+    '''
+    start: float = time.perf_counter()
+    timings: Timings = Timings()
+    groups: List[Tuple[np.ndarray, ...]] = self.get_plant_groups()
+    pool: Optional[Pool] = Pool(len(groups)) if len(groups) > 1 else None
+
+    best_u: np.ndarray = np.zeros((len(self.arrays.plants), len(self.arrays.loads)), dtype=bool)
+    best_o: float = np.inf
+    step_factor: float = 2
+    stalled: int = 0
+    iteration: int = 0
+
+    debug_msg_time('Start Solver')
+    try:
+      for iteration in range(1, self.max_iterations + 1):
+        with timings.phase('solve'):
+          u, p, value = self.solve_relaxation(groups, pool)
+
+        if value > self.dual_bound + 1e-9 * abs(value):
+          self.dual_bound = value
+          stalled = 0
+
+        else:
+          stalled += 1
+
+        # the commitment of the relaxed problem is repaired into a primal solution
+        with timings.phase('repair'):
+          repaired: np.ndarray = self.repair_commitment(u)
+          o: float = float(self.arrays.calculate_dispatched_o(repaired, include_initial=True))
+        if o < best_o:
+          best_u, best_o = repaired, o
+
+        self.history.append((self.dual_bound, best_o))
+        if best_o - self.dual_bound <= self.tolerance * abs(best_o):
+          break
+
+        # halve the step size if the dual bound does not improve
+        if stalled >= 5:
+          step_factor /= 2
+          stalled = 0
+
+        subgradient: np.ndarray = self.arrays.loads - np.sum(p, axis=0)
+        norm: float = float(subgradient @ subgradient)
+        if norm == 0 or step_factor < 1e-6:
+          break
+
+        self.lambdas = self.lambdas + step_factor * (best_o - value) / norm * subgradient
+
+    finally:
+      if pool is not None:
+        pool.close()
+        pool.join()
+
+    debug_msg_time('Solver finished')
+
+    with timings.phase('decode'):
+      p_best: np.ndarray = self.arrays.dispatch(best_u)
+      o_best: float = float(self.arrays.calculate_o(best_u, p_best, include_initial=True))
+    gap: float = (o_best - self.dual_bound) / abs(o_best) if o_best != 0 else 0.
+    debug_msg('Dual bound: {:.2f}, gap: {:.4%}'.format(self.dual_bound, gap))
+
+    solution: UCPSolution = UCPSolution(
+      self.ucp, time.perf_counter() - start, gap <= self.tolerance, o_best, best_u.tolist(), p_best.tolist()
+    )
+    solution.timings = timings.to_dict()
+    solution.statistics = {'dual_bound': self.dual_bound, 'gap': gap, 'iterations': iteration}
+
+    return solution
@@ -1,27 +1,95 @@
 #!/bin/python
 # version 3.8 required
 
-from typing import List
+from dataclasses import asdict, replace
+import os
+import time
+from typing import Any, Dict, List, Optional, Tuple
+import numpy as np # type: ignore
 from pyomo.core.base.PyomoModel import ConcreteModel # type: ignore
-from pyomo.core.base.constraint import Constraint # type: ignore
+from pyomo.core.base.constraint import Constraint, ConstraintList # type: ignore
 from pyomo.core.base.expression import Expression # type: ignore
 from pyomo.core.base.objective import Objective # type: ignore
+from pyomo.core.base.param import Param # type: ignore
 from pyomo.core.base.var import Var # type: ignore
 from pyomo.core.base.plugin import TransformationFactory # type: ignore
 from pyomo.core.expr.logical_expr import inequality # type: ignore
+from pyomo.core.expr.visitor import identify_variables # type: ignore
 from pyomo.gdp import Disjunct, Disjunction # type: ignore
-from pyomo.environ import NonNegativeReals, Boolean # type: ignore
+from pyomo.environ import Binary, NonNegativeReals, Boolean # type: ignore
 from pyomo.opt import SolverFactory # type: ignore
 from pyomo.opt.results.solver import TerminationCondition # type: ignore
 
-from UCP.unit_commitment_problem import CombustionPlant, UCP, UCPSolution
+from UCP.model_statistics import ModelStatistics
+from UCP.ucp_arrays import UCPArrays
+from UCP.unit_commitment_problem import CombustionPlant, ExperimentParameters, UCP, UCPSolution
+from Util.timing import Timings
+
+
+# formulation used for the solvers, solvers that are not listed use the MINLP
+SOLVER_FORMULATIONS: Dict[str, str] = {
+  'couenne': 'minlp', 'bonmin': 'minlp', 'baron': 'minlp',
+  'cplex': 'miqp', 'gurobi': 'miqp', 'scip': 'miqp',
+  'cbc': 'milp', 'glpk': 'milp', 'highs': 'milp', 'appsi_highs': 'milp'
+}
+
+# names of the solver options that limit the run time (in seconds) and the relative gap
+SOLVER_LIMIT_OPTIONS: Dict[str, Tuple[str, str]] = {
+  'couenne': ('bonmin.time_limit', 'bonmin.allowable_fraction_gap'),
+  'bonmin': ('bonmin.time_limit', 'bonmin.allowable_fraction_gap'),
+  'cplex': ('timelimit', 'mipgap'), 'gurobi': ('TimeLimit', 'MIPGap'), 'scip': ('limits/time', 'limits/gap'),
+  'cbc': ('sec', 'ratio'), 'glpk': ('tmlim', 'mipgap'),
+  'highs': ('time_limit', 'mip_rel_gap'), 'appsi_highs': ('time_limit', 'mip_rel_gap')
+}
+
+# MILP solvers in the order they are preferred, the first one that is installed is used by default
+MILP_SOLVERS: Tuple[str, ...] = ('appsi_highs', 'highs', 'cbc', 'glpk')
+
+# environment variable holding the MILP solver that is used instead of the first installed one
+MILP_SOLVER_VARIABLE: str = 'UCP_MILP_SOLVER'
+
+
+def solver_available(solver_command: str) -> bool:
+  '''
+  checks whether a solver is known to Pyomo and installed
+
+  :solver_command: command calling the solver
+  '''
+  try:
+    return bool(SolverFactory(solver_command).available(exception_flag=False))
+  except Exception: # solvers that are unknown to the installed version of Pyomo
+    return False
+
+def get_milp_solver() -> Optional[str]:
+  '''
+  returns the MILP solver given by the environment variable UCP_MILP_SOLVER
+  or the first installed solver of MILP_SOLVERS (None if none is installed)
+  '''
+  solver_command: Optional[str] = os.environ.get(MILP_SOLVER_VARIABLE)
+  if solver_command:
+    return solver_command
+
+  return next((solver_command for solver_command in MILP_SOLVERS if solver_available(solver_command)), None)
 
 
 class UCP_MINLP(object):
   '''
   handles the formulation of MINLPs
+  besides the MINLP, the UCP can be formulated with p = 0 for units that are off and linear startup and shutdown constraints,
+  with a convex quadratic objective (MIQP) or a piecewise linear outer approximation of the costs (MILP)
+  the loads are mutable parameters, so the model can be solved again for other loads without rebuilding it
   '''
   model: ConcreteModel
+  formulation: str # minlp, miqp or milp
+  num_segments: int # number of tangents of the cost of every plant in the initial outer approximation
+  max_cut_rounds: int # maximum number of times the outer approximation is refined at the solution
+  tolerance: float # relative gap at which the refinement of the outer approximation stops
+  build_time: float # time spent building and transforming the model
+  timings: Timings # time of building the model
+  solver: Any # solver instance that is kept between solves (persistent solvers update the model incrementally)
+  solver_command: Optional[str]
+  solved: bool # whether the variables hold a solution that can be used as a warm start
+  initial_solution: Optional[UCPSolution] # solution the model was seeded with, it is set again if the model is rebuilt
 
   def instantiate_variables(self) -> None:
     '''
@@ -116,7 +184,7 @@ class UCP_MINLP(object):
       :model: MINLP
       :t: time index
       '''
-      return self.ucp.loads[t] == sum(model.u[(i, t)] * model.p[(i, t)] for i in model.I)
+      return model.L[t] == sum(model.u[(i, t)] * model.p[(i, t)] for i in model.I)
 
     self.model.l_constr = Constraint(self.model.T, rule=load_constraint_rule)
 
@@ -140,25 +208,277 @@ class UCP_MINLP(object):
 
     self.model.p_constr = Constraint(self.model.I, self.model.T, rule=power_constraint_rule)
 
-  def __init__(self, ucp: UCP) -> None:
+  def instantiate_linear_variables(self) -> None:
+    '''
+    instantiates the variables of the MIQP and MILP
+    p is 0 for units that are off and v and w are the startups and shutdowns
+    '''
+    self.model.u = Var(self.model.I, self.model.T, domain=Binary, initialize=0)
+    self.model.p = Var(self.model.I, self.model.T, domain=NonNegativeReals, initialize=0)
+    self.model.v = Var(self.model.I, self.model.T, bounds=(0, 1), initialize=0)
+    self.model.w = Var(self.model.I, self.model.T, bounds=(0, 1), initialize=0)
+
+  def build_linear_startup_shutdown_constraints(self) -> None:
+    '''
+    builds the constraints that detect startups and shutdowns of the MIQP and MILP
+    v and w are minimized by the objective, so they are 1 only if the state of the unit changes
+    '''
+    plants: List[CombustionPlant] = self.ucp.plants
+
+    def previous(model: ConcreteModel, i: int, t: int):
+      return model.u[i, t - 1] if t > 0 else (1 if plants[i].initially_on else 0)
+
+    self.model.startup_constr = Constraint(self.model.I, self.model.T,
+      rule=lambda model, i, t: model.v[i, t] >= model.u[i, t] - previous(model, i, t))
+    self.model.shutdown_constr = Constraint(self.model.I, self.model.T,
+      rule=lambda model, i, t: model.w[i, t] >= previous(model, i, t) - model.u[i, t])
+
+  def build_linear_power_constraints(self) -> None:
+    '''
+    builds the constraints Pmin u <= p <= Pmax u and the load constraints of the MIQP and MILP
+    '''
+    plants: List[CombustionPlant] = self.ucp.plants
+
+    self.model.p_min_constr = Constraint(self.model.I, self.model.T,
+      rule=lambda model, i, t: plants[i].Pmin * model.u[i, t] <= model.p[i, t])
+    self.model.p_max_constr = Constraint(self.model.I, self.model.T,
+      rule=lambda model, i, t: model.p[i, t] <= plants[i].Pmax * model.u[i, t])
+    self.model.l_constr = Constraint(self.model.T,
+      rule=lambda model, t: model.L[t] == sum(model.p[i, t] for i in model.I))
+
+  def build_quadratic_objective(self) -> None:
+    '''
+    builds the convex quadratic objective function of the MIQP
+    '''
+    plants: List[CombustionPlant] = self.ucp.plants
+
+    self.model.o = Objective(expr=sum(
+      plants[i].A * self.model.u[i, t] + plants[i].B * self.model.p[i, t] + plants[i].C * self.model.p[i, t] ** 2
+      + plants[i].AU * self.model.v[i, t] + plants[i].AD * self.model.w[i, t]
+      for i in self.model.I for t in self.model.T
+    ))
+
+  def add_tangent(self, i: int, t: int, p: float) -> None:
+    '''
+    adds a tangent of the quadratic cost C p^2 of unit i at time t to the outer approximation
+    the tangent is 0 if the unit is off
+
+    :i: plant index
+    :t: time index
+    :p: power output at which the tangent touches the cost
+    '''
+    C: float = self.ucp.plants[i].C
+    self.model.tangents.add(self.model.c[i, t] >= C * (2 * p * self.model.p[i, t] - p ** 2 * self.model.u[i, t]))
+
+  def build_outer_approximation_objective(self) -> None:
+    '''
+    builds the objective function of the MILP
+    the quadratic costs are replaced by variables c that are bounded from below by tangents
+    '''
+    plants: List[CombustionPlant] = self.ucp.plants
+
+    self.model.c = Var(self.model.I, self.model.T, domain=NonNegativeReals, initialize=0)
+    self.model.tangents = ConstraintList()
+
+    for i in self.model.I:
+      if plants[i].C > 0:
+        for p in np.linspace(plants[i].Pmin, plants[i].Pmax, self.num_segments + 1):
+          for t in self.model.T:
+            self.add_tangent(i, t, float(p))
+
+    self.model.o = Objective(expr=sum(
+      plants[i].A * self.model.u[i, t] + plants[i].B * self.model.p[i, t] + self.model.c[i, t]
+      + plants[i].AU * self.model.v[i, t] + plants[i].AD * self.model.w[i, t]
+      for i in self.model.I for t in self.model.T
+    ))
+
+  def build(self, formulation: str) -> None:
+    '''
+    builds the model of the UCP
+
+    :formulation: minlp, miqp or milp
+    '''
+    if formulation not in ('minlp', 'miqp', 'milp'):
+      raise ValueError('unknown formulation {}'.format(formulation))
+
+    self.timings = Timings()
+
+    with self.timings.phase('build'):
+      self.formulation = formulation
+      self.model = ConcreteModel()
+      self.solver, self.solver_command = None, None
+      self.solved = False
+
+      self.model.I = range(len(self.ucp.plants))
+      self.model.T = range(len(self.ucp.loads))
+      self.model.L = Param(self.model.T, initialize=lambda model, t: self.ucp.loads[t], mutable=True)
+
+      if formulation == 'minlp':
+        self.instantiate_variables()
+        self.build_startup_shutdown_disjunctions()
+        self.build_objective()
+        self.build_load_constraints()
+        self.build_power_constraints()
+
+        TransformationFactory('gdp.bigm').apply_to(self.model)
+
+      else:
+        self.instantiate_linear_variables()
+        self.build_linear_startup_shutdown_constraints()
+        self.build_linear_power_constraints()
+
+        if formulation == 'miqp':
+          self.build_quadratic_objective()
+        else:
+          self.build_outer_approximation_objective()
+
+    self.build_time = self.timings.get_wall('build')
+
+  def __init__(self, ucp: UCP, formulation: str = 'minlp', num_segments: int = 4, max_cut_rounds: int = 10,
+               tolerance: float = 1e-4) -> None:
     '''
-    builds a MINLP from an UCP
+    builds a MINLP (or MIQP or MILP) from an UCP
 
     :ucp: UCP instance
+    :formulation: minlp, miqp or milp, the model is rebuilt by optimize if the solver needs another formulation
+    :num_segments: number of tangents of the cost of every plant in the initial outer approximation of the MILP
+    :max_cut_rounds: maximum number of times the outer approximation of the MILP is refined at the solution
+    :tolerance: relative gap at which the refinement of the outer approximation of the MILP stops
     '''
     self.ucp: UCP = ucp
-    self.model: ConcreteModel = ConcreteModel()
+    self.initial_solution = None
+    self.num_segments = num_segments
+    self.max_cut_rounds = max_cut_rounds
+    self.tolerance = tolerance
 
-    self.model.I = range(len(ucp.plants))
-    self.model.T = range(len(ucp.loads))
+    self.build(formulation)
 
-    self.instantiate_variables()
-    self.build_startup_shutdown_disjunctions()
-    self.build_objective()
-    self.build_load_constraints()
-    self.build_power_constraints()
+  def update_loads(self, loads: List[float], parameters: Optional[ExperimentParameters] = None) -> None:
+    '''
+    replaces the loads of the model without rebuilding it
+    the solution of the previous loads stays in the variables and is used as a warm start
+
+    :loads: new load demand, the number of loads can not change
+    :parameters: parameters of the new UCP (for example with another offset of the loads), default: unchanged
+    '''
+    if len(loads) != len(self.ucp.loads):
+      raise ValueError('expected {} loads, got {}'.format(len(self.ucp.loads), len(loads)))
+
+    self.ucp = replace(self.ucp, loads=list(loads), parameters=parameters or self.ucp.parameters)
+
+    for t in self.model.T:
+      self.model.L[t] = loads[t]
+
+  def set_warm_start(self, solution: UCPSolution) -> None:
+    '''
+    seeds the variables with a solution, for example of a heuristic, an annealer or the previous loads
+    the startup and shutdown costs (and the disjuncts of the MINLP) are set consistently with the commitment,
+    power outputs of units that are off are set to 0 (Pmin in the MINLP, where they are bounded regardless of u)
+    the values are the initial point of the next solve and are passed as incumbent to solvers that accept warm starts
+
+    :solution: solution of an UCP with the same numbers of plants and loads
+    '''
+    u: np.ndarray = np.asarray(solution.u, dtype=bool).reshape(-1, len(self.model.T))
+    if u.shape != (len(self.model.I), len(self.model.T)):
+      raise ValueError('expected a solution with {} plants and {} loads'.format(len(self.model.I), len(self.model.T)))
+
+    p: np.ndarray = np.asarray(solution.p, dtype=float).reshape(u.shape)
+    initially_on: np.ndarray = np.array([plant.initially_on for plant in self.ucp.plants], dtype=bool)
+    previous: np.ndarray = np.concatenate((initially_on[:, np.newaxis], u[:, :-1]), axis=1)
+    startups: np.ndarray = u & ~previous
+    shutdowns: np.ndarray = ~u & previous
+
+    for i in self.model.I:
+      plant: CombustionPlant = self.ucp.plants[i]
+      off_value: float = plant.Pmin if self.formulation == 'minlp' else 0.
+
+      for t in self.model.T:
+        self.model.u[i, t].set_value(int(u[i, t]))
+        self.model.p[i, t].set_value(float(p[i, t]) if u[i, t] else off_value)
+
+        if self.formulation == 'minlp':
+          self.model.startup_shutdown_cost[i, t].set_value(plant.AU * startups[i, t] + plant.AD * shutdowns[i, t])
 
-    TransformationFactory('gdp.bigm').apply_to(self.model)
+          cases: Dict[str, bool] = {
+            'shutdown_disjunct': bool(shutdowns[i, t]), 'on_disjunct': bool(u[i, t] & previous[i, t]),
+            'startup_disjunct': bool(startups[i, t]), 'off_disjunct': bool(~u[i, t] & ~previous[i, t])
+          }
+          for name, selected in cases.items():
+            disjunct: Disjunct = getattr(self.model, name)[i, t]
+            disjunct.indicator_var.set_value(int(selected))
+
+            # newer versions of Pyomo have a Boolean indicator variable and a separate binary variable
+            binary_indicator_var: Any = getattr(disjunct, 'binary_indicator_var', None)
+            if binary_indicator_var is not None:
+              binary_indicator_var.set_value(int(selected))
+
+        else:
+          self.model.v[i, t].set_value(int(startups[i, t]))
+          self.model.w[i, t].set_value(int(shutdowns[i, t]))
+
+          if self.formulation == 'milp':
+            self.model.c[i, t].set_value(plant.C * float(p[i, t]) ** 2 if u[i, t] else 0.)
+
+    self.initial_solution = solution
+    self.solved = True
+
+  def get_statistics(self) -> ModelStatistics:
+    '''
+    returns the size of the (transformed) model, the couplers are the non-zero coefficients of the active constraints
+    the memory of Pyomo models is not known
+    '''
+    variables: int = sum(1 for _ in self.model.component_data_objects(Var, descend_into=True))
+    constraints: int = 0
+    nonzeros: int = 0
+
+    for constraint in self.model.component_data_objects(Constraint, active=True, descend_into=True):
+      constraints += 1
+      nonzeros += sum(1 for _ in identify_variables(constraint.body, include_fixed=False))
+
+    return ModelStatistics.from_constraints(variables, constraints, nonzeros)
+
+  def get_solver(self, solver_command: str) -> Any:
+    '''
+    returns the solver for a command, the solver is reused as long as the command does not change
+
+    :solver_command: command calling the solver
+    '''
+    if self.solver is None or self.solver_command != solver_command:
+      self.solver, self.solver_command = SolverFactory(solver_command), solver_command
+
+    return self.solver
+
+  def solve(self, solver: Any, options: Dict[str, float]) -> Any:
+    '''
+    solves the model, the current values of the variables are passed as warm start if the solver supports it
+    returns the results or None if the solver did not find a solution (for example within the time limit)
+
+    :solver: solver instance
+    :options: solver options, for example the limits of the run time and the gap
+    '''
+    solver.options.update(options)
+
+    warm_start: bool = self.solved and getattr(solver, 'warm_start_capable', lambda: False)()
+    results = solver.solve(self.model, load_solutions=False, **({'warmstart': True} if warm_start else {}))
+
+    if len(results.solution) == 0:
+      return None
+
+    self.model.solutions.load_from(results)
+    self.solved = True
+
+    return results
+
+  @staticmethod
+  def get_bound(results) -> float:
+    '''
+    returns the lower bound of the objective function that was proven by the solver (-inf if unknown)
+
+    :results: model optimization results
+    '''
+    bound: Optional[float] = results.problem.lower_bound
+
+    return -np.inf if bound is None else float(bound)
 
   def to_ucp_solution(self, results) -> UCPSolution:
     '''
@@ -180,12 +500,123 @@ class UCP_MINLP(object):
 
     return UCPSolution(self.ucp, time, optimal, o, u, p)
 
-  def optimize(self, solver_command: str = 'couenne') -> UCPSolution:
+  def refine_outer_approximation(self) -> bool:
+    '''
+    adds tangents at the power outputs of the solution where the outer approximation underestimates the costs
+    returns whether a tangent was added
+    '''
+    added: bool = False
+
+    for i in self.model.I:
+      C: float = self.ucp.plants[i].C
+      for t in self.model.T:
+        p: float = self.model.p[i, t].value or 0
+
+        if C > 0 and self.model.u[i, t].value > 0.5 and C * p ** 2 - self.model.c[i, t].value > 1e-6 * max(1., C * p ** 2):
+          self.add_tangent(i, t, p)
+          added = True
+
+    return added
+
+  def to_linear_ucp_solution(self, optimal: bool, time: float) -> UCPSolution:
+    '''
+    generates a UCPSolution instance from the solution of the MIQP or MILP
+    the power outputs of the commitment are dispatched exactly,
+    the objective function includes the startup and shutdown costs from the initial states like the MINLP
+
+    :optimal: whether the solver found an optimal solution
+    :time: run time of the solver
+    '''
+    arrays: UCPArrays = self.ucp.to_arrays()
+    u: np.ndarray = np.array([[self.model.u[i, t].value > 0.5 for t in self.model.T] for i in self.model.I], dtype=bool)
+    p: np.ndarray = arrays.dispatch(u.reshape(len(self.model.I), len(self.model.T)))
+    o: float = float(arrays.calculate_o(u, p, include_initial=True))
+
+    return UCPSolution(self.ucp, time, optimal, o, u.tolist(), p.tolist())
+
+  def optimize(self, solver_command: str = 'couenne', time_limit: Optional[float] = None,
+               gap_limit: Optional[float] = None) -> UCPSolution:
     '''
-    optimizes the MINLP with a given command
+    optimizes the model with a given command
+    the model is rebuilt in the formulation of the solver (SOLVER_FORMULATIONS) if necessary,
+    the outer approximation of the MILP is refined until the costs of the solution are exact
+    the solver is kept, so that the model can be solved again after update_loads
+    the run stops at the limits and returns the best incumbent, its bound is stored in the statistics
+    and the incumbents and bounds after every solve are stored in the trace of the solution
 
     :solver_command: command calling the solver, default is couenne
+    :time_limit: maximum wall-clock time in seconds, default: no limit
+    :gap_limit: relative gap between the incumbent and the bound at which the run stops, default: the solver's gap
     '''
-    with SolverFactory(solver_command) as solver:
-      results = solver.solve(self.model)
-      return self.to_ucp_solution(results)
+    formulation: str = SOLVER_FORMULATIONS.get(solver_command, 'minlp')
+    if formulation != self.formulation:
+      self.build(formulation)
+
+      if self.initial_solution is not None:
+        self.set_warm_start(self.initial_solution)
+
+    solver: Any = self.get_solver(solver_command)
+    time_option, gap_option = SOLVER_LIMIT_OPTIONS.get(solver_command, (None, None))
+    warm_start: bool = self.solved
+
+    timings: Timings = Timings()
+    start: float = time.perf_counter()
+    best: Optional[UCPSolution] = None
+    solution: Optional[UCPSolution] = None
+    bound: float = -np.inf
+    gap: float = np.inf
+    trace: List[List[float]] = []
+    optimal: bool = False
+
+    for _ in range(self.max_cut_rounds + 1):
+      options: Dict[str, float] = {}
+      if time_limit is not None and time_option is not None:
+        remaining: float = time_limit - (time.perf_counter() - start)
+        options[time_option] = max(remaining, 0.) if solver_command != 'glpk' else max(int(np.ceil(remaining)), 1)
+      if gap_limit is not None and gap_option is not None:
+        options[gap_option] = gap_limit
+
+      with timings.phase('solve'):
+        results = self.solve(solver, options)
+      if results is None:
+        optimal = False
+        break
+
+      optimal = results.solver.termination_condition == TerminationCondition.optimal
+      with timings.phase('decode'):
+        solution = self.to_ucp_solution(results) if self.formulation == 'minlp' \
+                   else self.to_linear_ucp_solution(optimal, 0)
+
+      # later solutions of equal costs are preferred, their outer approximation is tighter
+      if best is None or solution.o <= best.o + 1e-9 * abs(best.o):
+        best = solution
+      bound = max(bound, self.get_bound(results))
+      gap = (best.o - bound) / abs(best.o) if best.o != 0 else (0. if bound >= 0 else np.inf)
+      trace.append([time.perf_counter() - start, best.o, bound])
+
+      # the costs of the MILP solution are exact if no tangent is missing
+      converged: bool = gap <= self.tolerance
+      with timings.phase('refine'):
+        refined: bool = self.formulation == 'milp' and optimal and not converged and self.refine_outer_approximation()
+      optimal = optimal and (converged or not refined)
+
+      if not refined or (gap_limit is not None and gap <= gap_limit) \
+         or (time_limit is not None and time.perf_counter() - start >= time_limit):
+        break
+
+    if best is None:
+      num_plants, num_loads = len(self.ucp.plants), len(self.ucp.loads)
+      best = UCPSolution(self.ucp, 0, False, np.inf, [[False] * num_loads for _ in range(num_plants)],
+                         [[0.] * num_loads for _ in range(num_plants)])
+
+    if self.formulation != 'minlp' or best.time is None:
+      best.time = time.perf_counter() - start
+    best.optimal = optimal and best is solution
+
+    # the time of building the model is not part of the time of the solution, it is spent once for all loads
+    best.statistics = {'build_time': self.build_time, 'warm_start': warm_start, 'bound': bound, 'gap': gap}
+    best.trace = trace
+    best.timings = {**self.timings.to_dict(), **timings.to_dict()}
+    best.metrics = {**best.metrics, 'model': asdict(self.get_statistics())}
+
+    return best
@@ -0,0 +1,31 @@
+#!/bin/python
+# version 3.8 required
+
+import os
+from sys import argv
+from Classical.lagrangian_relaxation import UCP_LagrangianRelaxation
+from UCP.experiments import experiments_main
+from UCP.unit_commitment_problem import UCP, UCPSolution
+
+'''
+this file is the experiment runner for the classical optimizations using the Lagrangian relaxation
+'''
+
+def optimize_lagrangian_relaxation(ucp: UCP) -> UCPSolution:
+  '''
+  performs the optimization with the Lagrangian relaxation for an UCP
+
+  :ucp: UCP instance
+  '''
+  relaxation: UCP_LagrangianRelaxation = UCP_LagrangianRelaxation(ucp)
+  return relaxation.optimize()
+
+
+if __name__ == "__main__":
+  '''
+  calls the experiment runner with
+  - the optimization function,
+  - the path and prefix for the result files, and
+  - the command-line arguments
+  '''
+  experiments_main(optimize_lagrangian_relaxation, os.path.join('Classical', 'Solutions_Lagrangian'), 'lagrangian', *argv[1:])
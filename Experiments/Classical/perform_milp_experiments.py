@@ -0,0 +1,38 @@
+#!/bin/python
+# version 3.8 required
+
+import os
+from sys import argv
+from typing import Optional
+from Classical.minlp import MILP_SOLVER_VARIABLE, MILP_SOLVERS, UCP_MINLP, get_milp_solver
+from UCP.experiments import experiments_main
+from UCP.unit_commitment_problem import UCP, UCPSolution
+
+'''
+this file is the experiment runner for the classical optimizations using the MILP formulation
+the solver is given by the environment variable UCP_MILP_SOLVER, by default the first installed one of HiGHS, CBC and GLPK is used
+'''
+
+def optimize_milp(ucp: UCP) -> UCPSolution:
+  '''
+  performs the classical optimization with the MILP formulation for an UCP
+
+  :ucp: UCP instance
+  '''
+  solver_command: Optional[str] = get_milp_solver()
+  if solver_command is None:
+    raise RuntimeError('None of the MILP solvers {} is installed, set {} to use another one'
+                       .format(', '.join(MILP_SOLVERS), MILP_SOLVER_VARIABLE))
+
+  minlp: UCP_MINLP = UCP_MINLP(ucp, 'milp')
+  return minlp.optimize(solver_command)
+
+
+if __name__ == "__main__":
+  '''
+  calls the experiment runner with
+  - the optimization function,
+  - the path and prefix for the result files, and
+  - the command-line arguments
+  '''
+  experiments_main(optimize_milp, os.path.join('Classical', 'Solutions_MILP'), 'milp', *argv[1:])
@@ -0,0 +1,31 @@
+#!/bin/python
+# version 3.8 required
+
+import os
+from sys import argv
+from Classical.priority_list import UCP_PriorityList
+from UCP.experiments import experiments_main
+from UCP.unit_commitment_problem import UCP, UCPSolution
+
+'''
+this file is the experiment runner for the classical optimizations using the priority list and dynamic programming
+'''
+
+def optimize_priority_list(ucp: UCP) -> UCPSolution:
+  '''
+  performs the optimization with the priority list and dynamic programming for an UCP
+
+  :ucp: UCP instance
+  '''
+  priority_list: UCP_PriorityList = UCP_PriorityList(ucp)
+  return priority_list.optimize()
+
+
+if __name__ == "__main__":
+  '''
+  calls the experiment runner with
+  - the optimization function,
+  - the path and prefix for the result files, and
+  - the command-line arguments
+  '''
+  experiments_main(optimize_priority_list, os.path.join('Classical', 'Solutions_PriorityList'), 'priority_list', *argv[1:])
@@ -0,0 +1,144 @@
+#!/bin/python
+# version 3.8 required
+
+import time
+from typing import Tuple
+import numpy as np # type: ignore
+
+from UCP.dispatch_cache import DispatchCostCache
+from UCP.ucp_arrays import PlantArrays, UCPArrays
+from UCP.unit_commitment_problem import UCP, UCPSolution
+from Util.logging import debug_msg_time
+from Util.timing import Timings
+
+
+class UCP_PriorityList(object):
+  '''
+  solves UCPs by dynamic programming over the commitment states of all times
+  the states are either all subsets of plants (exact) or the prefixes of a priority list
+  ordered by the average costs at full load (heuristic for many plants)
+  the power outputs of every state are dispatched cost-optimally,
+  the objective function includes the startup and shutdown costs from the initial states like UCP_MINLP
+  '''
+  ucp: UCP
+  arrays: UCPArrays
+  cache: DispatchCostCache
+  order: np.ndarray # plant indices ordered by the average costs at full load
+  states: np.ndarray # commitment states with the shape (number of states, number of plants)
+  penalty: float # costs per unit of power that violates the load demand of a state
+
+  def __init__(self, ucp: UCP, max_exhaustive_plants: int = 8, penalty: float = 10 ** 6) -> None:
+    '''
+    chooses the commitment states of an UCP
+
+    :ucp: UCP instance
+    :max_exhaustive_plants: maximum number of plants for which all subsets of plants are used as states
+    :penalty: costs per unit of power that violates the load demand of a state
+    '''
+    self.ucp = ucp
+    self.arrays = ucp.to_arrays()
+    self.cache = self.arrays.enable_dispatch_cache()
+    self.order = self.arrays.plants.get_priority_order()
+    self.penalty = penalty
+
+    num_plants: int = len(self.arrays.plants)
+    if num_plants <= max_exhaustive_plants:
+      self.states = ((np.arange(2 ** num_plants)[:, np.newaxis] >> np.arange(num_plants)) & 1).astype(bool)
+
+    else:
+      # the first k plants of the priority list are committed in state k
+      ranks: np.ndarray = np.empty(num_plants, dtype=np.int64)
+      ranks[self.order] = np.arange(num_plants)
+      self.states = ranks[np.newaxis, :] < np.arange(num_plants + 1)[:, np.newaxis]
+
+  @property
+  def exhaustive(self) -> bool:
+    '''
+    whether all subsets of plants are commitment states
+    '''
+    return len(self.states) == 2 ** len(self.arrays.plants)
+
+  def get_state_costs(self) -> Tuple[np.ndarray, np.ndarray]:
+    '''
+    returns the dispatch costs (including penalties) and the violations of the load demand
+    of every state at every time with the shape (number of states, number of loads)
+    '''
+    plants: PlantArrays = self.arrays.plants
+    loads: np.ndarray = self.arrays.loads
+
+    u: np.ndarray = np.broadcast_to(self.states[:, :, np.newaxis], self.states.shape + (len(loads),))
+    costs: np.ndarray = self.cache.get_costs(loads, u)
+
+    violations: np.ndarray = (
+      np.maximum(self.states @ plants.Pmin[:, np.newaxis] - loads, 0)
+      + np.maximum(loads - self.states @ plants.Pmax[:, np.newaxis], 0)
+    )
+
+    return costs + self.penalty * violations, violations
+
+  def get_transition_costs(self) -> Tuple[np.ndarray, np.ndarray]:
+    '''
+    returns the startup and shutdown costs between all states with the shape (number of states, number of states)
+    and from the initial states of the plants to all states with the shape (number of states,)
+    '''
+    plants: PlantArrays = self.arrays.plants
+    committed: np.ndarray = self.states.astype(float)
+
+    transitions: np.ndarray = (1 - committed) @ (committed * plants.AU).T + (committed * plants.AD) @ (1 - committed).T
+
+    initial: np.ndarray = plants.initially_on.astype(float)
+    initial_transitions: np.ndarray = committed @ ((1 - initial) * plants.AU) + (1 - committed) @ (initial * plants.AD)
+
+    return transitions, initial_transitions
+
+  def solve(self) -> Tuple[np.ndarray, float]:
+    '''
+    searches the cheapest sequence of states by dynamic programming
+    returns the state index at every time and the total violation of the load demand
+    '''
+    state_costs, violations = self.get_state_costs()
+    transitions, initial_transitions = self.get_transition_costs()
+    num_loads: int = len(self.arrays.loads)
+
+    costs: np.ndarray = initial_transitions + state_costs[:, 0]
+    predecessors: np.ndarray = np.zeros((num_loads, len(self.states)), dtype=np.int64)
+
+    for t in range(1, num_loads):
+      candidates: np.ndarray = costs[:, np.newaxis] + transitions
+      predecessors[t] = np.argmin(candidates, axis=0)
+      costs = candidates[predecessors[t], np.arange(len(self.states))] + state_costs[:, t]
+
+    path: np.ndarray = np.zeros(num_loads, dtype=np.int64)
+    if num_loads > 0:
+      path[-1] = np.argmin(costs)
+
+    for t in range(num_loads - 1, 0, -1):
+      path[t - 1] = predecessors[t, path[t]]
+
+    return path, float(np.sum(violations[path, np.arange(num_loads)]))
+
+  def optimize(self) -> UCPSolution:
+    '''
+    optimizes the UCP
+    the solution is optimal if all subsets of plants are states and the load demand can be met
+    '''
+    start: float = time.perf_counter()
+    timings: Timings = Timings()
+
+    debug_msg_time('Start Solver')
+    with timings.phase('solve'):
+      path, violation = self.solve()
+    debug_msg_time('Solver finished')
+
+    with timings.phase('decode'):
+      u: np.ndarray = self.states[path].T
+      p: np.ndarray = self.arrays.dispatch(u)
+      o: float = float(self.arrays.calculate_o(u, p, include_initial=True))
+
+    solution: UCPSolution = UCPSolution(
+      self.ucp, time.perf_counter() - start, self.exhaustive and violation == 0, o, u.tolist(), p.tolist()
+    )
+    solution.timings = timings.to_dict()
+    solution.statistics = {'num_states': len(self.states), 'violation': violation, 'dispatch_cache': self.cache.get_statistics()}
+
+    return solution
@@ -0,0 +1,61 @@
+#!/bin/python
+# version 3.8 required
+
+import itertools
+import numpy as np # type: ignore
+import unittest
+
+from Classical.lagrangian_relaxation import UCP_LagrangianRelaxation, solve_plant_subproblems
+from Classical.priority_list import UCP_PriorityList
+from Data.build_ucp import build_random_ucp
+from UCP.unit_commitment_problem import ExperimentParameters, UCP, UCPSolution
+
+
+class TestLagrangianRelaxation(unittest.TestCase):
+  '''
+  tests the single plant problems, the dual bound and the primal solutions of the Lagrangian relaxation
+  '''
+
+  def test_plant_subproblems(self):
+    rng: np.random.Generator = np.random.default_rng(0)
+    ucp: UCP = build_random_ucp(rng, 6, 5)
+    plants = ucp.to_arrays().plants
+    lambdas: np.ndarray = rng.uniform(0, 8, size=5)
+
+    u, p, values = solve_plant_subproblems(
+      plants.A, plants.B, plants.C, plants.Pmin, plants.Pmax, plants.AU, plants.AD, plants.initially_on, lambdas
+    )
+
+    # all commitments of a single plant
+    for i in range(6):
+      single: UCP = UCP(ExperimentParameters(5, 1), ucp.loads, [ucp.plants[i]])
+      commitments: np.ndarray = np.array(list(itertools.product([False, True], repeat=5)))[:, np.newaxis, :]
+      outputs: np.ndarray = np.where(commitments, p[i], 0)
+
+      o: np.ndarray = single.to_arrays().calculate_o(commitments, outputs, include_initial=True) - np.sum(lambdas * outputs, axis=(-2, -1))
+      self.assertAlmostEqual(values[i], float(np.min(o)))
+      self.assertAlmostEqual(values[i], float(o[int(np.sum(u[i] * 2 ** np.arange(5)[::-1]))]))
+
+  def test_bounds(self):
+    rng: np.random.Generator = np.random.default_rng(1)
+
+    for _ in range(5):
+      ucp: UCP = build_random_ucp(rng, 4, 6)
+      optimal: float = UCP_PriorityList(ucp).optimize().o
+      solution: UCPSolution = UCP_LagrangianRelaxation(ucp).optimize()
+
+      self.assertLessEqual(solution.statistics['dual_bound'], optimal + 1e-6)
+      self.assertGreaterEqual(solution.o, optimal - 1e-6)
+      self.assertAlmostEqual(ucp.to_arrays().get_violations(np.array(solution.p)), 0)
+
+  def test_processes(self):
+    ucp: UCP = build_random_ucp(np.random.default_rng(2), 10, 12)
+
+    single: UCPSolution = UCP_LagrangianRelaxation(ucp, max_iterations=20).optimize()
+    parallel: UCPSolution = UCP_LagrangianRelaxation(ucp, max_iterations=20, num_processes=2).optimize()
+
+    self.assertEqual(single.u, parallel.u)
+    self.assertAlmostEqual(single.statistics['dual_bound'], parallel.statistics['dual_bound'])
+
+if __name__ == '__main__':
+  unittest.main()
@@ -4,10 +4,22 @@
 from typing import List
 import unittest
 
-from Classical.minlp import UCP_MINLP
+from pyomo.environ import Constraint, value # type: ignore
+
+from Classical.minlp import UCP_MINLP, get_milp_solver, solver_available
 from UCP.unit_commitment_problem import CombustionPlant, ExperimentParameters, UCP, UCPSolution
 
 
+# MILP solver of the tests of the linear formulations (empty if no MILP solver is installed)
+MILP_SOLVER: str = get_milp_solver() or ''
+
+# two plants of the tests of the warm start and the linear formulations, the second one is initially on
+TWO_PLANTS: List[CombustionPlant] = [
+  CombustionPlant(5, 1, 0.1, 5, 30, 10, 5),
+  CombustionPlant(10, 2, 0, 10, 40, 20, 10, True)
+]
+
+
 class TestUCP(unittest.TestCase):
   '''
   tests the classical algorithm (couenne) on different UCP instances
@@ -50,7 +62,7 @@ class TestUCP(unittest.TestCase):
                   u: List[List[bool]] = None, p: List[List[float]] = None, o: float = None) -> None:
 
     ucp: UCP = UCP(parameters, load, plants)
-    solution: UCPSolution = TestUCP.optimize(ucp)
+    solution: UCPSolution = self.optimize(ucp)
     self.assert_solution(solution, u, p, o)
 
   def single_plant(self, parameters: ExperimentParameters, load: List[float], plant: CombustionPlant, \
@@ -174,4 +186,102 @@ class TestUCP(unittest.TestCase):
       u=[[False, False], [True, False]],
       p=[[0, 0], [1, 0]],
       o=5
-    )
\ No newline at end of file
+    )
+
+
+class TestWarmStart(unittest.TestCase):
+  '''
+  tests seeding the formulations with a solution
+  '''
+
+  def setUp(self) -> None:
+    self.ucp: UCP = UCP(ExperimentParameters(3, 2), [20, 50, 10], TWO_PLANTS)
+    self.solution: UCPSolution = UCPSolution(self.ucp, 0, True, 255, [[True, True, True], [False, True, False]],
+                                             [[20, 10, 10], [0, 40, 0]])
+
+  def test_consistent(self):
+    for formulation in ('minlp', 'miqp', 'milp'):
+      minlp: UCP_MINLP = UCP_MINLP(self.ucp, formulation)
+      minlp.set_warm_start(self.solution)
+
+      self.assertAlmostEqual(minlp.model.o(), self.solution.o)
+      for constraint in minlp.model.component_data_objects(Constraint, active=True):
+        body: float = value(constraint.body)
+
+        if constraint.lower is not None:
+          self.assertGreaterEqual(body, value(constraint.lower) - 1e-6, constraint.name)
+        if constraint.upper is not None:
+          self.assertLessEqual(body, value(constraint.upper) + 1e-6, constraint.name)
+
+  def test_wrong_shape(self):
+    minlp: UCP_MINLP = UCP_MINLP(self.ucp, 'milp')
+
+    with self.assertRaises(ValueError):
+      minlp.set_warm_start(UCPSolution(self.ucp, 0, True, 0, [[True, False]], [[20, 0]]))
+
+
+@unittest.skipUnless(solver_available(MILP_SOLVER), 'No MILP solver is available')
+class TestUCPMILP(TestUCP):
+  '''
+  tests the MILP formulation (outer approximation) on different UCP instances with the first installed MILP solver
+  '''
+
+  @staticmethod
+  def optimize(ucp: UCP) -> UCPSolution:
+    minlp: UCP_MINLP = UCP_MINLP(ucp, 'milp')
+    return minlp.optimize(MILP_SOLVER)
+
+  def test_update_loads(self):
+    ucp: UCP = UCP(ExperimentParameters(3, 2), [20, 50, 10], TWO_PLANTS)
+    minlp: UCP_MINLP = UCP_MINLP(ucp, 'milp')
+    minlp.optimize(MILP_SOLVER)
+
+    for loads in ([30, 40, 60], [5, 10, 70]):
+      minlp.update_loads(loads)
+      solution: UCPSolution = minlp.optimize(MILP_SOLVER)
+      expected: UCPSolution = self.optimize(UCP(ExperimentParameters(3, 2), loads, TWO_PLANTS))
+
+      self.assertEqual(solution.ucp.loads, loads)
+      self.assertTrue(solution.statistics['warm_start'])
+      self.assert_solution(solution, expected.u, expected.p, expected.o)
+
+  def test_update_loads_length(self):
+    minlp: UCP_MINLP = UCP_MINLP(UCP(ExperimentParameters(2, 0), [0, 0]), 'milp')
+
+    with self.assertRaises(ValueError):
+      minlp.update_loads([0, 0, 0])
+
+  def test_warm_start(self):
+    ucp: UCP = UCP(ExperimentParameters(3, 2), [20, 50, 10], TWO_PLANTS)
+    expected: UCPSolution = self.optimize(ucp)
+
+    minlp: UCP_MINLP = UCP_MINLP(ucp, 'milp')
+    minlp.set_warm_start(UCPSolution(ucp, 0, True, 260, [[True, True, True], [False, True, False]], [[20, 30, 10], [0, 20, 0]]))
+    solution: UCPSolution = minlp.optimize(MILP_SOLVER)
+
+    self.assertTrue(solution.statistics['warm_start'])
+    self.assert_solution(solution, expected.u, expected.p, expected.o)
+
+  def test_trace(self):
+    plants: List[CombustionPlant] = TWO_PLANTS + [CombustionPlant(0, 3, 0.01, 0, 50, 5, 5)]
+    ucp: UCP = UCP(ExperimentParameters(4, 3), [20, 50, 90, 10], plants)
+    solution: UCPSolution = UCP_MINLP(ucp, 'milp').optimize(MILP_SOLVER, time_limit=60, gap_limit=0.01)
+
+    self.assertGreater(len(solution.trace), 0)
+    for previous, entry in zip(solution.trace, solution.trace[1:]):
+      self.assertLessEqual(previous[0], entry[0])
+      self.assertGreaterEqual(previous[1], entry[1])
+      self.assertLessEqual(previous[2], entry[2])
+
+    self.assertEqual(solution.trace[-1][1], solution.o)
+    self.assertTrue({'build', 'solve', 'decode'} <= set(solution.timings))
+    self.assertLessEqual(solution.statistics['bound'], solution.o)
+    self.assertLessEqual(solution.statistics['gap'], 0.01)
+
+  def test_no_solution(self):
+    ucp: UCP = UCP(ExperimentParameters(1, 1), [100], [CombustionPlant(0, 1, 0, 0, 50, 0, 0)])
+    solution: UCPSolution = UCP_MINLP(ucp, 'milp').optimize(MILP_SOLVER, time_limit=60)
+
+    self.assertFalse(solution.optimal)
+    self.assertEqual(solution.o, float('inf'))
+    self.assertEqual(solution.trace, [])
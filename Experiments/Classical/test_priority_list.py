@@ -0,0 +1,78 @@
+#!/bin/python
+# version 3.8 required
+
+import itertools
+from typing import List
+import numpy as np # type: ignore
+import unittest
+
+from Classical.priority_list import UCP_PriorityList
+from Data.build_ucp import build_random_ucp
+from UCP.ucp_arrays import UCPArrays
+from UCP.unit_commitment_problem import CombustionPlant, ExperimentParameters, UCP, UCPSolution
+
+
+class TestPriorityList(unittest.TestCase):
+  '''
+  tests the dynamic programming solver on the instances of the MINLP tests and against brute force
+  '''
+
+  def assert_solution(self, ucp: UCP, u: List[List[bool]], p: List[List[float]], o: float) -> None:
+    solution: UCPSolution = UCP_PriorityList(ucp).optimize()
+
+    self.assertTrue(solution.optimal)
+    self.assertEqual(solution.u, u)
+    np.testing.assert_allclose(solution.p, p, atol=1e-5)
+    self.assertAlmostEqual(solution.o, o, delta=0.00001)
+
+  def test_minlp_instances(self):
+    self.assert_solution(UCP(ExperimentParameters(5, 1), [0, 0, 0, 0, 0], [CombustionPlant(1, 1, 1, 0, 1000, 0, 0)]),
+                         [[False] * 5], [[0] * 5], 0)
+    self.assert_solution(UCP(ExperimentParameters(2, 1), [0, 10], [CombustionPlant(0, 1, 0, 10, 1000, 5, 0)]),
+                         [[False, True]], [[0, 10]], 15)
+    self.assert_solution(UCP(ExperimentParameters(2, 1), [10, 10], [CombustionPlant(0, 1, 0, 10, 1000, 15, 0, initially_on=True)]),
+                         [[True, True]], [[10, 10]], 20)
+    self.assert_solution(UCP(ExperimentParameters(1, 1), [0], [CombustionPlant(0, 1, 0, 10, 1000, 0, 5, initially_on=True)]),
+                         [[False]], [[0]], 5)
+    self.assert_solution(UCP(ExperimentParameters(1, 2), [2], [CombustionPlant(0, 1, 5, 2, 1000, 0, 0), CombustionPlant(0, 1, 10, 2, 1000, 0, 0)]),
+                         [[True], [False]], [[2], [0]], 22)
+    self.assert_solution(UCP(ExperimentParameters(1, 2), [11], [CombustionPlant(0, 1, 0, 1, 10, 0, 0), CombustionPlant(0, 2, 0, 1, 1000, 0, 0)]),
+                         [[True], [True]], [[10], [1]], 12)
+    self.assert_solution(UCP(ExperimentParameters(2, 2), [10, 10], [CombustionPlant(0, 1, 0, 1, 1000, 25, 0), CombustionPlant(0, 2, 0, 1, 1000, 0, 0)]),
+                         [[False, False], [True, True]], [[0, 0], [10, 10]], 40)
+    self.assert_solution(UCP(ExperimentParameters(2, 2), [1, 0], [CombustionPlant(0, 1, 0, 1, 1000, 0, 10), CombustionPlant(0, 5, 0, 1, 1000, 0, 0)]),
+                         [[False, False], [True, False]], [[0, 0], [1, 0]], 5)
+
+  def test_brute_force(self):
+    rng: np.random.Generator = np.random.default_rng(0)
+
+    for _ in range(10):
+      ucp: UCP = build_random_ucp(rng, 3, 3)
+      arrays: UCPArrays = ucp.to_arrays()
+
+      # all commitments of all times that can meet the load demand
+      u: np.ndarray = np.array(list(itertools.product([False, True], repeat=9))).reshape(-1, 3, 3)
+      feasible: np.ndarray = np.all(
+        (np.sum(u * arrays.plants.column('Pmin'), axis=-2) <= arrays.loads)
+        & (np.sum(u * arrays.plants.column('Pmax'), axis=-2) >= arrays.loads), axis=-1
+      )
+      o: np.ndarray = arrays.calculate_dispatched_o(u[feasible], include_initial=True)
+
+      solution: UCPSolution = UCP_PriorityList(ucp).optimize()
+      self.assertTrue(solution.optimal)
+      self.assertAlmostEqual(solution.o, float(np.min(o)))
+
+  def test_priority_list(self):
+    rng: np.random.Generator = np.random.default_rng(1)
+    ucp: UCP = build_random_ucp(rng, 20, 24)
+
+    solver: UCP_PriorityList = UCP_PriorityList(ucp)
+    solution: UCPSolution = solver.optimize()
+
+    self.assertEqual(len(solver.states), 21)
+    self.assertFalse(solution.optimal)
+    self.assertEqual(solution.statistics['violation'], 0)
+    self.assertAlmostEqual(ucp.to_arrays().get_violations(np.array(solution.p)), 0)
+
+if __name__ == '__main__':
+  unittest.main()
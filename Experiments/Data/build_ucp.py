@@ -2,31 +2,26 @@
 # version 3.8 required
 
 import random
-from typing import List
+from typing import List, Tuple
+import numpy as np # type: ignore
 
-from Data.DemandData.demand_data import DemandData
-from Data.Plants.plants import Plants
+from Data.data_cache import get_loads, get_plants
+from UCP.ucp_arrays import PlantArrays
 from UCP.unit_commitment_problem import CombustionPlant, UCP, ExperimentParameters
 
 
 demand_file_file: str = 'combined_data.csv'
 plants_file_name: str = 'thermal_power_plant_data.json'
 
-def select_loads(loads: List[float], num_loads: int, offset_loads: int) -> List[float]:
-  # make sure indices of selected loads are inside list
-  result: List[float] = []
+def select_loads(loads: np.ndarray, num_loads: int, offset_loads: int) -> List[float]:
+  # the loads after the offset are continued by repeating all loads from the start
+  loads = np.asarray(loads, dtype=float)
+  result: np.ndarray = loads[offset_loads:num_loads + offset_loads]
 
-  result += loads[offset_loads:]
-  if len(result) > num_loads:
-    result = result[:num_loads]
-  elif len(result) < num_loads:
-    loads_factor: int = (int) ((num_loads - len(result)) / len(loads))
-    result += loads_factor * loads
+  if len(result) < num_loads:
+    result = np.concatenate((result, loads[np.arange(num_loads - len(result)) % len(loads)]))
 
-    remainder: int = num_loads - len(result)
-    result += loads[:remainder]
-
-  return result
+  return result.tolist()
 
 def select_plants(available_plants: List[CombustionPlant], num_plants: int) -> List[CombustionPlant]:
   # initialize pseudo random number generator to get reproducable results
@@ -55,15 +50,44 @@ def scale_loads(loads: List[float], plants: List[CombustionPlant], num_plants: i
   return list(map(lambda x: x * load_factor * num_plants * 0.5, loads))
 
 
-def build_ucp(parameters: ExperimentParameters) -> UCP:
-  demand_data: DemandData = DemandData.read_from_csv(demand_file_file)
-  loads: List[float] = demand_data.data['power_kW'].to_list()
+def load_data() -> Tuple[np.ndarray, PlantArrays]:
+  '''
+  returns the demand data and the plant data from the process-wide cache
+  calling it before worker processes are forked lets them inherit the data instead of reading the files again
+  '''
+  return get_loads(demand_file_file), get_plants(plants_file_name)
 
-  plants_data: Plants = Plants.read_from_json(plants_file_name)
-  available_plants: List[CombustionPlant] = plants_data.plants
+def build_ucp(parameters: ExperimentParameters) -> UCP:
+  demand_data, plants_data = load_data()
+  available_plants: List[CombustionPlant] = [CombustionPlant(**plant) for plant in plants_data.to_dicts()]
 
-  loads = select_loads(loads, parameters.num_loads, parameters.offset_loads)
+  loads: List[float] = select_loads(demand_data, parameters.num_loads, parameters.offset_loads)
   plants: List[CombustionPlant] = select_plants(available_plants, parameters.num_plants)
   loads = scale_loads(loads, plants, parameters.num_plants)
 
   return UCP(parameters, loads, plants)
+
+def build_random_ucp(rng: np.random.Generator, num_plants: int, num_loads: int, linear: bool = False,
+                     min_up_down: bool = True, initially_on: bool = True) -> UCP:
+  '''
+  returns an UCP with random plants and loads that are mostly feasible (for example for tests)
+
+  :rng: random number generator
+  :num_plants: number of plants
+  :num_loads: number of loads
+  :linear: whether about half of the plants have linear costs (C = 0)
+  :min_up_down: whether the plants have random minimum up and down times (otherwise both are 1)
+  :initially_on: whether about half of the plants are initially on (otherwise all are off)
+  '''
+  plants: List[CombustionPlant] = []
+  for _ in range(num_plants):
+    A: float = float(rng.uniform(0, 20))
+    B: float = float(rng.uniform(1, 4))
+    C: float = 0. if linear and rng.random() < 0.5 else float(rng.uniform(0, 0.2))
+    Pmin: float = float(rng.uniform(5, 20))
+    Pmax: float = Pmin + float(rng.uniform(10, 40))
+    AU, AD = (float(rng.uniform(0, 30)), float(rng.uniform(0, 10))) if min_up_down else (1., 1.)
+
+    plants.append(CombustionPlant(A, B, C, Pmin, Pmax, AU, AD, initially_on and bool(rng.random() < 0.5)))
+
+  return UCP(ExperimentParameters(num_loads, num_plants), rng.uniform(20, 25 * num_plants, size=num_loads).tolist(), plants)
@@ -0,0 +1,61 @@
+#!/bin/python
+# version 3.8 required
+
+import os
+from typing import Any, Callable, Dict, Tuple
+import numpy as np # type: ignore
+
+from Data.DemandData.demand_data import DemandData
+from Data.Plants.plants import Plants
+from UCP.ucp_arrays import PlantArrays, read_only
+
+'''
+this file holds the process-wide cache of the input data
+every source is read once and reused as long as the file does not change (same path and modification time),
+worker processes that are forked after the data was loaded inherit the cache instead of reading the files again
+'''
+
+# cached data by absolute path: modification time of the file and data
+cache: Dict[str, Tuple[int, Any]] = {}
+
+def get_cached(file_name: str, read_fun: Callable[[], Any]) -> Any:
+  '''
+  returns the data of a file from the cache, the file is read again if it was modified
+
+  :file_name: path of the file
+  :read_fun: function that reads the data of the file
+  '''
+  path: str = os.path.abspath(file_name)
+  modification_time: int = os.stat(path).st_mtime_ns
+
+  entry: Tuple[int, Any] = cache.get(path, (-1, None))
+  if entry[0] != modification_time:
+    entry = (modification_time, read_fun())
+    cache[path] = entry
+
+  return entry[1]
+
+def get_loads(file_name: str) -> np.ndarray:
+  '''
+  returns the demand data of a file as read-only array
+
+  :file_name: name of the demand data file in the demand data directory
+  '''
+  return get_cached(
+    os.path.join(DemandData.path, file_name),
+    lambda: read_only(DemandData.read_from_csv(file_name).data['power_kW'].to_numpy(dtype=float, copy=True))
+  )
+
+def get_plants(file_name: str) -> PlantArrays:
+  '''
+  returns the plant data of a file as struct of read-only arrays
+
+  :file_name: name of the plant data file in the plants directory
+  '''
+  return get_cached(os.path.join(Plants.path, file_name), lambda: PlantArrays(Plants.read_from_json(file_name).plants))
+
+def clear_cache() -> None:
+  '''
+  removes all data from the cache
+  '''
+  cache.clear()
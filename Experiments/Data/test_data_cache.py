@@ -0,0 +1,84 @@
+#!/bin/python
+# version 3.8 required
+
+import os
+import tempfile
+from typing import List
+import unittest
+import numpy as np # type: ignore
+from numpy.testing import assert_array_equal # type: ignore
+
+from Data.build_ucp import build_random_ucp, build_ucp, load_data, select_loads
+from Data.data_cache import clear_cache, get_cached
+from UCP.unit_commitment_problem import ExperimentParameters, UCP
+
+
+class TestDataCache(unittest.TestCase):
+  '''
+  tests the cache of the input data
+  '''
+
+  def setUp(self) -> None:
+    clear_cache()
+    self.reads: List[str] = []
+
+  def read(self, file_name: str) -> str:
+    with open(file_name, 'r') as file:
+      self.reads.append(file.read())
+
+    return self.reads[-1]
+
+  def test_modification(self):
+    descriptor, file_name = tempfile.mkstemp()
+    os.close(descriptor)
+
+    try:
+      with open(file_name, 'w') as file:
+        file.write('a')
+
+      self.assertEqual(get_cached(file_name, lambda: self.read(file_name)), 'a')
+      self.assertEqual(get_cached(file_name, lambda: self.read(file_name)), 'a')
+      self.assertEqual(len(self.reads), 1)
+
+      with open(file_name, 'w') as file:
+        file.write('b')
+      os.utime(file_name, ns=(0, os.stat(file_name).st_mtime_ns + 10 ** 9))
+
+      self.assertEqual(get_cached(file_name, lambda: self.read(file_name)), 'b')
+      self.assertEqual(len(self.reads), 2)
+
+    finally:
+      os.remove(file_name)
+
+  def test_input_data(self):
+    loads, plants = load_data()
+    cached_loads, cached_plants = load_data()
+
+    self.assertIs(cached_loads, loads)
+    self.assertIs(cached_plants, plants)
+    self.assertFalse(loads.flags.writeable)
+    self.assertFalse(plants.Pmax.flags.writeable)
+
+    ucp: UCP = build_ucp(ExperimentParameters(10, 3))
+    self.assertEqual(len(ucp.loads), 10)
+    self.assertEqual(len(ucp.plants), 3)
+
+  def test_select_loads(self):
+    loads: np.ndarray = np.arange(5.)
+
+    assert_array_equal(select_loads(loads, 3, 1), [1, 2, 3])
+    assert_array_equal(select_loads(loads, 7, 3), [3, 4, 0, 1, 2, 3, 4])
+    assert_array_equal(select_loads(loads, 12, 0), [0, 1, 2, 3, 4, 0, 1, 2, 3, 4, 0, 1])
+    assert_array_equal(select_loads(loads, 3, 6), [0, 1, 2])
+
+  def test_build_random_ucp(self):
+    ucp: UCP = build_random_ucp(np.random.default_rng(0), 20, 4, linear=True, min_up_down=False, initially_on=False)
+
+    self.assertEqual(ucp.parameters, ExperimentParameters(4, 20))
+    self.assertEqual(len(ucp.loads), 4)
+    self.assertTrue(all(plant.AU == plant.AD == 1 and not plant.initially_on for plant in ucp.plants))
+    self.assertTrue(any(plant.C == 0 for plant in ucp.plants))
+    self.assertTrue(all(plant.Pmin < plant.Pmax for plant in ucp.plants))
+
+if __name__ == '__main__':
+  unittest.main()
@@ -1,14 +1,17 @@
 #!/bin/python
 # version 3.8 required
 
+from dataclasses import asdict
 from typing import Dict, List, Tuple
 import numpy as np # type: ignore
 from qiskit.optimization import QuadraticProgram # type: ignore
 from qiskit.optimization.problems.variable import Variable # type: ignore
 from qiskit.optimization.algorithms import OptimizationResult # type: ignore
 
+from UCP.model_statistics import ModelStatistics
 from UCP.unit_commitment_problem import CombustionPlant, UCP, UCPSolution
 from Util.logging import debug_msg
+from Util.timing import Timings
 
 
 class UCP_QUBO(object):
@@ -18,6 +21,7 @@ class UCP_QUBO(object):
   model: QuadraticProgram
   ucp: UCP
   p: List[List[List[Variable]]] # variables of model
+  timings: Timings # time of building the QUBO
   P: List[np.ndarray] # discretizised power levels
 
   def discretizise_plants(self, max_h: float) -> None:
@@ -189,14 +193,25 @@ class UCP_QUBO(object):
     '''
     self.model = QuadraticProgram()
     self.ucp = ucp
+    self.timings = Timings()
 
-    self.discretizise_plants(max_h)
-    self.init_variables()
+    with self.timings.phase('build'):
+      self.discretizise_plants(max_h)
+      self.init_variables()
 
-    quadratic: Dict[Tuple[str, str], float] = self.get_quadratic(y_s, y_d, y_p)
-    linear: Dict[str, float] = self.get_linear(y_c, y_s, y_d, y_p)
-    constant: float = self.get_constant(y_p)
-    self.model.minimize(constant, linear, quadratic)
+      quadratic: Dict[Tuple[str, str], float] = self.get_quadratic(y_s, y_d, y_p)
+      linear: Dict[str, float] = self.get_linear(y_c, y_s, y_d, y_p)
+      constant: float = self.get_constant(y_p)
+      self.model.minimize(constant, linear, quadratic)
+
+  def get_statistics(self) -> ModelStatistics:
+    '''
+    returns the size of the QUBO, the memory of the quadratic program of Qiskit is not known
+    '''
+    quadratic: Dict[Tuple[int, int], float] = self.model.objective.quadratic.to_dict()
+    couplers: int = sum(1 for (i, j), value in quadratic.items() if i != j and value != 0)
+
+    return ModelStatistics.from_quadratic(self.model.get_num_vars(), couplers, -1)
 
   def get_variables_from_result(self, result: OptimizationResult, u: List[List[bool]], p: List[List[float]]) -> None:
     '''
@@ -235,17 +250,26 @@ class UCP_QUBO(object):
     :solver: solver used to optimize the QUBO
     :adjust: whether the result should be adjusted to meet power demand at all times
     '''
-    result: OptimizationResult = solver.solve(self.model)
+    timings: Timings = Timings()
+
+    with timings.phase('solve'):
+      result: OptimizationResult = solver.solve(self.model)
 
     u: List[List[bool]] = []
     p: List[List[float]] = []
 
-    self.get_variables_from_result(result, u, p)
+    with timings.phase('decode'):
+      self.get_variables_from_result(result, u, p)
 
-    time: float = -1
+    # the solver does not report its run time
+    time: float = timings.get_wall('solve')
     solution: UCPSolution = UCPSolution(self.ucp, time, True, self.ucp.calculate_o(u, p), u, p)
 
     if adjust:
-      solution.adjust_variables()
+      with timings.phase('adjust'):
+        solution.adjust_variables()
+
+    solution.timings = {**self.timings.to_dict(), **timings.to_dict()}
+    solution.metrics = {**solution.metrics, 'model': asdict(self.get_statistics())}
 
     return solution
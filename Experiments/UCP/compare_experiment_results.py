@@ -2,7 +2,8 @@
 # versino 3.8 required
 
 import argparse
-from typing import Dict, List, Optional
+import math
+from typing import Dict, List, Optional, Tuple
 
 import matplotlib.pyplot as plt # type: ignore
 import pandas as pd # type: ignore
@@ -14,6 +15,20 @@ this file is used to create the figures comparing the experiment results
 it is not part of the experiments
 '''
 
+# metrics of the size of the encoded model and of the memory usage (stored in the metrics of the solutions)
+MODEL_METRICS: Tuple[str, ...] = ('variables', 'couplers', 'density', 'bytes', 'constraints')
+MEMORY_METRICS: Tuple[str, ...] = ('peak_rss', 'traced_peak')
+
+METRIC_LABELS: Dict[str, str] = {
+  'variables': 'Number of Variables',
+  'couplers': 'Number of Couplers',
+  'density': 'Density of the Couplers',
+  'bytes': 'Model Size (MiB)',
+  'constraints': 'Number of Constraints',
+  'peak_rss': 'Peak Resident Memory (MiB)',
+  'traced_peak': 'Peak Allocated Memory (MiB)'
+}
+
 def plot_time_comparison(experiment_results_list: List[ExperimentResults],
                          loads: List[int], num_plants: int, output_file_name: str) -> None:
   '''
@@ -84,6 +99,115 @@ def plot_error_comparison(experiment_results_list: List[ExperimentResults],
   plt.savefig(output_file_name)
 
 
+def plot_quality_comparison(experiment_results_list: List[ExperimentResults],
+                            num_loads: int, num_plants: int, output_file_name: str) -> None:
+  '''
+  plot the relative error of the best solution found over time (time-to-quality) of all passed experiment results
+  the error is relative to the best objective function of all experiment results,
+  results without an incumbent trace (like the annealing results) are a single point at their computing time
+
+  :experiment_results_list: list of the experiment results objects to plot
+  :num_loads: number of loads, for which to plot the error over time
+  :num_plants: number of plants, for which to plot the error over time
+  :output_file_name: name of the output file
+  '''
+  solutions: List[UCPSolution] = []
+
+  for experiment_results in experiment_results_list:
+    matching: List[UCPSolution] = [
+      solution for solution in experiment_results.get_experiments(num_plants)
+      if solution.ucp.parameters.num_loads == num_loads
+    ]
+
+    if not matching:
+      raise RuntimeError('No experiment results of {} with {} loads'.format(experiment_results.solutions_name, num_loads))
+
+    solutions.append(matching[0])
+
+  best: float = min(solution.o for solution in solutions)
+
+  for solution in solutions:
+    trace: List[List[float]] = solution.trace or [[solution.time, solution.o, -math.inf]]
+
+    times: List[float] = [entry[0] for entry in trace] + [max(solution.time, trace[-1][0])]
+    errors: List[float] = [(entry[1] - best) / abs(best) * 100 if best != 0 else 0 for entry in trace]
+
+    plt.step(times, errors + errors[-1:], where='post', marker='o')
+
+  plt.legend([experiment_results.solutions_name for experiment_results in experiment_results_list])
+
+  plt.xscale('log')
+  plt.xlabel('Computation Time (s)')
+  plt.ylabel('Relative Error (%)')
+
+  plt.tight_layout()
+  plt.savefig(output_file_name)
+
+
+def get_metric(solution: UCPSolution, metric: str, phase: Optional[str] = None) -> Optional[float]:
+  '''
+  returns a metric of a solution (None if it was not recorded)
+  memory metrics are the maximum over all phases if no phase is specified, sizes are in MiB
+
+  :solution: UCPSolution instance
+  :metric: name of the metric
+  :phase: phase of the memory metrics
+  '''
+  value: Optional[float]
+
+  if metric in MODEL_METRICS:
+    value = solution.metrics.get('model', {}).get(metric)
+
+  else:
+    phases: Dict[str, Dict[str, int]] = solution.metrics.get('memory', {})
+    values: List[float] = [
+      memory[metric] for name, memory in phases.items() if metric in memory and (phase is None or name == phase)
+    ]
+    value = max(values) if values else None
+
+  # sizes that are not known are stored as -1
+  if value is None or value < 0:
+    return None
+
+  return value / 2 ** 20 if metric in ('bytes',) + MEMORY_METRICS else value
+
+
+def plot_metric_comparison(experiment_results_list: List[ExperimentResults],
+                           loads: List[int], num_plants: int, output_file_name: str,
+                           metric: str, phase: Optional[str] = None) -> None:
+  '''
+  plot the size of the encoded models or the memory usage of all passed experiment results
+
+  :experiment_results_list: list of the experiment results objects to plot
+  :loads: list of number of loads, for which to plot the metric
+  :num_plants: number of plants, for which to plot the metric
+  :output_file_name: name of the output file
+  :metric: name of the metric (see MODEL_METRICS and MEMORY_METRICS)
+  :phase: phase of the memory metrics, default: maximum over all phases
+  '''
+  for experiment_results in experiment_results_list:
+    solutions_list: List[UCPSolution] = experiment_results.get_experiments(num_plants)
+
+    values: Dict[int, float] = {}
+
+    for solution in solutions_list:
+      value: Optional[float] = get_metric(solution, metric, phase)
+      if solution.ucp.parameters.num_loads in loads and value is not None:
+        values[solution.ucp.parameters.num_loads] = value
+
+    value_series: pd.Series = pd.Series(values, dtype=float).sort_index()
+
+    value_series.plot()
+
+  plt.legend([experiment_results.solutions_name for experiment_results in experiment_results_list])
+
+  plt.xlabel('Number of Loads')
+  plt.ylabel(METRIC_LABELS[metric])
+
+  plt.tight_layout()
+  plt.savefig(output_file_name)
+
+
 if __name__ == "__main__":
   '''
   read arguments and call above defined functions to plot the comparison
@@ -94,12 +218,17 @@ if __name__ == "__main__":
   solutions_name_action: argparse.Action = parser.add_argument('--solutions-name', nargs="+", type=str, default=[])
 
   plant_number_action: argparse.Action = parser.add_argument('--num', type=int)
+  loads_number_action: argparse.Action = parser.add_argument('--loads', type=int)
   parser.add_argument('--lower-loads', type=int, default=0)
   parser.add_argument('--upper-loads', type=int, default=500)
   parser.add_argument('--skip-loads', type=int, default=1)
 
   performance_action: argparse.Action = parser.add_argument('-p', '--performance', action='store_true')
   parser.add_argument('-e', '--error', action='store_true')
+  parser.add_argument('-q', '--quality', action='store_true')
+  parser.add_argument('-m', '--metric', choices=MODEL_METRICS + MEMORY_METRICS,
+                      help='Plot the size of the encoded models or the memory usage.')
+  parser.add_argument('--phase', type=str, help='Phase of the memory usage, default: maximum over all phases.')
 
   output_action: argparse.Action = parser.add_argument('-o', '--output', type=str)
 
@@ -142,6 +271,13 @@ if __name__ == "__main__":
       raise argparse.ArgumentError(performance_action, 'When --error is specified, please only use 2 sources of experiment results')
 
     plot_error_comparison(experiment_results_list, loads, plant_number, output_file_name)
+  elif args.quality:
+    if not args.loads:
+      raise argparse.ArgumentError(loads_number_action, message='When --quality is specified, please provide the number of loads')
+
+    plot_quality_comparison(experiment_results_list, args.loads, plant_number, output_file_name)
+  elif args.metric:
+    plot_metric_comparison(experiment_results_list, loads, plant_number, output_file_name, args.metric, args.phase)
   else:
-    raise argparse.ArgumentError(performance_action, 'Pleace specify either --performance or --error')
+    raise argparse.ArgumentError(performance_action, 'Pleace specify either --performance, --error, --quality or --metric')
 
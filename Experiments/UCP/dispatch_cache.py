@@ -0,0 +1,277 @@
+#!/bin/python
+# version 3.8 required
+
+from collections import OrderedDict
+from typing import Any, Dict, Iterator, Optional, Tuple
+import numpy as np # type: ignore
+
+from UCP.economic_dispatch import get_responses, solve_clipped_sum
+
+
+class DispatchCurve(object):
+  '''
+  optimal dispatch of a set of committed plants as a function of the load
+  the total power output is piecewise linear in the marginal costs (lambda) between the breakpoints
+  at which a plant reaches a limit, so the minimal costs are piecewise quadratic in the load
+  '''
+  __slots__ = ('B', 'C', 'Pmin', 'Pmax', 'fixed_cost', 'lambdas', 'totals_left', 'totals_right', 'costs_left',
+               'costs_right', 'offsets', 'slopes', 'constants')
+
+  B: np.ndarray # coefficients of the committed plants with the shape (number of plants, 1)
+  C: np.ndarray
+  Pmin: np.ndarray
+  Pmax: np.ndarray
+  fixed_cost: float # sum of the costs A of the committed plants
+  lambdas: np.ndarray # breakpoints of the marginal costs
+  totals_left: np.ndarray # total power output just below every breakpoint
+  totals_right: np.ndarray # total power output just above every breakpoint
+  costs_left: np.ndarray # minimal costs just below every breakpoint
+  costs_right: np.ndarray # minimal costs just above every breakpoint
+  offsets: np.ndarray # total power output = offset + slope * lambda between two breakpoints
+  slopes: np.ndarray
+  constants: np.ndarray # costs = constant + slope / 2 * lambda^2 between two breakpoints
+
+  def __init__(self, A: np.ndarray, B: np.ndarray, C: np.ndarray, Pmin: np.ndarray, Pmax: np.ndarray) -> None:
+    '''
+    precomputes the breakpoints of the optimal dispatch
+
+    :A: constant cost coefficients of the committed plants
+    :B: linear cost coefficients of the committed plants
+    :C: quadratic cost coefficients of the committed plants
+    :Pmin: minimal power outputs of the committed plants
+    :Pmax: maximal power outputs of the committed plants
+    '''
+    self.B, self.C, self.Pmin, self.Pmax = (np.asarray(a, dtype=float)[:, np.newaxis] for a in (B, C, Pmin, Pmax))
+    self.fixed_cost = float(np.sum(A))
+
+    self.lambdas = np.unique(np.concatenate((self.B + 2 * self.C * self.Pmin, self.B + 2 * self.C * self.Pmax), axis=None))
+    self.totals_left, self.costs_left = self.get_totals_and_costs(self.get_responses(self.lambdas, False))
+    self.totals_right, self.costs_right = self.get_totals_and_costs(self.get_responses(self.lambdas, True))
+
+    # plants strictly between their limits in the middle of two breakpoints follow the marginal costs
+    responses: np.ndarray = self.get_responses((self.lambdas[:-1] + self.lambdas[1:]) / 2, False)
+    free: np.ndarray = (self.C > 0) & (responses > self.Pmin) & (responses < self.Pmax)
+    inverse: np.ndarray = 1 / np.where(self.C > 0, 2 * self.C, 1)
+
+    self.slopes = np.sum(np.where(free, inverse, 0), axis=0)
+    self.offsets = np.sum(np.where(free, -self.B * inverse, responses), axis=0)
+    self.constants = np.sum(np.where(
+      free, -self.B ** 2 * inverse / 2, self.B * responses + self.C * responses ** 2
+    ), axis=0) + self.fixed_cost
+
+  def get_responses(self, lambdas: np.ndarray, right: bool) -> np.ndarray:
+    '''
+    returns the optimal power outputs for marginal costs with the shape (number of plants, number of lambdas)
+
+    :lambdas: marginal costs
+    :right: whether plants with linear costs equal to lambda are at the upper limit
+    '''
+    return get_responses(self.B, self.C, self.Pmin, self.Pmax, lambdas[np.newaxis, :], right)[0]
+
+  def get_totals_and_costs(self, responses: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    '''
+    returns the total power outputs and the costs of power outputs with the shape (number of plants, ...)
+
+    :responses: power outputs
+    '''
+    return (
+      np.sum(responses, axis=0),
+      np.sum(self.B * responses + self.C * responses ** 2, axis=0) + self.fixed_cost
+    )
+
+  def solve(self, loads: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    '''
+    searches the breakpoints of several loads in O(log(number of breakpoints)) per load
+    returns the index of the first breakpoint at which the load can be met,
+    whether the load is met at this breakpoint and the optimal marginal costs
+
+    :loads: loads
+    '''
+    k: np.ndarray = np.minimum(np.searchsorted(self.totals_right, loads, side='left'), len(self.lambdas) - 1)
+    at_breakpoint: np.ndarray = self.totals_left[k] <= loads
+
+    segment: np.ndarray = np.maximum(k - 1, 0)
+    slopes: np.ndarray = self.slopes[segment] if len(self.slopes) else np.zeros(len(k))
+    offsets: np.ndarray = self.offsets[segment] if len(self.offsets) else np.zeros(len(k))
+    lambdas: np.ndarray = np.where(
+      at_breakpoint | (slopes <= 0), self.lambdas[k], (loads - offsets) / np.where(slopes > 0, slopes, 1)
+    )
+
+    return k, at_breakpoint, lambdas
+
+  def get_costs(self, loads: np.ndarray) -> np.ndarray:
+    '''
+    returns the minimal costs of meeting several loads
+    if a load can not be met, all plants run at their upper (or lower) limits
+
+    :loads: loads
+    '''
+    loads = np.asarray(loads, dtype=float)
+    if len(self.lambdas) == 0:
+      return np.zeros(loads.shape)
+
+    k, at_breakpoint, lambdas = self.solve(loads)
+    segment: np.ndarray = np.maximum(k - 1, 0)
+    slopes: np.ndarray = self.slopes[segment] if len(self.slopes) else np.zeros(len(k))
+    constants: np.ndarray = self.constants[segment] if len(self.constants) else np.zeros(len(k))
+
+    # at a breakpoint the plants with linear costs equal to lambda produce the remaining power
+    costs: np.ndarray = np.where(
+      at_breakpoint,
+      self.costs_left[k] + self.lambdas[k] * (loads - self.totals_left[k]),
+      constants + slopes / 2 * lambdas ** 2
+    )
+
+    costs = np.where(loads >= self.totals_right[-1], self.costs_right[-1], costs)
+    return np.where(loads <= self.totals_left[0], self.costs_left[0], costs)
+
+  def get_outputs(self, loads: np.ndarray, p: np.ndarray) -> np.ndarray:
+    '''
+    returns the optimal power outputs for several loads with the shape (number of plants, number of loads)
+    of power outputs with equal costs the ones closest to p are chosen like in economic_dispatch.dispatch
+
+    :loads: loads
+    :p: power outputs with the shape (number of plants, number of loads)
+    '''
+    loads = np.asarray(loads, dtype=float)
+    if len(self.lambdas) == 0:
+      return np.zeros((0, len(loads)))
+
+    _, at_breakpoint, lambdas = self.solve(loads)
+    outputs: np.ndarray = self.get_responses(lambdas, False)
+
+    # plants with linear costs equal to lambda share the remaining demand
+    tied: np.ndarray = (self.C == 0) & (self.B == lambdas) & at_breakpoint
+    if np.any(tied):
+      remaining: np.ndarray = loads - np.sum(np.where(tied, 0., outputs), axis=0)
+      shared: np.ndarray = solve_clipped_sum(
+        np.where(tied, p, 0.), np.where(tied, self.Pmin, 0.), np.where(tied, self.Pmax, 0.), remaining
+      )
+      outputs = np.where(tied, shared, outputs)
+
+    outputs = np.where(loads >= self.totals_right[-1], self.Pmax, outputs)
+    return np.where(loads <= self.totals_left[0], self.Pmin, outputs)
+
+
+class DispatchCostCache(object):
+  '''
+  least recently used cache of the dispatch curves of sets of committed plants
+  repeated evaluations of a set of committed plants only search the breakpoints of its curve
+  '''
+  __slots__ = ('A', 'B', 'C', 'Pmin', 'Pmax', 'max_size', 'curves', 'hits', 'misses')
+
+  A: np.ndarray # coefficients of all plants with the shape (number of plants,)
+  B: np.ndarray
+  C: np.ndarray
+  Pmin: np.ndarray
+  Pmax: np.ndarray
+  max_size: int # maximum number of cached curves
+  curves: 'OrderedDict[bytes, DispatchCurve]'
+  hits: int
+  misses: int
+
+  def __init__(self, A: np.ndarray, B: np.ndarray, C: np.ndarray, Pmin: np.ndarray, Pmax: np.ndarray,
+               max_size: int = 1024) -> None:
+    '''
+    initializes an empty cache
+
+    :A: constant cost coefficients of all plants
+    :B: linear cost coefficients of all plants
+    :C: quadratic cost coefficients of all plants
+    :Pmin: minimal power outputs of all plants
+    :Pmax: maximal power outputs of all plants
+    :max_size: maximum number of cached curves
+    '''
+    self.A, self.B, self.C, self.Pmin, self.Pmax = (np.asarray(a, dtype=float) for a in (A, B, C, Pmin, Pmax))
+    self.max_size = max_size
+    self.curves = OrderedDict()
+    self.hits = 0
+    self.misses = 0
+
+  def get_curve(self, committed: np.ndarray) -> DispatchCurve:
+    '''
+    returns the dispatch curve of a set of committed plants
+
+    :committed: commitment of all plants with the shape (number of plants,)
+    '''
+    key: bytes = np.packbits(committed).tobytes()
+    curve: Optional[DispatchCurve] = self.curves.get(key)
+
+    if curve is not None:
+      self.hits += 1
+      self.curves.move_to_end(key)
+      return curve
+
+    self.misses += 1
+    curve = DispatchCurve(self.A[committed], self.B[committed], self.C[committed], self.Pmin[committed], self.Pmax[committed])
+    self.curves[key] = curve
+
+    if len(self.curves) > self.max_size:
+      self.curves.popitem(last=False)
+
+    return curve
+
+  def group_commitments(self, u: np.ndarray) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+    '''
+    groups the times of one or several solutions by the set of committed plants
+    yields the set and the indices of the (flattened) times
+
+    :u: commitment of units with the shape (..., number of plants, number of loads)
+    '''
+    rows: np.ndarray = np.moveaxis(u, -2, -1).reshape(-1, u.shape[-2])
+    sets, inverse = np.unique(rows, axis=0, return_inverse=True)
+
+    order: np.ndarray = np.argsort(inverse.ravel(), kind='stable')
+    bounds: np.ndarray = np.cumsum(np.bincount(inverse.ravel(), minlength=len(sets)))
+
+    for committed, indices in zip(sets, np.split(order, bounds[:-1])):
+      yield committed, indices
+
+  def get_costs(self, loads: np.ndarray, u: np.ndarray) -> np.ndarray:
+    '''
+    returns the minimal costs of the committed plants at every time with the shape (..., number of loads)
+
+    :loads: load demand at every time
+    :u: commitment of units with the shape (..., number of plants, number of loads)
+    '''
+    u = np.asarray(u, dtype=bool)
+    flat_loads: np.ndarray = np.broadcast_to(loads, u.shape[:-2] + u.shape[-1:]).reshape(-1)
+    costs: np.ndarray = np.zeros(len(flat_loads))
+
+    for committed, indices in self.group_commitments(u):
+      costs[indices] = self.get_curve(committed).get_costs(flat_loads[indices])
+
+    return costs.reshape(u.shape[:-2] + u.shape[-1:])
+
+  def dispatch(self, loads: np.ndarray, u: np.ndarray, p: Optional[np.ndarray] = None) -> np.ndarray:
+    '''
+    computes the cost-optimal power outputs of the committed plants like economic_dispatch.dispatch
+
+    :loads: load demand at every time
+    :u: commitment of units with the shape (..., number of plants, number of loads)
+    :p: power output of units with the shape (..., number of plants, number of loads), default: 0
+    '''
+    u = np.asarray(u, dtype=bool)
+    p = np.zeros(u.shape) if p is None else np.broadcast_to(np.asarray(p, dtype=float), u.shape)
+
+    rows: np.ndarray = np.moveaxis(p, -2, -1).reshape(-1, u.shape[-2]).copy()
+    targets: np.ndarray = loads - np.sum(np.where(u, 0., p), axis=-2)
+    flat_targets: np.ndarray = targets.reshape(-1)
+
+    for committed, indices in self.group_commitments(u):
+      selection: np.ndarray = np.ix_(indices, np.nonzero(committed)[0])
+      rows[selection] = self.get_curve(committed).get_outputs(flat_targets[indices], rows[selection].T).T
+
+    return np.moveaxis(rows.reshape(u.shape[:-2] + u.shape[-1:] + u.shape[-2:-1]), -1, -2)
+
+  def get_statistics(self) -> Dict[str, Any]:
+    '''
+    returns the number of hits and misses, the hit rate and the number of cached curves
+    '''
+    lookups: int = self.hits + self.misses
+    return {
+      'hits': self.hits,
+      'misses': self.misses,
+      'hit_rate': self.hits / lookups if lookups > 0 else 0.,
+      'size': len(self.curves)
+    }
@@ -0,0 +1,131 @@
+#!/bin/python
+# version 3.8 required
+
+from typing import Optional
+import numpy as np # type: ignore
+
+
+# arrays of power outputs have the shape (..., number of plants, number of loads),
+# the coefficients of the plants have the shape (number of plants, 1) and the loads the shape (number of loads,)
+
+def get_responses(B: np.ndarray, C: np.ndarray, lower: np.ndarray, upper: np.ndarray, lambdas: np.ndarray,
+                  right: bool) -> np.ndarray:
+  '''
+  computes the cost-optimal power outputs of all plants for given marginal costs (lambda)
+  returns an array with the shape (..., number of lambdas, number of plants, number of loads)
+
+  :B: linear cost coefficients
+  :C: quadratic cost coefficients
+  :lower: lower limits of the power outputs
+  :upper: upper limits of the power outputs
+  :lambdas: marginal costs with the shape (..., number of lambdas, number of loads)
+  :right: whether plants with linear costs equal to lambda are at the upper (right) or lower (left) limit
+  '''
+  lambdas = lambdas[..., np.newaxis, :]
+  lower = lower[..., np.newaxis, :, :]
+  upper = upper[..., np.newaxis, :, :]
+
+  # plants with quadratic costs have the marginal costs B + 2 C p
+  quadratic: np.ndarray = np.clip((lambdas - B) / np.where(C > 0, 2 * C, 1), lower, upper)
+
+  # plants with linear costs run at one of their limits
+  at_upper: np.ndarray = lambdas >= B if right else lambdas > B
+  linear: np.ndarray = np.where(at_upper, upper, lower)
+
+  return np.where(C > 0, quadratic, linear)
+
+def solve_clipped_sum(offsets: np.ndarray, lower: np.ndarray, upper: np.ndarray, targets: np.ndarray) -> np.ndarray:
+  '''
+  finds the shifts mu with sum_i clip(offsets_i + mu, lower_i, upper_i) = target at every time
+  returns the clipped values
+
+  :offsets: values that are shifted
+  :lower: lower limits of the values
+  :upper: upper limits of the values
+  :targets: sums of the values with the shape (..., number of loads)
+  '''
+  # the sum is piecewise linear in mu with breakpoints where a value reaches a limit
+  breakpoints: np.ndarray = np.sort(np.concatenate((lower - offsets, upper - offsets), axis=-2), axis=-2)
+  sums: np.ndarray = np.sum(
+    np.clip(offsets[..., np.newaxis, :, :] + breakpoints[..., np.newaxis, :], lower[..., np.newaxis, :, :],
+            upper[..., np.newaxis, :, :]),
+    axis=-2
+  )
+
+  # interpolate between the last breakpoint below the target and the first one above
+  k: np.ndarray = np.clip(np.sum(sums < targets[..., np.newaxis, :], axis=-2, keepdims=True), 1, breakpoints.shape[-2] - 1)
+  mu_left, mu_right = np.take_along_axis(breakpoints, k - 1, -2), np.take_along_axis(breakpoints, k, -2)
+  sum_left, sum_right = np.take_along_axis(sums, k - 1, -2), np.take_along_axis(sums, k, -2)
+
+  slope: np.ndarray = sum_right - sum_left
+  mu: np.ndarray = mu_left + np.where(slope > 0, (targets[..., np.newaxis, :] - sum_left) / np.where(slope > 0, slope, 1), 0) \
+                   * (mu_right - mu_left)
+
+  return np.clip(offsets + mu, lower, upper)
+
+def dispatch(B: np.ndarray, C: np.ndarray, Pmin: np.ndarray, Pmax: np.ndarray, loads: np.ndarray, u: np.ndarray,
+             p: Optional[np.ndarray] = None) -> np.ndarray:
+  '''
+  computes the power outputs of the committed plants that meet the loads with minimal costs A + B p + C p^2
+  by searching the marginal costs (lambda) at which the demand is met for all times at once
+  if the loads can not be met, all committed plants run at their upper (or lower) limits
+  plants with equal linear costs are ambiguous, their power outputs are chosen as close to p as possible
+  returns the power outputs, the outputs of plants that are not committed are unchanged
+
+  :B: linear cost coefficients
+  :C: quadratic cost coefficients
+  :Pmin: minimal power outputs
+  :Pmax: maximal power outputs
+  :loads: load demand at every time
+  :u: commitment of units
+  :p: power output of units, default: 0
+  '''
+  u = np.asarray(u, dtype=bool)
+  p = np.zeros(u.shape) if p is None else np.broadcast_to(np.asarray(p, dtype=float), u.shape)
+
+  lower: np.ndarray = np.where(u, Pmin, 0.)
+  upper: np.ndarray = np.where(u, Pmax, 0.)
+  targets: np.ndarray = loads - np.sum(np.where(u, 0., p), axis=-2)
+
+  # the marginal costs at the limits of the plants are the breakpoints of the total power output
+  lambdas: np.ndarray = np.sort(np.concatenate((
+    np.broadcast_to(B + 2 * C * Pmin, u.shape), np.broadcast_to(B + 2 * C * Pmax, u.shape)
+  ), axis=-2), axis=-2)
+  sums_left: np.ndarray = np.sum(get_responses(B, C, lower, upper, lambdas, False), axis=-2)
+  sums_right: np.ndarray = np.sum(get_responses(B, C, lower, upper, lambdas, True), axis=-2)
+
+  # first breakpoint at which the demand can be met
+  k: np.ndarray = np.minimum(
+    np.sum(sums_right < targets[..., np.newaxis, :], axis=-2, keepdims=True), lambdas.shape[-2] - 1
+  )
+  previous: np.ndarray = np.maximum(k - 1, 0)
+  lambda_k: np.ndarray = np.take_along_axis(lambdas, k, -2)
+  lambda_previous: np.ndarray = np.take_along_axis(lambdas, previous, -2)
+  sum_k: np.ndarray = np.take_along_axis(sums_left, k, -2)
+  sum_previous: np.ndarray = np.take_along_axis(sums_right, previous, -2)
+
+  # either the demand is met at the breakpoint (by a jump of plants with linear costs)
+  # or between two breakpoints where the total power output is linear in lambda
+  at_breakpoint: np.ndarray = sum_k[..., 0, :] <= targets
+  slope: np.ndarray = sum_k - sum_previous
+  fraction: np.ndarray = np.where(slope > 0, (targets[..., np.newaxis, :] - sum_previous) / np.where(slope > 0, slope, 1), 0)
+  lambda_optimal: np.ndarray = np.where(
+    at_breakpoint[..., np.newaxis, :], lambda_k, lambda_previous + fraction * (lambda_k - lambda_previous)
+  )
+
+  result: np.ndarray = get_responses(B, C, lower, upper, lambda_optimal, False)[..., 0, :, :]
+
+  # plants with linear costs equal to lambda share the remaining demand
+  tied: np.ndarray = u & (C == 0) & (B == lambda_optimal) & at_breakpoint[..., np.newaxis, :]
+  if np.any(tied):
+    remaining: np.ndarray = targets - np.sum(np.where(tied, 0., result), axis=-2)
+    shared: np.ndarray = solve_clipped_sum(
+      np.where(tied, p, 0.), np.where(tied, lower, 0.), np.where(tied, upper, 0.), remaining
+    )
+    result = np.where(tied, shared, result)
+
+  # loads that can not be met
+  result = np.where((targets >= np.sum(upper, axis=-2))[..., np.newaxis, :], upper, result)
+  result = np.where((targets <= np.sum(lower, axis=-2))[..., np.newaxis, :], lower, result)
+
+  return np.where(u, result, p)
@@ -41,6 +41,10 @@ class ExperimentResults(object):
     self.solutions: List[UCPSolution] = []
 
     for solution_file_name in solution_file_names:
+      # other files (for example profiles) can be stored next to the results
+      if not solution_file_name.endswith('.json'):
+        continue
+
       self.solutions.append(
         ExperimentResults.load_experiment_result(
           os.path.join(self.solution_dir_name, solution_file_name)
@@ -106,6 +110,44 @@ class ExperimentResults(object):
     plt.tight_layout()
     plt.savefig(output_file_name)
 
+  def plot_timings(self, num_plants: int, loads: List[int], output_file_name: str, cpu: bool = False) -> None:
+    '''
+    plots the time of the phases (for example build, solve and decode) stacked
+    for the specific number of power plants and specified numbers of loads
+
+    :num_plants: number of plants
+    :loads: list of the numbers of loads
+    :output_file_name: name of the output file
+    :cpu: plot the CPU time instead of the wall-clock time
+    '''
+    solutions_list: List[UCPSolution] = self.get_experiments(num_plants)
+
+    clock: str = 'cpu' if cpu else 'wall'
+    times: Dict[int, Dict[str, float]] = {}
+
+    for solution in solutions_list:
+      if solution.ucp.parameters.num_loads in loads:
+        # the phases of the experiment runner contain the phases of the encoder
+        times[solution.ucp.parameters.num_loads] = {
+          phase: timing[clock] for phase, timing in solution.timings.items()
+          if phase not in ('load_data', 'build_ucp', 'optimize')
+        }
+
+    time_frame: pd.DataFrame = pd.DataFrame.from_dict(times, orient='index').sort_index().fillna(0)
+
+    if time_frame.empty:
+      raise RuntimeError('No timings in the experiment results with {} power plants'.format(num_plants))
+
+    time_frame.plot.area()
+
+    plt.title(self.solutions_name)
+
+    plt.xlabel('Number of Loads')
+    plt.ylabel('{} Time (s)'.format('CPU' if cpu else 'Wall-Clock'))
+
+    plt.tight_layout()
+    plt.savefig(output_file_name)
+
   def generate_table(self, num_plants: int, loads: List[int], output_file_name: str) -> None:
     '''
     generates a table of the computing time for the specific number of power plants and specified numbers of loads
@@ -149,6 +191,8 @@ if __name__ == "__main__":
 
   plot_action: argparse.Action = parser.add_argument('-p', '--plot', action='store_true')
   parser.add_argument('-t', '--table', action='store_true')
+  parser.add_argument('--timings', help='Plot the time of the phases of the experiments.', action='store_true')
+  parser.add_argument('--cpu', help='Plot the CPU time of the phases instead of the wall-clock time.', action='store_true')
   output_action: argparse.Action = parser.add_argument('-o', '--output', type=str)
 
   args = parser.parse_args()
@@ -179,7 +223,9 @@ if __name__ == "__main__":
 
   if args.plot:
     results.plot_time(args.num, loads, output_file_name)
+  elif args.timings:
+    results.plot_timings(args.num, loads, output_file_name, args.cpu)
   elif args.table:
     results.generate_table(args.num, loads, output_file_name)
   else:
-    raise argparse.ArgumentError(plot_action, message='Please either specify --plot or --table')
+    raise argparse.ArgumentError(plot_action, message='Please either specify --plot, --timings or --table')
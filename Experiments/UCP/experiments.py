@@ -3,10 +3,20 @@
 
 import os
 import argparse
-from typing import Callable
-from Data.build_ucp import build_ucp
+import json
+from dataclasses import asdict
+from multiprocessing import Pool
+import tempfile
+import tracemalloc
+from typing import Callable, List, Optional, Set, Tuple
+from Data.build_ucp import build_ucp, load_data
+from UCP.model_cache import CACHE_DIRECTORY_VARIABLE
 from UCP.unit_commitment_problem import UCP, UCPSolution, ExperimentParameters
 from Util.logging import debug_msg_time
+from Util.memory import MemoryUsage
+from Util.profiling import DEFAULT_PHASES, PROFILE_EXTENSION, PROFILE_VARIABLE, PhaseProfiler, \
+                           get_profiled_phases, start_profiling, stop_profiling, write_profile_summary
+from Util.timing import Timings
 
 '''
 this is the core of all experiment runners
@@ -14,6 +24,8 @@ it specifies how the experiments are executed
 it requires being called with
 - arguments that specify which numbers of loads and numbers of plants should be used (command line arguments)
 - a function that specifies how the experiment for a specific UCP object is executed
+experiments whose results already exist are skipped, so an interrupted run can be resumed,
+and the experiments can be distributed over several processes
 '''
 
 
@@ -29,11 +41,42 @@ def write_solution(solution: UCPSolution, parameters: ExperimentParameters, path
   file_name = parameters.to_file_name(prefix)
 
   if not os.path.exists(path):
-    os.makedirs(path)
+    os.makedirs(path, exist_ok=True)
 
-  solution.save_to(os.path.join(path, file_name))
+  # the result is written to a temporary file first, so that an interrupted run never leaves a partial result file
+  descriptor, temporary_file_name = tempfile.mkstemp(dir=path, prefix='.' + file_name, suffix='.tmp')
+  os.close(descriptor)
 
-def perform_experiment(parameters: ExperimentParameters, optimize_fun: Callable, path: str, prefix: str) -> None:
+  try:
+    solution.save_to(temporary_file_name)
+    os.replace(temporary_file_name, os.path.join(path, file_name))
+
+  finally:
+    if os.path.exists(temporary_file_name):
+      os.remove(temporary_file_name)
+
+def result_exists(parameters: ExperimentParameters, path: str, prefix: str) -> bool:
+  '''
+  checks whether the result of an experiment already exists with matching parameters
+
+  :parameters: the parameters for the single experiment
+  :path: the path where the result is stored
+  :prefix: the name prefix for the result file
+  '''
+  file_name: str = os.path.join(path, parameters.to_file_name(prefix))
+
+  if not os.path.exists(file_name):
+    return False
+
+  try:
+    with open(file_name, 'r') as file:
+      return json.load(file)['ucp']['parameters'] == asdict(parameters)
+
+  except (ValueError, KeyError, TypeError):
+    return False
+
+def perform_experiment(parameters: ExperimentParameters, optimize_fun: Callable, path: str, prefix: str,
+                       trace_memory: bool = False) -> None:
   '''
   runs an experiment for a specific number of loads and plants
 
@@ -41,17 +84,50 @@ def perform_experiment(parameters: ExperimentParameters, optimize_fun: Callable,
   :optimize_fun: the function that specifies how the UCP is optimized
   :path: the path where the result will be stored
   :prefix: the name prefix for the result file
+  :trace_memory: whether the memory allocated by Python is traced (slows down the experiment)
   '''
   debug_msg_time(
     'Experiment: {:3} loads, {:3} plants'
     .format(parameters.num_loads, parameters.num_plants)
   )
 
-  # generate the UCP with the specified parameters (num loads, plants)
-  ucp: UCP = build_ucp(parameters)
+  timings: Timings = Timings()
+  memory: MemoryUsage = MemoryUsage()
+
+  started_tracing: bool = trace_memory and not tracemalloc.is_tracing()
+  if started_tracing:
+    tracemalloc.start()
+
+  # the phases are only profiled if the environment variable UCP_PROFILE is set
+  profiled_phases: Optional[Set[str]] = get_profiled_phases()
+  profiler: Optional[PhaseProfiler] = start_profiling(profiled_phases) if profiled_phases is not None else None
+
+  try:
+    # generate the UCP with the specified parameters (num loads, plants)
+    with timings.phase('load_data'), memory.phase('load_data'):
+      load_data()
+    with timings.phase('build_ucp'), memory.phase('build_ucp'):
+      ucp: UCP = build_ucp(parameters)
+
+    # run the experiment as specified by optimization_fun (passed from the calling script)
+    with timings.phase('optimize'), memory.phase('optimize'):
+      solution = optimize_fun(ucp)
 
-  # run the experiment as specified by optimization_fun (passed from the calling script)
-  solution = optimize_fun(ucp)
+  finally:
+    if started_tracing:
+      tracemalloc.stop()
+    if profiler is not None:
+      stop_profiling()
+
+  # the profile is stored next to the result
+  if profiler is not None:
+    if not os.path.exists(path):
+      os.makedirs(path, exist_ok=True)
+    profiler.dump(os.path.join(path, os.path.splitext(parameters.to_file_name(prefix))[0] + PROFILE_EXTENSION))
+
+  # the phases of the encoder are kept next to the phases of the experiment
+  solution.timings = {**solution.timings, **timings.to_dict()}
+  solution.metrics = {**solution.metrics, 'memory': memory.to_dict()}
 
   # write the solution of the experiment
   write_solution(solution, parameters, path, prefix)
@@ -61,9 +137,19 @@ def perform_experiment(parameters: ExperimentParameters, optimize_fun: Callable,
     .format(solution.time)
   )
 
+def perform_experiment_job(arguments: Tuple[ExperimentParameters, Callable, str, str, bool]) -> ExperimentParameters:
+  '''
+  runs an experiment in a worker process
+
+  :arguments: arguments of perform_experiment
+  '''
+  perform_experiment(*arguments)
+  return arguments[0]
+
 def perform_experiments(num_loads_start: int, num_loads_end: int, num_loads_step, \
                         num_plants_start: int, num_plants_end: int, num_plants_step, \
-                        optimize_fun: Callable, path: str, prefix: str) -> None:
+                        optimize_fun: Callable, path: str, prefix: str, jobs: int = 1, overwrite: bool = False,
+                        trace_memory: bool = False, profile_top: int = 30) -> None:
   '''
   runs experiments for the specified ranges of numbers of loads and numbers of plants
 
@@ -76,12 +162,60 @@ def perform_experiments(num_loads_start: int, num_loads_end: int, num_loads_step
   :optimize_fun: the function that specifies how the UCP is optimized
   :path: the path where the results will be stored
   :prefix: the name prefix for the result files
+  :jobs: number of processes the experiments are distributed over
+  :overwrite: whether experiments with existing results are performed again
+  :trace_memory: whether the memory allocated by Python is traced (slows down the experiments)
+  :profile_top: number of functions in the summary of the profiles (if the phases are profiled)
   '''
+  parameters_list: List[ExperimentParameters] = []
+
   for num_plants in range(num_plants_start, num_plants_end + 1, num_plants_step):
     for num_loads in range(num_loads_start, num_loads_end + 1, num_loads_step):
 
       parameters = ExperimentParameters(num_loads, num_plants)
-      perform_experiment(parameters, optimize_fun, path, prefix)
+
+      if not overwrite and result_exists(parameters, path, prefix):
+        debug_msg_time('Skipping experiment: {:3} loads, {:3} plants (result exists)'.format(num_loads, num_plants))
+        continue
+
+      parameters_list.append(parameters)
+
+  if jobs <= 1:
+    for parameters in parameters_list:
+      perform_experiment(parameters, optimize_fun, path, prefix, trace_memory)
+
+  else:
+    perform_experiments_in_parallel(parameters_list, optimize_fun, path, prefix, jobs, trace_memory)
+
+  # the profiles of all experiments with the prefix are summarized
+  if get_profiled_phases() is not None:
+    summary_file_name: Optional[str] = write_profile_summary(path, prefix, profile_top)
+    if summary_file_name:
+      debug_msg_time('Profile summary: {}'.format(summary_file_name))
+
+def perform_experiments_in_parallel(parameters_list: List[ExperimentParameters], optimize_fun: Callable,
+                                    path: str, prefix: str, jobs: int, trace_memory: bool) -> None:
+  '''
+  runs experiments in several processes
+
+  :parameters_list: the parameters of the experiments
+  :optimize_fun: the function that specifies how the UCP is optimized
+  :path: the path where the results will be stored
+  :prefix: the name prefix for the result files
+  :jobs: number of processes the experiments are distributed over
+  :trace_memory: whether the memory allocated by Python is traced (slows down the experiments)
+  '''
+  # the largest experiments are started first, so that they do not delay the end of the run
+  parameters_list.sort(key=lambda parameters: parameters.num_loads * parameters.num_plants, reverse=True)
+
+  # the workers inherit the input data that is loaded before they are forked
+  load_data()
+
+  with Pool(jobs) as pool:
+    for parameters in pool.imap_unordered(
+      perform_experiment_job, [(parameters, optimize_fun, path, prefix, trace_memory) for parameters in parameters_list], chunksize=1
+    ):
+      debug_msg_time('Finished experiment: {:3} loads, {:3} plants'.format(parameters.num_loads, parameters.num_plants))
 
 def experiments_main(optimize_fun: Callable, path: str, prefix: str, *argv) -> None:
   '''
@@ -105,8 +239,23 @@ def experiments_main(optimize_fun: Callable, path: str, prefix: str, *argv) -> N
   parser.add_argument('-up', '--upper-plants', help='Upper bound of number of plants.', type=int, default=20)
   parser.add_argument('-sp', '--step-plants', help='Step size of range of numbers of plants.', type=int, default=2)
 
+  parser.add_argument('-j', '--jobs', help='Number of processes the experiments are distributed over.', type=int, default=1)
+  parser.add_argument('--overwrite', help='Perform experiments again whose results already exist.', action='store_true')
+  parser.add_argument('--model-cache', help='Directory of the cache of encoded models (QUBOs and DQMs).', type=str)
+  parser.add_argument('--trace-memory', help='Trace the memory allocated by Python in every phase (slows down the experiments).',
+                      action='store_true')
+  parser.add_argument('--profile', help='Profile phases of the experiments with cProfile (comma-separated or all, ' +
+                      'default: {}). Sets ${}.'.format(DEFAULT_PHASES, PROFILE_VARIABLE), nargs='?', const=DEFAULT_PHASES, type=str)
+  parser.add_argument('--profile-top', help='Number of functions in the summary of the profiles.', type=int, default=30)
+
   args = parser.parse_args(argv)
 
+  # the encoders (and the worker processes) find the cache through the environment
+  if args.model_cache:
+    os.environ[CACHE_DIRECTORY_VARIABLE] = args.model_cache
+  if args.profile:
+    os.environ[PROFILE_VARIABLE] = args.profile
+
   num_loads_start: int = args.lower_loads
   num_loads_end: int = args.upper_loads
   num_loads_step: int = args.step_loads
@@ -121,4 +270,5 @@ def experiments_main(optimize_fun: Callable, path: str, prefix: str, *argv) -> N
 
   perform_experiments(num_loads_start, num_loads_end, num_loads_step, \
                       num_plants_start, num_plants_end, num_plants_step, \
-                      optimize_fun, path, prefix)
+                      optimize_fun, path, prefix, args.jobs, args.overwrite, args.trace_memory,
+                      args.profile_top)
@@ -0,0 +1,231 @@
+#!/bin/python
+# version 3.8 required
+
+import argparse
+import hashlib
+import json
+import os
+import tempfile
+from typing import Any, Dict, List, Optional, Tuple
+import numpy as np # type: ignore
+
+from UCP.ucp_arrays import PLANT_COEFFICIENTS, UCPArrays
+from Util.logging import debug_msg
+
+'''
+this file holds the on-disk cache of encoded models (for example the components of QUBOs and DQMs)
+the entries are addressed by a hash of the content of the UCP, the encoder and its settings
+and stored as compressed .npz files, the least recently used entries are removed when the cache exceeds its size limit
+'''
+
+# environment variable holding the directory of the cache that is used by default
+CACHE_DIRECTORY_VARIABLE: str = 'UCP_MODEL_CACHE'
+
+# version of the format of the entries, entries of other versions are never hit
+CACHE_VERSION: int = 1
+
+
+def get_ucp_hash(ucp: Any) -> str:
+  '''
+  returns a hash of the content of an UCP (experiment parameters, loads and plants)
+
+  :ucp: UCP instance
+  '''
+  arrays: UCPArrays = ucp.to_arrays()
+  content = hashlib.sha256(json.dumps(arrays.parameters, sort_keys=True).encode())
+
+  content.update(arrays.loads.tobytes())
+  for name in PLANT_COEFFICIENTS + ('initially_on',):
+    content.update(getattr(arrays.plants, name).tobytes())
+
+  return content.hexdigest()
+
+
+class ModelCache(object):
+  '''
+  handles a directory of cached encoded models
+  '''
+  directory: str
+  max_size: int # maximum total size of the entries in bytes
+  hits: int
+  misses: int
+
+  def __init__(self, directory: str, max_size: int = 2 ** 30) -> None:
+    '''
+    opens (and creates) a cache directory
+
+    :directory: directory of the entries
+    :max_size: maximum total size of the entries in bytes, default: 1 GiB
+    '''
+    self.directory = directory
+    self.max_size = max_size
+    self.hits = 0
+    self.misses = 0
+
+    os.makedirs(directory, exist_ok=True)
+
+  @staticmethod
+  def get_default() -> Optional['ModelCache']:
+    '''
+    returns the cache in the directory given by the environment variable UCP_MODEL_CACHE (None if it is not set)
+    '''
+    directory: Optional[str] = os.environ.get(CACHE_DIRECTORY_VARIABLE)
+
+    return ModelCache(directory) if directory else None
+
+  @staticmethod
+  def get_key(ucp: Any, encoder: str, **settings: Any) -> str:
+    '''
+    returns the key of the model of an UCP
+
+    :ucp: UCP instance
+    :encoder: name of the encoder, for example qubo or dqm
+    :settings: settings of the encoder that change the model, for example max_h
+    '''
+    description: Dict[str, Any] = {
+      'version': CACHE_VERSION, 'ucp': get_ucp_hash(ucp), 'encoder': encoder, 'settings': settings
+    }
+
+    return hashlib.sha256(json.dumps(description, sort_keys=True).encode()).hexdigest()
+
+  def get_file_name(self, key: str) -> str:
+    return os.path.join(self.directory, key + '.npz')
+
+  def load(self, key: str) -> Optional[Dict[str, np.ndarray]]:
+    '''
+    returns the arrays of an entry (None if there is no entry)
+    the modification time of the entry is updated to mark it as recently used
+
+    :key: key of the entry
+    '''
+    file_name: str = self.get_file_name(key)
+
+    try:
+      with np.load(file_name) as data:
+        arrays: Dict[str, np.ndarray] = {name: data[name] for name in data.files}
+
+      os.utime(file_name)
+
+    except (OSError, ValueError):
+      self.misses += 1
+      return None
+
+    self.hits += 1
+    return arrays
+
+  def store(self, key: str, arrays: Dict[str, np.ndarray]) -> None:
+    '''
+    stores the arrays of an entry and removes the least recently used entries if the cache is too large
+
+    :key: key of the entry
+    :arrays: arrays by name
+    '''
+    # the entry is written to a temporary file first, so that other processes never read a partial entry
+    descriptor, temporary_file_name = tempfile.mkstemp(dir=self.directory, prefix='.' + key, suffix='.tmp')
+
+    try:
+      with os.fdopen(descriptor, 'wb') as file:
+        np.savez_compressed(file, **arrays)
+
+      os.replace(temporary_file_name, self.get_file_name(key))
+
+    finally:
+      if os.path.exists(temporary_file_name):
+        os.remove(temporary_file_name)
+
+    self.evict()
+
+  def get_entries(self) -> List[Tuple[str, int, float]]:
+    '''
+    returns the key, size in bytes and time of the last use of every entry ordered from the least recently used
+    '''
+    entries: List[Tuple[str, int, float]] = []
+
+    for file_name in os.listdir(self.directory):
+      if file_name.endswith('.npz'):
+        try:
+          status: os.stat_result = os.stat(os.path.join(self.directory, file_name))
+        except OSError:
+          continue
+
+        entries.append((file_name[:-len('.npz')], status.st_size, status.st_mtime))
+
+    return sorted(entries, key=lambda entry: entry[2])
+
+  def get_size(self) -> int:
+    '''
+    returns the total size of the entries in bytes
+    '''
+    return sum(size for _, size, _ in self.get_entries())
+
+  def remove(self, key: str) -> None:
+    '''
+    removes an entry
+
+    :key: key of the entry
+    '''
+    try:
+      os.remove(self.get_file_name(key))
+    except FileNotFoundError:
+      pass
+
+  def evict(self) -> None:
+    '''
+    removes the least recently used entries until the cache does not exceed its size limit
+    '''
+    entries: List[Tuple[str, int, float]] = self.get_entries()
+    size: int = sum(size for _, size, _ in entries)
+
+    for key, entry_size, _ in entries:
+      if size <= self.max_size:
+        break
+
+      self.remove(key)
+      size -= entry_size
+
+  def clear(self) -> None:
+    '''
+    removes all entries
+    '''
+    for key, _, _ in self.get_entries():
+      self.remove(key)
+
+  def get_statistics(self) -> Dict[str, int]:
+    '''
+    returns the numbers of hits and misses of this process
+    '''
+    return {'hits': self.hits, 'misses': self.misses}
+
+
+if __name__ == "__main__":
+  '''
+  lists, limits or clears the entries of a cache directory
+  '''
+  parser: argparse.ArgumentParser = argparse.ArgumentParser(description='Inspect and clear the cache of encoded models.')
+
+  parser.add_argument('-d', '--directory', help='Directory of the cache, default: ${}.'.format(CACHE_DIRECTORY_VARIABLE),
+                      type=str, default=os.environ.get(CACHE_DIRECTORY_VARIABLE))
+  parser.add_argument('-l', '--list', help='List the entries from the least recently used.', action='store_true')
+  parser.add_argument('-e', '--evict', help='Remove the least recently used entries above the size limit (MiB).', type=float)
+  parser.add_argument('-c', '--clear', help='Remove all entries.', action='store_true')
+
+  args = parser.parse_args()
+
+  if not args.directory:
+    parser.error('Please provide the directory of the cache')
+
+  cache: ModelCache = ModelCache(args.directory)
+
+  if args.clear:
+    cache.clear()
+
+  elif args.evict is not None:
+    cache.max_size = int(args.evict * 2 ** 20)
+    cache.evict()
+
+  if args.list:
+    for key, size, last_use in cache.get_entries():
+      debug_msg('{}  {:10.3f} MiB  {}'.format(key, size / 2 ** 20, np.datetime64(int(last_use), 's')))
+
+  entries: List[Tuple[str, int, float]] = cache.get_entries()
+  debug_msg('{} entries, {:.3f} MiB'.format(len(entries), sum(size for _, size, _ in entries) / 2 ** 20))
@@ -0,0 +1,59 @@
+#!/bin/python
+# version 3.8 required
+
+from dataclasses import dataclass
+from typing import Iterable
+import numpy as np # type: ignore
+
+'''
+this file holds the statistics of the size of encoded models
+all encoders report the same statistics, so that the sizes of their models can be compared in scaling studies
+'''
+
+
+@dataclass
+class ModelStatistics(object):
+  '''
+  holds the size of an encoded model
+  for QUBOs and DQMs the couplers are the non-zero quadratic biases between different (binary) variables,
+  for mathematical programs they are the non-zero coefficients of the constraints
+  '''
+  variables: int # number of (binary) variables
+  couplers: int
+  density: float # fraction of the possible couplers that are non-zero
+  bytes: int # memory of the arrays of the model held by the encoder (-1 if it is not known)
+  constraints: int = 0 # number of constraints (0 for unconstrained models)
+
+  @staticmethod
+  def from_quadratic(variables: int, couplers: int, bytes: int):
+    '''
+    returns the statistics of an unconstrained quadratic model (QUBO or DQM)
+
+    :variables: number of binary variables (number of cases for DQMs)
+    :couplers: number of non-zero quadratic biases between different variables
+    :bytes: memory of the arrays of the model in bytes
+    '''
+    possible: int = variables * (variables - 1) // 2
+    return ModelStatistics(variables, couplers, couplers / possible if possible > 0 else 0., bytes)
+
+  @staticmethod
+  def from_constraints(variables: int, constraints: int, nonzeros: int, bytes: int = -1):
+    '''
+    returns the statistics of a mathematical program
+
+    :variables: number of variables
+    :constraints: number of constraints
+    :nonzeros: number of non-zero coefficients of the constraints
+    :bytes: memory of the model in bytes (-1 if it is not known)
+    '''
+    possible: int = variables * constraints
+    return ModelStatistics(variables, nonzeros, nonzeros / possible if possible > 0 else 0., bytes, constraints)
+
+
+def get_nbytes(arrays: Iterable[np.ndarray]) -> int:
+  '''
+  returns the total memory of arrays in bytes
+
+  :arrays: numpy arrays
+  '''
+  return int(sum(np.asarray(array).nbytes for array in arrays))
@@ -0,0 +1,53 @@
+#!/bin/python
+# version 3.8 required
+
+import numpy as np # type: ignore
+from numpy.testing import assert_allclose # type: ignore
+import unittest
+
+from Data.build_ucp import build_random_ucp
+from UCP.dispatch_cache import DispatchCostCache
+from UCP.ucp_arrays import UCPArrays
+from UCP.unit_commitment_problem import UCP
+
+
+class TestDispatchCostCache(unittest.TestCase):
+  '''
+  tests the cached dispatch curves against the direct economic dispatch
+  '''
+
+  def test_dispatch(self):
+    rng: np.random.Generator = np.random.default_rng(0)
+
+    for _ in range(20):
+      ucp: UCPArrays = UCPArrays.from_ucp(build_random_ucp(rng, int(rng.integers(1, 6)), 8, linear=True, min_up_down=False, initially_on=False))
+      u: np.ndarray = rng.random((10, len(ucp.plants), 8)) < 0.6
+      p: np.ndarray = rng.uniform(0, 60, size=u.shape) * u
+
+      expected: np.ndarray = ucp.dispatch(u, p)
+      ucp.enable_dispatch_cache()
+
+      assert_allclose(ucp.dispatch(u, p), expected, atol=1e-8)
+      assert_allclose(ucp.dispatch_cache.get_costs(ucp.loads, u),
+                      np.sum(np.where(u, ucp.plants.column('A') + ucp.plants.column('B') * expected
+                                         + ucp.plants.column('C') * expected ** 2, 0), axis=-2), atol=1e-7)
+
+  def test_calculate_o(self):
+    rng: np.random.Generator = np.random.default_rng(1)
+    ucp: UCP = build_random_ucp(rng, 4, 6, linear=True, min_up_down=False, initially_on=False)
+    u: np.ndarray = rng.random((4, 6)) < 0.6
+
+    self.assertAlmostEqual(ucp.calculate_o(u.tolist()), ucp.calculate_o(u.tolist(), ucp.to_arrays().dispatch(u).tolist()))
+
+  def test_lru(self):
+    cache: DispatchCostCache = DispatchCostCache(np.ones(3), np.ones(3), np.ones(3), np.full(3, 10.), np.full(3, 20.), max_size=2)
+    a, b, c = np.array([True, False, False]), np.array([False, True, False]), np.array([False, False, True])
+
+    for committed in (a, b, a, c, a, b):
+      cache.get_curve(committed)
+
+    # b is evicted by c and computed again
+    self.assertEqual(cache.get_statistics(), {'hits': 2, 'misses': 4, 'hit_rate': 2 / 6, 'size': 2})
+
+if __name__ == '__main__':
+  unittest.main()
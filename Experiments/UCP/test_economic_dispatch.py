@@ -0,0 +1,84 @@
+#!/bin/python
+# version 3.8 required
+
+import numpy as np # type: ignore
+from numpy.testing import assert_allclose # type: ignore
+import unittest
+
+from Data.build_ucp import build_random_ucp
+from UCP.ucp_arrays import UCPArrays
+from UCP.unit_commitment_problem import CombustionPlant, ExperimentParameters, UCP
+
+
+class TestEconomicDispatch(unittest.TestCase):
+  '''
+  tests the cost-optimal adjustment of the power outputs
+  '''
+
+  def assertOptimal(self, ucp: UCPArrays, u: np.ndarray, p: np.ndarray) -> None:
+    # committed plants meet the demand if possible and the marginal costs of plants between their limits are equal
+    plants = ucp.plants
+    lower: np.ndarray = np.where(u, plants.column('Pmin'), 0)
+    upper: np.ndarray = np.where(u, plants.column('Pmax'), 0)
+    tolerance: float = 1e-7
+
+    self.assertTrue(np.all((p >= lower - tolerance) & (p <= upper + tolerance)))
+    assert_allclose(np.sum(p, axis=-2), np.clip(ucp.loads, np.sum(lower, axis=-2), np.sum(upper, axis=-2)))
+
+    marginal: np.ndarray = plants.column('B') + 2 * plants.column('C') * p
+    can_increase: np.ndarray = u & (p < upper - tolerance)
+    can_decrease: np.ndarray = u & (p > lower + tolerance)
+    cheapest_increase: np.ndarray = np.min(np.where(can_increase, marginal, np.inf), axis=-2)
+    costliest_decrease: np.ndarray = np.max(np.where(can_decrease, marginal, -np.inf), axis=-2)
+
+    self.assertTrue(np.all(costliest_decrease <= cheapest_increase + 1e-6))
+
+  def test_quadratic(self):
+    rng: np.random.Generator = np.random.default_rng(0)
+
+    for _ in range(20):
+      ucp: UCPArrays = build_random_ucp(rng, int(rng.integers(1, 8)), 6, min_up_down=False, initially_on=False).to_arrays()
+      u: np.ndarray = rng.random((10, len(ucp.plants), 6)) < 0.7
+
+      self.assertOptimal(ucp, u, ucp.dispatch(u))
+
+  def test_linear(self):
+    rng: np.random.Generator = np.random.default_rng(1)
+
+    for _ in range(20):
+      ucp: UCPArrays = build_random_ucp(rng, int(rng.integers(1, 8)), 6, linear=True, min_up_down=False, initially_on=False).to_arrays()
+      u: np.ndarray = rng.random((10, len(ucp.plants), 6)) < 0.7
+      p: np.ndarray = rng.uniform(0, 60, size=u.shape) * u
+
+      self.assertOptimal(ucp, u, ucp.dispatch(u, p))
+
+  def test_single_solution(self):
+    rng: np.random.Generator = np.random.default_rng(2)
+    ucp: UCPArrays = build_random_ucp(rng, 5, 8, min_up_down=False, initially_on=False).to_arrays()
+    u: np.ndarray = rng.random((3, 5, 8)) < 0.7
+
+    assert_allclose(ucp.dispatch(u), [ucp.dispatch(u_s) for u_s in u])
+
+  def test_ties(self):
+    # plants with equal linear costs keep the distribution of the power outputs as far as possible
+    ucp: UCPArrays = UCP(ExperimentParameters(2, 3), [60, 95], [
+      CombustionPlant(0, 1, 0, 10, 30, 0, 0),
+      CombustionPlant(0, 1, 0, 10, 70, 0, 0),
+      CombustionPlant(0, 2, 0, 10, 30, 0, 0)
+    ]).to_arrays()
+
+    u: np.ndarray = np.array([[True, True], [True, True], [True, True]])
+    p: np.ndarray = np.array([[20, 20], [40, 40], [10, 10]], dtype=float)
+
+    assert_allclose(ucp.dispatch(u, p), [[15, 30], [35, 55], [10, 10]])
+
+  def test_uncommitted(self):
+    ucp: UCPArrays = UCP(ExperimentParameters(1, 2), [40], [
+      CombustionPlant(0, 1, 0.1, 10, 30, 0, 0),
+      CombustionPlant(0, 1, 0.1, 10, 30, 0, 0)
+    ]).to_arrays()
+
+    assert_allclose(ucp.dispatch(np.array([[True], [False]]), np.array([[20.], [0.]])), [[30], [0]])
+
+if __name__ == '__main__':
+  unittest.main()
@@ -0,0 +1,117 @@
+#!/bin/python
+# version 3.8 required
+
+import os
+import shutil
+import tempfile
+from typing import List
+import unittest
+
+from UCP.experiment_results import ExperimentResults
+from UCP.experiments import perform_experiments, result_exists, write_solution
+from UCP.unit_commitment_problem import ExperimentParameters, UCP, UCPSolution
+from Util import profiling
+
+
+optimized: List[ExperimentParameters] = []
+
+def optimize_nothing(ucp: UCP) -> UCPSolution:
+  '''
+  returns a solution that commits no plant
+
+  :ucp: UCP instance
+  '''
+  optimized.append(ucp.parameters)
+
+  num_plants, num_loads = len(ucp.plants), len(ucp.loads)
+  return UCPSolution(ucp, 0, False, 0, [[False] * num_loads] * num_plants, [[0.] * num_loads] * num_plants)
+
+
+class TestExperiments(unittest.TestCase):
+  '''
+  tests the experiment runner
+  '''
+
+  def setUp(self) -> None:
+    self.path: str = tempfile.mkdtemp()
+    optimized.clear()
+
+  def tearDown(self) -> None:
+    shutil.rmtree(self.path)
+
+  def get_file_names(self) -> List[str]:
+    return sorted(os.listdir(self.path))
+
+  def test_write_solution(self):
+    parameters: ExperimentParameters = ExperimentParameters(2, 1)
+    write_solution(optimize_nothing(UCP(parameters, [1, 2], [])), parameters, self.path, 'test')
+
+    self.assertEqual(self.get_file_names(), ['test_002_001.json'])
+    self.assertTrue(result_exists(parameters, self.path, 'test'))
+    self.assertFalse(result_exists(ExperimentParameters(2, 1, 5), self.path, 'test'))
+    self.assertFalse(result_exists(ExperimentParameters(4, 1), self.path, 'test'))
+
+  def test_partial_result(self):
+    with open(os.path.join(self.path, 'test_002_001.json'), 'w') as file:
+      file.write('{"ucp": {"param')
+
+    self.assertFalse(result_exists(ExperimentParameters(2, 1), self.path, 'test'))
+
+  def test_skip_existing(self):
+    perform_experiments(2, 4, 2, 1, 1, 1, optimize_nothing, self.path, 'test')
+    self.assertEqual(len(optimized), 2)
+
+    perform_experiments(2, 6, 2, 1, 1, 1, optimize_nothing, self.path, 'test')
+    self.assertEqual(optimized[2:], [ExperimentParameters(6, 1)])
+
+    perform_experiments(2, 6, 2, 1, 1, 1, optimize_nothing, self.path, 'test', overwrite=True)
+    self.assertEqual(len(optimized), 6)
+
+  def test_timings(self):
+    perform_experiments(2, 2, 1, 1, 1, 1, optimize_nothing, self.path, 'test')
+    solution: UCPSolution = UCPSolution.load_from(os.path.join(self.path, 'test_002_001.json'))
+
+    self.assertEqual(set(solution.timings), {'load_data', 'build_ucp', 'optimize'})
+    for timing in solution.timings.values():
+      self.assertEqual(set(timing), {'wall', 'cpu'})
+      self.assertGreaterEqual(timing['wall'], 0)
+
+  def test_memory(self):
+    perform_experiments(2, 2, 1, 1, 1, 1, optimize_nothing, self.path, 'test', trace_memory=True)
+    solution: UCPSolution = UCPSolution.load_from(os.path.join(self.path, 'test_002_001.json'))
+
+    self.assertEqual(set(solution.metrics['memory']), {'load_data', 'build_ucp', 'optimize'})
+    for memory in solution.metrics['memory'].values():
+      self.assertEqual(set(memory), {'peak_rss', 'traced', 'traced_peak'})
+      self.assertGreaterEqual(memory['traced_peak'], 0)
+
+  def test_profiles(self):
+    os.environ[profiling.PROFILE_VARIABLE] = 'all'
+
+    try:
+      perform_experiments(2, 4, 2, 1, 1, 1, optimize_nothing, self.path, 'test')
+    finally:
+      del os.environ[profiling.PROFILE_VARIABLE]
+
+    self.assertIsNone(profiling.active)
+    self.assertEqual(self.get_file_names(), [
+      'test_002_001.json', 'test_002_001.prof', 'test_004_001.json', 'test_004_001.prof', 'test_profile_summary.txt'
+    ])
+    with open(os.path.join(self.path, 'test_profile_summary.txt'), 'r') as file:
+      self.assertIn('optimize_nothing', file.read())
+
+    # the profiles are not read as results
+    self.assertEqual(len(ExperimentResults(self.path, 'test').get_experiments(1)), 2)
+
+  def test_jobs(self):
+    perform_experiments(2, 6, 2, 1, 2, 1, optimize_nothing, self.path, 'test', jobs=2)
+
+    self.assertEqual(self.get_file_names(), [
+      'test_{:03}_{:03}.json'.format(num_loads, num_plants) for num_loads in (2, 4, 6) for num_plants in (1, 2)
+    ])
+    for file_name in self.get_file_names():
+      solution: UCPSolution = UCPSolution.load_from(os.path.join(self.path, file_name))
+      self.assertEqual(solution.ucp.parameters, ExperimentParameters.from_file_name(file_name))
+
+if __name__ == '__main__':
+  unittest.main()
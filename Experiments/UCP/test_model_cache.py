@@ -0,0 +1,89 @@
+#!/bin/python
+# version 3.8 required
+
+import os
+import shutil
+import tempfile
+import unittest
+import numpy as np # type: ignore
+from numpy.testing import assert_array_equal # type: ignore
+
+from Annealing_DQM.dqm import UCP_DQM
+from Annealing_QUBO.qubo import UCP_QUBO
+from UCP.model_cache import ModelCache
+from UCP.unit_commitment_problem import CombustionPlant, ExperimentParameters, UCP
+
+
+class TestModelCache(unittest.TestCase):
+  '''
+  tests the on-disk cache of encoded models
+  '''
+
+  def setUp(self) -> None:
+    self.directory: str = tempfile.mkdtemp()
+    self.cache: ModelCache = ModelCache(self.directory)
+    self.ucp: UCP = UCP(ExperimentParameters(3, 2), [30, 50, 20], [
+      CombustionPlant(5, 1, 0.1, 5, 40, 10, 5),
+      CombustionPlant(10, 2, 0, 10, 30, 20, 10, True)
+    ])
+
+  def tearDown(self) -> None:
+    shutil.rmtree(self.directory)
+
+  def test_store_load(self):
+    arrays = {'a': np.arange(5), 'b': np.eye(2)}
+    self.cache.store('key', arrays)
+    loaded = self.cache.load('key')
+
+    self.assertEqual(set(loaded), {'a', 'b'})
+    assert_array_equal(loaded['b'], arrays['b'])
+    self.assertIsNone(self.cache.load('missing'))
+    self.assertEqual(self.cache.get_statistics(), {'hits': 1, 'misses': 1})
+
+  def test_eviction(self):
+    for key in ('first', 'second', 'third'):
+      self.cache.store(key, {'a': np.zeros(1000)})
+    os.utime(self.cache.get_file_name('first'), (0, 0))
+    os.utime(self.cache.get_file_name('second'), (0, 1))
+
+    self.cache.max_size = 2 * os.path.getsize(self.cache.get_file_name('third'))
+    self.cache.evict()
+    self.assertEqual([key for key, _, _ in self.cache.get_entries()], ['second', 'third'])
+
+    self.cache.clear()
+    self.assertEqual(self.cache.get_size(), 0)
+
+  def test_key(self):
+    key: str = ModelCache.get_key(self.ucp, 'qubo', max_h=10)
+
+    self.assertEqual(key, ModelCache.get_key(UCP(self.ucp.parameters, list(self.ucp.loads), self.ucp.plants), 'qubo', max_h=10))
+    self.assertNotEqual(key, ModelCache.get_key(self.ucp, 'dqm', max_h=10))
+    self.assertNotEqual(key, ModelCache.get_key(self.ucp, 'qubo', max_h=5))
+    self.assertNotEqual(key, ModelCache.get_key(UCP(self.ucp.parameters, [30, 50, 21], self.ucp.plants), 'qubo', max_h=10))
+
+  def test_qubo(self):
+    expected: UCP_QUBO = UCP_QUBO(self.ucp, y_d=3)
+
+    UCP_QUBO(self.ucp, cache=self.cache)
+    qubo: UCP_QUBO = UCP_QUBO(self.ucp, y_d=3, cache=self.cache)
+
+    self.assertEqual(self.cache.get_statistics(), {'hits': 1, 'misses': 1})
+    for actual_array, expected_array in zip(qubo.biases.to_coo(), expected.biases.to_coo()):
+      assert_array_equal(actual_array, expected_array)
+
+  def test_dqm(self):
+    expected: UCP_DQM = UCP_DQM(self.ucp, y_s=2)
+
+    UCP_DQM(self.ucp, cache=self.cache)
+    dqm: UCP_DQM = UCP_DQM(self.ucp, y_s=2, cache=self.cache)
+
+    self.assertEqual(self.cache.get_statistics(), {'hits': 1, 'misses': 1})
+    for actual_array, expected_array in zip(dqm.model.to_numpy_vectors(), expected.model.to_numpy_vectors()):
+      if isinstance(actual_array, tuple):
+        for actual, expected_part in zip(actual_array, expected_array):
+          assert_array_equal(actual, expected_part)
+      else:
+        assert_array_equal(actual_array, expected_array)
+
+if __name__ == '__main__':
+  unittest.main()
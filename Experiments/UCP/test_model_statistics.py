@@ -0,0 +1,64 @@
+#!/bin/python
+# version 3.8 required
+
+import unittest
+
+from Annealing_DQM.dqm import UCP_DQM
+from Annealing_QUBO.qubo import UCP_QUBO
+from Classical.minlp import UCP_MINLP, get_milp_solver, solver_available
+from UCP.model_statistics import ModelStatistics
+from UCP.unit_commitment_problem import CombustionPlant, ExperimentParameters, UCP
+
+
+class TestModelStatistics(unittest.TestCase):
+  '''
+  tests the statistics of the size of the encoded models
+  '''
+
+  def setUp(self) -> None:
+    self.ucp: UCP = UCP(ExperimentParameters(3, 2), [30, 50, 20], [
+      CombustionPlant(5, 1, 0.1, 5, 40, 10, 5),
+      CombustionPlant(10, 2, 0, 10, 30, 20, 10, True)
+    ])
+
+  def test_density(self):
+    self.assertEqual(ModelStatistics.from_quadratic(4, 3, 100), ModelStatistics(4, 3, 0.5, 100))
+    self.assertEqual(ModelStatistics.from_quadratic(1, 0, 0).density, 0)
+    self.assertEqual(ModelStatistics.from_constraints(4, 2, 2), ModelStatistics(4, 2, 0.25, -1, 2))
+
+  def test_qubo(self):
+    qubo: UCP_QUBO = UCP_QUBO(self.ucp)
+    statistics: ModelStatistics = qubo.get_statistics()
+
+    couplers: int = sum(1 for (i, j), value in qubo.model.items() if i != j and value != 0)
+    self.assertEqual(statistics.variables, qubo.biases.num_variables)
+    self.assertEqual(statistics.couplers, couplers)
+    self.assertGreater(statistics.bytes, 0)
+    self.assertGreater(statistics.density, 0)
+    self.assertLessEqual(statistics.density, 1)
+
+  def test_dqm(self):
+    dqm: UCP_DQM = UCP_DQM(self.ucp)
+    statistics: ModelStatistics = dqm.get_statistics()
+
+    self.assertEqual(statistics.variables, dqm.model.num_cases())
+    self.assertEqual(statistics.couplers, dqm.model.num_case_interactions())
+    self.assertGreater(statistics.bytes, 0)
+
+  def test_minlp(self):
+    statistics: ModelStatistics = UCP_MINLP(self.ucp, 'miqp').get_statistics()
+
+    # u, p, v and w of every plant at every time
+    self.assertEqual(statistics.variables, 4 * 2 * 3)
+    # 2 startup, 2 power and 1 load constraints at every time (for every plant)
+    self.assertEqual(statistics.constraints, 3 * (2 * 2 + 2 * 2 + 1))
+    self.assertEqual(statistics.bytes, -1)
+
+  @unittest.skipUnless(solver_available(get_milp_solver() or ''), 'No MILP solver is available')
+  def test_solution(self):
+    metrics = UCP_MINLP(self.ucp, 'milp').optimize(get_milp_solver()).metrics
+
+    self.assertEqual(set(metrics['model']), {'variables', 'couplers', 'density', 'bytes', 'constraints'})
+
+if __name__ == '__main__':
+  unittest.main()
@@ -3,10 +3,12 @@
 
 import json
 import os
-from dataclasses import asdict
+import numpy as np # type: ignore
+from numpy.testing import assert_allclose, assert_array_equal # type: ignore
 import unittest
 
-from UCP.unit_commitment_problem import CombustionPlant, ExperimentParameters, UCP
+from UCP.unit_commitment_problem import CombustionPlant, ExperimentParameters, UCP, UCPSolution
+from Util.json_file_handler import convert_dataclass_to_dict
 
 
 class TestUCP(unittest.TestCase):
@@ -19,7 +21,7 @@ class TestUCP(unittest.TestCase):
       CombustionPlant(2, 2, 2, 0, 200, 1, 1)
   ])
 
-  ucp_dict = asdict(ucp)
+  ucp_dict = convert_dataclass_to_dict(ucp)
 
   test_file_name = 'test_ucp.json'
 
@@ -40,4 +42,61 @@ class TestUCP(unittest.TestCase):
 
     ucp = UCP.load_from(self.test_file_name)
 
-    assert(asdict(ucp) == self.ucp_dict)
+    assert(convert_dataclass_to_dict(ucp) == self.ucp_dict)
+
+
+class TestUCPBatch(unittest.TestCase):
+  '''
+  tests the batch evaluation of several solutions against the evaluation of single solutions
+  '''
+  ucp = UCP(ExperimentParameters(4, 3),
+    [30, 60, 45, 20], [
+      CombustionPlant(1, 0.5, 0.1, 10, 30, 1, 2),
+      CombustionPlant(2, 1, 0.2, 10, 30, 2, 1, True),
+      CombustionPlant(3, 2, 0.3, 20, 40, 3, 4)
+  ])
+
+  def random_solutions(self, num_solutions: int):
+    rng: np.random.Generator = np.random.default_rng(0)
+    p: np.ndarray = rng.uniform(0, 45, size=(num_solutions, 3, 4)) * (rng.random((num_solutions, 3, 4)) < 0.7)
+    return p > 0, p
+
+  def test_calculate_o(self):
+    u, p = self.random_solutions(50)
+
+    assert_allclose(self.ucp.calculate_o_batch(u, p), [self.ucp.calculate_o(u_s.tolist(), p_s.tolist()) for u_s, p_s in zip(u, p)])
+
+  def test_adjust_variables(self):
+    u, p = self.random_solutions(50)
+    adjusted: np.ndarray = self.ucp.adjust_variables_batch(u, p)
+
+    for u_s, p_s, adjusted_s in zip(u, p, adjusted):
+      solution: UCPSolution = UCPSolution(self.ucp, 0, True, 0, u_s.tolist(), p_s.tolist())
+      solution.adjust_variables()
+
+      assert_allclose(adjusted_s, solution.p)
+
+  def test_from_samples(self):
+    u, p = self.random_solutions(50)
+    solution: UCPSolution = UCPSolution.from_samples(self.ucp, 1, u, p)
+
+    adjusted: np.ndarray = self.ucp.adjust_variables_batch(u, p)
+    o: np.ndarray = self.ucp.calculate_o_batch(u, adjusted)
+    feasible: np.ndarray = self.ucp.get_violations_batch(adjusted) < 1e-9
+
+    self.assertEqual(solution.statistics['num_samples'], 50)
+    self.assertEqual(solution.statistics['num_feasible'], np.count_nonzero(feasible))
+    self.assertAlmostEqual(solution.o, np.min(o[feasible]))
+    assert_array_equal(solution.p, adjusted[solution.statistics['selected_sample']])
+
+  def test_statistics_file(self):
+    u, p = self.random_solutions(5)
+    solution: UCPSolution = UCPSolution.from_samples(self.ucp, 1, u, p)
+    test_file_name: str = 'test_ucp_solution.json'
+
+    solution.save_to(test_file_name)
+    loaded: UCPSolution = UCPSolution.load_from(test_file_name)
+    os.remove(test_file_name)
+
+    self.assertEqual(loaded.statistics, solution.statistics)
+    self.assertEqual(convert_dataclass_to_dict(loaded.ucp), convert_dataclass_to_dict(self.ucp))
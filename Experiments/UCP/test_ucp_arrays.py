@@ -0,0 +1,86 @@
+#!/bin/python
+# version 3.8 required
+
+import json
+import os
+import numpy as np # type: ignore
+from numpy.testing import assert_allclose, assert_array_equal # type: ignore
+import unittest
+
+from UCP.ucp_arrays import UCPArrays, UCPSolutionArrays
+from UCP.unit_commitment_problem import CombustionPlant, ExperimentParameters, UCP, UCPSolution
+from Util.json_file_handler import convert_dataclass_to_dict
+
+
+class TestUCPArrays(unittest.TestCase):
+  '''
+  tests the array representation of UCPs and their solutions
+  '''
+  ucp = UCP(ExperimentParameters(3, 2),
+    [20, 45, 30], [
+      CombustionPlant(1, 0.5, 0.1, 10, 30, 1, 2),
+      CombustionPlant(2, 1, 0.2, 10, 30, 2, 1, True, 'Gas')
+  ])
+
+  solution = UCPSolution(ucp, 1.5, False, 0, [[True, True, False], [False, True, True]], [[20, 35, 0], [0, 5, 30]])
+
+  test_file_name = 'test_ucp_arrays.json'
+
+  def test_calculate_o(self):
+    arrays: UCPArrays = self.ucp.to_arrays()
+
+    # costs of the power outputs, startup of plant 2 at t = 1 and shutdown of plant 1 at t = 2
+    expected: float = (1 + 10 + 40) + (1 + 17.5 + 122.5) + (2 + 5 + 5) + (2 + 30 + 180) + 2 + 2
+    self.assertAlmostEqual(float(arrays.calculate_o(self.solution.u, self.solution.p)), expected)
+
+    startups, shutdowns = arrays.get_startups_shutdowns(self.solution.u)
+    assert_array_equal(startups, [[False, False], [True, False]])
+    assert_array_equal(shutdowns, [[False, True], [False, False]])
+
+  def test_check_validity(self):
+    arrays: UCPSolutionArrays = self.solution.to_arrays()
+
+    # plant 1 exceeds Pmax and plant 2 is below Pmin at t = 1, so the demand of 45 is missed by 5
+    self.assertAlmostEqual(arrays.check_validity(), -15)
+
+  def test_read_only(self):
+    arrays: UCPArrays = self.ucp.to_arrays()
+
+    with self.assertRaises(ValueError):
+      arrays.loads[0] = 0
+
+  def test_file_format(self):
+    self.solution.save_to(self.test_file_name)
+    with open(self.test_file_name, 'r') as file:
+      stored_dict = json.load(file)
+
+    arrays: UCPSolutionArrays = UCPSolutionArrays.load_from(self.test_file_name)
+    arrays.save_to(self.test_file_name)
+    with open(self.test_file_name, 'r') as file:
+      self.assertEqual(json.load(file), stored_dict)
+
+    solution: UCPSolution = UCPSolution.load_from(self.test_file_name)
+    os.remove(self.test_file_name)
+
+    self.assertEqual(convert_dataclass_to_dict(solution), convert_dataclass_to_dict(self.solution))
+    self.assertIsInstance(solution.ucp.plants[0], CombustionPlant)
+    self.assertEqual(convert_dataclass_to_dict(UCPSolution.from_arrays(arrays)), convert_dataclass_to_dict(self.solution))
+
+  def test_old_file_format(self):
+    # result files written before the statistics, traces, timings and metrics were added
+    stored_dict = convert_dataclass_to_dict(self.solution)
+    del stored_dict['statistics']
+    del stored_dict['trace']
+    del stored_dict['timings']
+    del stored_dict['metrics']
+
+    arrays: UCPSolutionArrays = UCPSolutionArrays.from_dict(stored_dict)
+
+    self.assertEqual(arrays.statistics, {})
+    self.assertEqual(arrays.trace, [])
+    self.assertEqual(arrays.timings, {})
+    self.assertEqual(arrays.metrics, {})
+    assert_allclose(arrays.p, self.solution.p)
+
+if __name__ == '__main__':
+  unittest.main()
@@ -0,0 +1,412 @@
+#!/bin/python
+# version 3.8 required
+
+import json
+from dataclasses import asdict
+from typing import Any, Dict, List, Optional, Tuple
+import numpy as np # type: ignore
+
+from UCP.dispatch_cache import DispatchCostCache
+from UCP.economic_dispatch import dispatch
+from Util.logging import debug_msg
+
+
+# names of the coefficients of a combustion plant in the order of the fields of CombustionPlant
+PLANT_COEFFICIENTS: Tuple[str, ...] = ('A', 'B', 'C', 'Pmin', 'Pmax', 'AU', 'AD')
+
+
+class PlantArrays(object):
+  '''
+  holds the parameters of all combustion plants as a struct of arrays with the shape (number of plants,)
+  '''
+  __slots__ = PLANT_COEFFICIENTS + ('initially_on', 'type')
+
+  A: np.ndarray
+  B: np.ndarray
+  C: np.ndarray
+  Pmin: np.ndarray
+  Pmax: np.ndarray
+  AU: np.ndarray # startup costs
+  AD: np.ndarray # shutdown costs
+  initially_on: np.ndarray
+  type: List[str]
+
+  def __init__(self, plants: List[Any]) -> None:
+    '''
+    collects the parameters of combustion plants
+
+    :plants: combustion plants (CombustionPlant instances or their dictionaries)
+    '''
+    records: List[Dict[str, Any]] = [plant if isinstance(plant, dict) else asdict(plant) for plant in plants]
+
+    for name in PLANT_COEFFICIENTS:
+      setattr(self, name, read_only(np.array([record[name] for record in records], dtype=float)))
+
+    self.initially_on = read_only(np.array([record.get('initially_on', False) for record in records], dtype=bool))
+    self.type = [record.get('type', 'None') for record in records]
+
+  def __len__(self) -> int:
+    return len(self.type)
+
+  def column(self, name: str) -> np.ndarray:
+    '''
+    returns a coefficient of all plants with the shape (number of plants, 1)
+    so that it broadcasts against arrays with the shape (..., number of plants, number of loads)
+
+    :name: name of the coefficient
+    '''
+    return getattr(self, name)[:, np.newaxis]
+
+  def get_average_costs(self) -> np.ndarray:
+    '''
+    returns the average costs of every plant at full load (A + B Pmax + C Pmax^2) / Pmax
+    '''
+    full_load_costs: np.ndarray = self.A + self.B * self.Pmax + self.C * self.Pmax ** 2
+    return full_load_costs / np.where(self.Pmax > 0, self.Pmax, 1)
+
+  def get_priority_order(self) -> np.ndarray:
+    '''
+    returns the plant indices ordered by the average costs at full load (priority list)
+    '''
+    return np.argsort(self.get_average_costs(), kind='stable')
+
+  def to_dicts(self) -> List[Dict[str, Any]]:
+    '''
+    returns the plants as dictionaries like asdict(CombustionPlant)
+    '''
+    return [
+      {
+        **{name: float(getattr(self, name)[i]) for name in PLANT_COEFFICIENTS},
+        'initially_on': bool(self.initially_on[i]),
+        'type': self.type[i]
+      }
+      for i in range(len(self))
+    ]
+
+
+class UCPArrays(object):
+  '''
+  holds the parameters of an UCP as arrays
+  solutions are arrays with the shape (..., number of plants, number of loads),
+  so every method evaluates single solutions and batches of solutions alike
+  '''
+  __slots__ = ('parameters', 'loads', 'plants', 'dispatch_cache')
+
+  parameters: Dict[str, Any] # experiment parameters as dictionary
+  loads: np.ndarray # read-only loads with the shape (number of loads,)
+  plants: PlantArrays
+  dispatch_cache: Optional[DispatchCostCache] # cache of the dispatch curves of committed plants (if enabled)
+
+  def __init__(self, parameters: Dict[str, Any], loads: List[float], plants: List[Any]) -> None:
+    '''
+    converts the parameters of an UCP to arrays
+
+    :parameters: experiment parameters as dictionary
+    :loads: load demand at every time
+    :plants: combustion plants
+    '''
+    self.parameters = dict(parameters)
+    self.loads = read_only(np.array(loads, dtype=float))
+    self.plants = PlantArrays(plants)
+    self.dispatch_cache = None
+
+  @staticmethod
+  def from_ucp(ucp: Any):
+    '''
+    converts an UCP instance to arrays
+
+    :ucp: UCP instance
+    '''
+    return UCPArrays(asdict(ucp.parameters), ucp.loads, ucp.plants)
+
+  @staticmethod
+  def from_dict(data: Dict[str, Any]):
+    '''
+    converts the dictionary of an UCP (as stored in files) to arrays
+
+    :data: dictionary of an UCP
+    '''
+    return UCPArrays(data['parameters'], data['loads'], data['plants'])
+
+  def to_dict(self) -> Dict[str, Any]:
+    '''
+    returns the UCP as dictionary like the files written by UCP.save_to
+    '''
+    return {'parameters': dict(self.parameters), 'loads': self.loads.tolist(), 'plants': self.plants.to_dicts()}
+
+  def get_startups_shutdowns(self, u: np.ndarray, include_initial: bool = False) -> Tuple[np.ndarray, np.ndarray]:
+    '''
+    detects startups and shutdowns between the times t - 1 and t for every t > 0
+    returns two arrays with the shape (..., number of plants, number of loads - 1)
+    or (..., number of plants, number of loads) if the transitions from the initial states are included
+
+    :u: commitment of units with the shape (..., number of plants, number of loads)
+    :include_initial: whether the transitions from the initial states of the plants (initially_on) are included
+    '''
+    u = np.asarray(u, dtype=bool)
+
+    if include_initial:
+      initial: np.ndarray = np.broadcast_to(self.plants.initially_on[:, np.newaxis], u.shape[:-1] + (1,))
+      previous: np.ndarray = np.concatenate((initial, u[..., :-1]), axis=-1)
+      return u & ~previous, ~u & previous
+
+    return u[..., 1:] & ~u[..., :-1], ~u[..., 1:] & u[..., :-1]
+
+  def calculate_startup_shutdown_costs(self, u: np.ndarray, include_initial: bool = False) -> np.ndarray:
+    '''
+    calculates the startup and shutdown costs of one or several solutions
+
+    :u: commitment of units with the shape (..., number of plants, number of loads)
+    :include_initial: whether the transitions from the initial states of the plants (initially_on) are included
+    '''
+    startups, shutdowns = self.get_startups_shutdowns(u, include_initial)
+    return np.sum(self.plants.column('AU') * startups + self.plants.column('AD') * shutdowns, axis=(-2, -1))
+
+  def calculate_o(self, u: np.ndarray, p: np.ndarray, include_initial: bool = False) -> np.ndarray:
+    '''
+    calculates the objective function of one or several solutions
+
+    :u: commitment of units with the shape (..., number of plants, number of loads)
+    :p: power output of units with the shape (..., number of plants, number of loads)
+    :include_initial: whether the transitions from the initial states of the plants (initially_on) are included
+    '''
+    plants: PlantArrays = self.plants
+    u = np.asarray(u, dtype=bool)
+    p = np.asarray(p, dtype=float)
+
+    cost: np.ndarray = np.where(u, plants.column('A') + plants.column('B') * p + plants.column('C') * (p ** 2), 0)
+    return np.sum(cost, axis=(-2, -1)) + self.calculate_startup_shutdown_costs(u, include_initial)
+
+  def get_limit_violations(self, p: np.ndarray) -> np.ndarray:
+    '''
+    computes how far the non-zero power outputs are outside the limits of their plant (Pmin, Pmax)
+
+    :p: power output of units with the shape (..., number of plants, number of loads)
+    '''
+    p = np.asarray(p, dtype=float)
+    return np.where(
+      p != 0, np.maximum(self.plants.column('Pmin') - p, 0) + np.maximum(p - self.plants.column('Pmax'), 0), 0
+    )
+
+  def get_demand_violations(self, p: np.ndarray) -> np.ndarray:
+    '''
+    computes how much power is missing to satisfy the load demand at every time
+    returns an array with the shape (..., number of loads)
+
+    :p: power output of units with the shape (..., number of plants, number of loads)
+    '''
+    return np.maximum(self.loads - np.sum(np.asarray(p, dtype=float), axis=-2), 0)
+
+  def get_violations(self, p: np.ndarray) -> np.ndarray:
+    '''
+    computes the sum of all violations of the power plant constraints and the load demand of one or several solutions
+
+    :p: power output of units with the shape (..., number of plants, number of loads)
+    '''
+    return np.sum(self.get_limit_violations(p), axis=(-2, -1)) + np.sum(self.get_demand_violations(p), axis=-1)
+
+  def dispatch(self, u: np.ndarray, p: Optional[np.ndarray] = None) -> np.ndarray:
+    '''
+    computes the cost-optimal power outputs of the committed plants of one or several solutions (economic dispatch)
+    of power outputs with equal costs the ones closest to p are chosen
+
+    :u: commitment of units with the shape (..., number of plants, number of loads)
+    :p: power output of units with the shape (..., number of plants, number of loads), default: 0
+    '''
+    if self.dispatch_cache is not None:
+      return self.dispatch_cache.dispatch(self.loads, u, p)
+
+    plants: PlantArrays = self.plants
+    return dispatch(plants.column('B'), plants.column('C'), plants.column('Pmin'), plants.column('Pmax'), self.loads, u, p)
+
+  def enable_dispatch_cache(self, max_size: int = 1024) -> DispatchCostCache:
+    '''
+    caches the dispatch curves of the sets of committed plants for repeated dispatches and evaluations
+    returns the cache
+
+    :max_size: maximum number of cached sets of committed plants
+    '''
+    if self.dispatch_cache is None:
+      plants: PlantArrays = self.plants
+      self.dispatch_cache = DispatchCostCache(plants.A, plants.B, plants.C, plants.Pmin, plants.Pmax, max_size)
+
+    return self.dispatch_cache
+
+  def calculate_dispatched_o(self, u: np.ndarray, include_initial: bool = False) -> np.ndarray:
+    '''
+    calculates the objective function of one or several commitments with cost-optimal power outputs
+    uses the dispatch cache (it is enabled if necessary)
+
+    :u: commitment of units with the shape (..., number of plants, number of loads)
+    :include_initial: whether the transitions from the initial states of the plants (initially_on) are included
+    '''
+    u = np.asarray(u, dtype=bool)
+    costs: np.ndarray = self.enable_dispatch_cache().get_costs(self.loads, u)
+
+    return np.sum(costs, axis=-1) + self.calculate_startup_shutdown_costs(u, include_initial)
+
+  def adjust_variables(self, u: np.ndarray, p: np.ndarray) -> np.ndarray:
+    '''
+    adjusts the power outputs of one or several solutions to meet the load demand with minimal costs
+    returns the adjusted power outputs
+
+    :u: commitment of units with the shape (..., number of plants, number of loads)
+    :p: power output of units with the shape (..., number of plants, number of loads)
+    '''
+    return self.dispatch(u, p)
+
+
+class UCPSolutionArrays(object):
+  '''
+  holds a solution of an UCP as arrays with the shape (number of plants, number of loads)
+  stored in the same file format as UCPSolution
+  '''
+  __slots__ = ('ucp', 'time', 'optimal', 'o', 'u', 'p', 'statistics', 'trace', 'timings', 'metrics')
+
+  ucp: UCPArrays
+  time: float
+  optimal: bool
+  o: float
+  u: np.ndarray
+  p: np.ndarray
+  statistics: Dict[str, Any]
+  trace: List[List[float]]
+  timings: Dict[str, Dict[str, float]]
+  metrics: Dict[str, Any]
+
+  def __init__(self, ucp: UCPArrays, time: float, optimal: bool, o: float, u: np.ndarray, p: np.ndarray,
+               statistics: Optional[Dict[str, Any]] = None, trace: Optional[List[List[float]]] = None,
+               timings: Optional[Dict[str, Dict[str, float]]] = None, metrics: Optional[Dict[str, Any]] = None) -> None:
+    '''
+    stores a solution of an UCP
+
+    :ucp: UCP as arrays
+    :time: run time of the solver
+    :optimal: whether the solution is optimal
+    :o: objective function of the solution
+    :u: commitment of units
+    :p: power output of units
+    :statistics: summary of all samples the solution was selected from
+    :trace: time, objective function of the incumbent and bound when they changed
+    :timings: wall-clock and CPU time in seconds of every phase
+    :metrics: size of the encoded model and memory usage of every phase
+    '''
+    self.ucp = ucp
+    self.time = time
+    self.optimal = optimal
+    self.o = o
+    self.u = np.array(u, dtype=bool)
+    self.p = np.array(p, dtype=float)
+    self.statistics = {} if statistics is None else statistics
+    self.trace = [] if trace is None else trace
+    self.timings = {} if timings is None else timings
+    self.metrics = {} if metrics is None else metrics
+
+  @staticmethod
+  def from_solution(solution: Any):
+    '''
+    converts an UCPSolution instance to arrays
+
+    :solution: UCPSolution instance
+    '''
+    return UCPSolutionArrays(
+      solution.ucp.to_arrays(), solution.time, solution.optimal, solution.o,
+      solution.u, solution.p, dict(solution.statistics), [list(entry) for entry in solution.trace],
+      {name: dict(phase) for name, phase in solution.timings.items()}, dict(solution.metrics)
+    )
+
+  @staticmethod
+  def from_dict(data: Dict[str, Any]):
+    '''
+    converts the dictionary of an UCPSolution (as stored in files) to arrays
+
+    :data: dictionary of an UCPSolution
+    '''
+    return UCPSolutionArrays(
+      UCPArrays.from_dict(data['ucp']), data['time'], data['optimal'], data['o'],
+      data['u'], data['p'], data.get('statistics', {}), data.get('trace', []), data.get('timings', {}),
+      data.get('metrics', {})
+    )
+
+  def to_dict(self) -> Dict[str, Any]:
+    '''
+    returns the solution as dictionary like the files written by UCPSolution.save_to
+    '''
+    return {
+      'ucp': self.ucp.to_dict(),
+      'time': self.time,
+      'optimal': self.optimal,
+      'o': float(self.o),
+      'u': self.u.tolist(),
+      'p': self.p.tolist(),
+      'statistics': self.statistics,
+      'trace': self.trace,
+      'timings': self.timings,
+      'metrics': self.metrics
+    }
+
+  def save_to(self, file_name: str) -> None:
+    '''
+    saves the solution to a file in the format of UCPSolution
+
+    :file_name: file to write to
+    '''
+    with open(file_name, 'w') as file:
+      json.dump(self.to_dict(), file, ensure_ascii=False, indent=4)
+
+  @staticmethod
+  def load_from(file_name: str):
+    '''
+    loads a solution from a file written by UCPSolution or UCPSolutionArrays
+
+    :file_name: file to read from
+    '''
+    with open(file_name, 'r') as file:
+      return UCPSolutionArrays.from_dict(json.load(file))
+
+  def calculate_o(self) -> float:
+    '''
+    calculates the objective function of the solution
+    '''
+    return float(self.ucp.calculate_o(self.u, self.p))
+
+  def check_validity(self) -> float:
+    '''
+    checks the validity of the solution
+    prints violations of power plant constraints (Pmin, Pmax) and load demand (lt)
+    returns the quality of the solution (negative sum of all violations)
+    '''
+    limits: np.ndarray = self.ucp.get_limit_violations(self.p)
+    demand: np.ndarray = self.ucp.get_demand_violations(self.p)
+    combined_output: np.ndarray = np.sum(self.p, axis=0)
+
+    for t in np.nonzero(np.any(limits > 0, axis=0) | (demand > 0))[0]:
+      for i in np.nonzero(limits[:, t] > 0)[0]:
+        debug_msg('p {:3d}, {:3d}:\t{:4.2f} <= {:4.2f} <= {:4.2f}'.format(
+          i, t, self.ucp.plants.Pmin[i], self.p[i, t], self.ucp.plants.Pmax[i]))
+
+      if demand[t] > 0:
+        debug_msg('sum p {:3d}:\t{:4.2f} <= {:4.2f} - off {:4.2f}'.format(
+          t, self.ucp.loads[t], combined_output[t], -demand[t]))
+
+    quality: float = -float(np.sum(limits) + np.sum(demand))
+    debug_msg('Quality:\t{:12.2f}'.format(quality))
+
+    return quality
+
+  def adjust_variables(self) -> None:
+    '''
+    adjusts the power outputs if necessary and recalculates the objective function
+    '''
+    self.p = self.ucp.adjust_variables(self.u, self.p)
+    self.o = self.calculate_o()
+
+
+def read_only(array: np.ndarray) -> np.ndarray:
+  '''
+  marks an array as read-only and returns it
+
+  :array: array to protect
+  '''
+  array.setflags(write=False)
+  return array
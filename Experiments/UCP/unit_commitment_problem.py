@@ -2,13 +2,15 @@
 
 import os
 from dataclasses import dataclass, field
-import functools
-from typing import List
+from typing import Any, Dict, List, Optional
 import numpy as np # type: ignore
 import math
 
-from Util.json_file_handler import write_dataclass_to, read_dataclass_from
-from Util.logging import debug_msg_time, debug_msg
+from UCP.dispatch_cache import DispatchCostCache
+from UCP.ucp_arrays import UCPArrays, UCPSolutionArrays
+from Util.json_file_handler import convert_dict_to_datclass, write_dataclass_to, read_dataclass_from
+from Util.logging import debug_msg_time
+from Util.timing import Timings
 
 
 @dataclass
@@ -68,6 +70,12 @@ class UCP(object):
   parameters: ExperimentParameters
   loads: List[float]
   plants: List[CombustionPlant] = field(default_factory=list)
+  arrays: Optional[UCPArrays] = field(init=False, repr=False, compare=False, default=None) # cache of to_arrays
+
+  def __post_init__(self) -> None:
+    # plants read from files are dictionaries
+    self.plants = [CombustionPlant(**plant) if isinstance(plant, dict) else plant for plant in self.plants]
+    self.arrays = None
 
   def save_to(self, file_name) -> None:
     write_dataclass_to(self, file_name)
@@ -102,27 +110,67 @@ class UCP(object):
 
     return P
 
-  def calculate_o(self, u: List[List[bool]], p: List[List[float]]) -> float:
+  def to_arrays(self) -> UCPArrays:
+    '''
+    returns the parameters of the UCP as arrays
+    the arrays (and their dispatch cache) are built once, UCPs with other loads or plants are created
+    with dataclasses.replace (like UCP_MINLP.update_loads), which starts with an empty cache
+    '''
+    if self.arrays is None:
+      self.arrays = UCPArrays.from_ucp(self)
+
+    return self.arrays
+
+  def enable_dispatch_cache(self, max_size: int = 1024) -> DispatchCostCache:
+    '''
+    caches the dispatch curves of the sets of committed plants,
+    so that repeated evaluations and adjustments of the same commitments only search the curves
+    returns the cache
+
+    :max_size: maximum number of cached sets of committed plants
+    '''
+    return self.to_arrays().enable_dispatch_cache(max_size)
+
+  def calculate_o(self, u: List[List[bool]], p: Optional[List[List[float]]] = None) -> float:
     '''
     calculates the objective function
+    if no power outputs are given, the cost-optimal power outputs of the committed units are used
 
     :u: commitment of units with index i, t
     :p: power output of units with index i, t
     '''
-    o: float = 0
+    if p is None:
+      return float(self.to_arrays().calculate_dispatched_o(u))
+
+    return float(self.to_arrays().calculate_o(u, p))
+
+  def calculate_o_batch(self, u: np.ndarray, p: np.ndarray) -> np.ndarray:
+    '''
+    calculates the objective function of several solutions at once
+
+    :u: commitment of units with the shape (number of solutions, number of plants, number of loads)
+    :p: power output of units with the shape (number of solutions, number of plants, number of loads)
+    '''
+    return self.to_arrays().calculate_o(u, p)
 
-    for i in range(self.parameters.num_plants):
-      plant: CombustionPlant = self.plants[i]
-      for t in range(self.parameters.num_loads):
-        if u[i][t]:
-          o += plant.A + plant.B * p[i][t] + plant.C * (p[i][t] ** 2)
+  def get_violations_batch(self, p: np.ndarray) -> np.ndarray:
+    '''
+    computes the violations of the power plant constraints (Pmin, Pmax) and the load demand
+    of several solutions like UCPSolution.check_validity
 
-        if t > 0 and u[i][t] and not u[i][t-1]:
-          o += plant.AU
-        elif t > 0 and not u[i][t] and u[i][t-1]:
-          o += plant.AD
+    :p: power output of units with the shape (number of solutions, number of plants, number of loads)
+    '''
+    return self.to_arrays().get_violations(p)
 
-    return o
+  def adjust_variables_batch(self, u: np.ndarray, p: np.ndarray) -> np.ndarray:
+    '''
+    adjusts the power outputs of several solutions at once like UCPSolution.adjust_variables
+    returns the adjusted power outputs
+
+    :u: commitment of units with the shape (number of solutions, number of plants, number of loads)
+    :p: power output of units with the shape (number of solutions, number of plants, number of loads)
+    '''
+    return self.to_arrays().adjust_variables(u, p)
 
 @dataclass
 class UCPSolution(object):
@@ -135,6 +183,57 @@ class UCPSolution(object):
   o: float
   u: List[List[bool]]
   p: List[List[float]]
+  statistics: Dict[str, Any] = field(default_factory=dict) # summary of all samples the solution was selected from
+  trace: List[List[float]] = field(default_factory=list) # time, objective function of the incumbent and bound when they changed
+  timings: Dict[str, Dict[str, float]] = field(default_factory=dict) # wall-clock and CPU time in seconds of every phase
+  metrics: Dict[str, Any] = field(default_factory=dict) # size of the encoded model and memory usage of every phase
+
+  @staticmethod
+  def from_samples(ucp: UCP, time: float, u: np.ndarray, p: np.ndarray, adjust: bool = True):
+    '''
+    selects the best solution of several samples of a solver
+    the samples are adjusted (if specified) and the feasible sample with the lowest objective function is chosen
+    if no sample is feasible, the sample with the smallest violation is chosen
+    of samples with the same quality the first one is chosen
+
+    :ucp: UCP instance
+    :time: run time of the solver
+    :u: commitment of units with the shape (number of samples, number of plants, number of loads)
+    :p: power output of units with the shape (number of samples, number of plants, number of loads)
+    :adjust: whether the samples should be adjusted to meet power demand at all times
+    '''
+    u = np.asarray(u, dtype=bool)
+    p = np.asarray(p, dtype=float)
+
+    if adjust:
+      p = ucp.adjust_variables_batch(u, p)
+
+    o: np.ndarray = ucp.calculate_o_batch(u, p)
+    violations: np.ndarray = ucp.get_violations_batch(p)
+    feasible: np.ndarray = violations <= 1e-9 * max(1., float(np.max(np.abs(ucp.loads), initial=0)))
+
+    # lexicographic order: feasibility, violation (only of infeasible samples), objective function, sample index
+    best: int = int(np.lexsort((o, np.where(feasible, 0, violations), ~feasible))[0])
+
+    statistics: Dict[str, Any] = {
+      'num_samples': int(len(o)),
+      'num_feasible': int(np.count_nonzero(feasible)),
+      'selected_sample': best,
+      'o_min': float(np.min(o)),
+      'o_mean': float(np.mean(o)),
+      'o_max': float(np.max(o)),
+      'violation_min': float(np.min(violations)),
+      'violation_mean': float(np.mean(violations))
+    }
+
+    if np.any(feasible):
+      statistics['o_feasible_mean'] = float(np.mean(o[feasible]))
+
+    cache: Optional[DispatchCostCache] = ucp.to_arrays().dispatch_cache
+    if cache is not None:
+      statistics['dispatch_cache'] = cache.get_statistics()
+
+    return UCPSolution(ucp, time, True, float(o[best]), u[best].tolist(), p[best].tolist(), statistics)
 
   def save_to(self, file_name) -> None:
     '''
@@ -154,6 +253,21 @@ class UCPSolution(object):
     return read_dataclass_from(file_name, UCPSolution)
 
 
+  def to_arrays(self) -> UCPSolutionArrays:
+    '''
+    returns the solution as arrays
+    '''
+    return UCPSolutionArrays.from_solution(self)
+
+  @staticmethod
+  def from_arrays(solution: UCPSolutionArrays):
+    '''
+    converts a solution stored as arrays back
+
+    :solution: solution as arrays
+    '''
+    return convert_dict_to_datclass(solution.to_dict(), UCPSolution)
+
   def check_validity(self) -> None:
     '''
     checks the validity of the UCP solution
@@ -161,68 +275,18 @@ class UCPSolution(object):
     '''
     debug_msg_time('Start Checking Validity of Solution\n')
 
-    quality: float = 0
-
-    for t in range(self.ucp.parameters.num_loads):
-      combined_output: float = 0
+    timings: Timings = Timings()
+    with timings.phase('check_validity'):
+      self.to_arrays().check_validity()
 
-      for i in range(self.ucp.parameters.num_plants):
-        p: float = self.p[i][t]
-        Pmin: float = self.ucp.plants[i].Pmin
-        Pmax: float = self.ucp.plants[i].Pmax
-
-        if not Pmin <= p <= Pmax and p != 0:
-          # power output of power plant i is not in limits of power plant at time t
-          quality += p - Pmin if p < Pmin else Pmax - p
-          debug_msg('p {:3d}, {:3d}:\t{:4.2f} <= {:4.2f} <= {:4.2f}'.format(i, t, Pmin, p, Pmax))
-
-        combined_output += p
-
-      l = self.ucp.loads[t]
-      if l > combined_output:
-        # combined power output does not satisfy demand at time t
-        quality += combined_output - l
-        debug_msg('sum p {:3d}:\t{:4.2f} <= {:4.2f} - off {:4.2f}'.format(t, l, combined_output, combined_output - l))
-
-    debug_msg('Quality:\t{:12.2f}'.format(quality))
+    self.timings = {**self.timings, **timings.to_dict()}
 
   def adjust_variables(self) -> None:
     '''
     adjusts the power outputs if necessary
     '''
-    for t in range(self.ucp.parameters.num_loads):
-      # set adjust bool for every power plant that is active
-      adjust: List[bool] = [self.u[i][t] for i in range(self.ucp.parameters.num_plants)]
-      # compute the power that is missing or too much
-      delta: float = self.ucp.loads[t] - sum([self.p[i][t] for i in range(self.ucp.parameters.num_plants)])
-
-      while True:
-        if delta == 0 or not functools.reduce(lambda a,b: a or b, adjust):
-          # repeat the loop until either the demand is met (delta == 0)
-          # or no plant can be adjusted anymore
-          break
-
-        adjustment: float = delta / sum([1 if b else 0 for b in adjust])
-        delta = 0
-
-        for i in range(self.ucp.parameters.num_plants):
-          if adjust[i]:
-            # add a portion of the delta to every power output
-            self.p[i][t] += adjustment
-            Pmax: float = self.ucp.plants[i].Pmax
-            Pmin: float = self.ucp.plants[i].Pmin
-
-            # if the power output violates the limits of the power plant
-            # set it to the limit and add the difference to the delta again
-            if self.p[i][t] > Pmax:
-              delta += self.p[i][t] - Pmax
-              self.p[i][t] = Pmax
-              adjust[i] = False
-
-            elif self.p[i][t] < Pmin:
-              delta += self.p[i][t] - Pmin
-              self.p[i][t] = Pmin
-              adjust[i] = False
-
-    # recalculate the objective function
-    self.o = self.ucp.calculate_o(self.u, self.p)
+    solution: UCPSolutionArrays = self.to_arrays()
+    solution.adjust_variables()
+
+    self.p = solution.p.tolist()
+    self.o = solution.o
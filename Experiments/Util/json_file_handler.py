@@ -1,13 +1,32 @@
 #!/bin/python
 # version 3.8 required
 
+import copy
 import json
-from dataclasses import asdict
+from dataclasses import fields, is_dataclass
 from typing import Any, Dict
 
 # NOTE: Functions only work on/with dataclasses
 #       static type checking is not supported
 
+def convert_dataclass_to_dict(data: Any) -> Any:
+  '''
+  converts a dataclass to a dictionary like dataclasses.asdict,
+  fields that are not passed to the constructor (for example caches) are left out
+
+  :data: data to convert
+  '''
+  if is_dataclass(data) and not isinstance(data, type):
+    return {field.name: convert_dataclass_to_dict(getattr(data, field.name)) for field in fields(data) if field.init}
+
+  if isinstance(data, (list, tuple)):
+    return type(data)(convert_dataclass_to_dict(value) for value in data)
+
+  if isinstance(data, dict):
+    return {key: convert_dataclass_to_dict(value) for key, value in data.items()}
+
+  return copy.deepcopy(data)
+
 def write_dataclass_to(data: Any, file_name: str) -> None:
   '''
   writes a dataclass to a file
@@ -16,7 +35,7 @@ def write_dataclass_to(data: Any, file_name: str) -> None:
   :file_name: file to write to
   '''
   with open(file_name, 'w') as file:
-    json.dump(asdict(data), file, ensure_ascii=False, indent=4)
+    json.dump(convert_dataclass_to_dict(data), file, ensure_ascii=False, indent=4)
 
 def convert_dict_to_datclass(dict: Dict, Dataclass) -> Any:
   '''
@@ -26,7 +45,7 @@ def convert_dict_to_datclass(dict: Dict, Dataclass) -> Any:
   :Dataclass: type of dataclass
   '''
   for key in dict:
-    if isinstance(dict[key], Dict) and not Dataclass.__annotations__[key] == dict:
+    if isinstance(dict[key], Dict) and is_dataclass(Dataclass.__annotations__[key]):
       dict[key] = convert_dict_to_datclass(dict[key], Dataclass.__annotations__[key])
 
   return Dataclass(**dict)
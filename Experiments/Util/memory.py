@@ -0,0 +1,72 @@
+#!/bin/python
+# version 3.8 required
+
+from contextlib import contextmanager
+import sys
+import tracemalloc
+from typing import Dict, Iterator
+
+try:
+  import resource
+except ImportError: # not available on Windows
+  resource = None # type: ignore
+
+
+def get_peak_rss() -> int:
+  '''
+  returns the peak resident memory of this process in bytes (-1 if it is not available)
+  '''
+  if resource is None:
+    return -1
+
+  peak: int = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+  # Linux reports kilobytes, macOS bytes
+  return peak if sys.platform == 'darwin' else peak * 1024
+
+
+class MemoryUsage(object):
+  '''
+  collects the memory usage (in bytes) of the phases of an experiment
+  the peak resident memory is the high-water mark of the process at the end of the phase,
+  the traced memory is only measured if tracemalloc is tracing
+  '''
+  phases: Dict[str, Dict[str, int]] # memory usage of every phase by name
+
+  def __init__(self) -> None:
+    self.phases = {}
+
+  @contextmanager
+  def phase(self, name: str) -> Iterator[None]:
+    '''
+    measures the memory used inside the context as a phase
+
+    :name: name of the phase
+    '''
+    tracing: bool = tracemalloc.is_tracing()
+
+    if tracing:
+      # tracemalloc.reset_peak requires Python 3.9, otherwise the peak since the start of tracing is used
+      if hasattr(tracemalloc, 'reset_peak'):
+        tracemalloc.reset_peak()
+      traced_start: int = tracemalloc.get_traced_memory()[0]
+
+    try:
+      yield
+
+    finally:
+      phase: Dict[str, int] = self.phases.setdefault(name, {})
+      phase['peak_rss'] = get_peak_rss()
+
+      if tracing and tracemalloc.is_tracing():
+        traced, traced_peak = tracemalloc.get_traced_memory()
+
+        # memory allocated in the phase that is still held and the largest amount held at once during the phase
+        phase['traced'] = phase.get('traced', 0) + traced - traced_start
+        phase['traced_peak'] = max(phase.get('traced_peak', 0), traced_peak - traced_start)
+
+  def to_dict(self) -> Dict[str, Dict[str, int]]:
+    '''
+    returns a copy of the memory usage of all phases
+    '''
+    return {name: dict(phase) for name, phase in self.phases.items()}
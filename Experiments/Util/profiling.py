@@ -0,0 +1,147 @@
+#!/bin/python
+# version 3.8 required
+
+import cProfile
+import glob
+import io
+import os
+import pstats
+from typing import List, Optional, Set
+
+'''
+this file holds the opt-in profiling of the phases of experiments
+the phases measured with Util.timing.Timings (for example build, solve, decode and adjust) are profiled with cProfile
+while a profiler is active, if no profiler is active the phases only check for it
+'''
+
+# environment variable holding the comma-separated phases that are profiled ('all' for all phases)
+PROFILE_VARIABLE: str = 'UCP_PROFILE'
+
+# phases of the encoders that are profiled by default
+DEFAULT_PHASES: str = 'build,solve,decode,adjust'
+
+# file extension of the profiles
+PROFILE_EXTENSION: str = '.prof'
+
+
+class PhaseProfiler(object):
+  '''
+  profiles selected phases with cProfile, the profile of phases that are entered several times is accumulated
+  '''
+  phases: Optional[Set[str]] # names of the profiled phases (None for all phases)
+  profile: cProfile.Profile
+  depth: int # number of profiled phases that are entered (phases can be nested)
+
+  def __init__(self, phases: Optional[Set[str]] = None) -> None:
+    '''
+    :phases: names of the profiled phases, default: all phases
+    '''
+    self.phases = phases
+    self.profile = cProfile.Profile()
+    self.depth = 0
+
+  def enable(self, name: str) -> None:
+    '''
+    starts profiling when a profiled phase is entered
+
+    :name: name of the phase
+    '''
+    if self.phases is not None and name not in self.phases:
+      return
+
+    if self.depth == 0:
+      self.profile.enable()
+    self.depth += 1
+
+  def disable(self, name: str) -> None:
+    '''
+    stops profiling when the outermost profiled phase is left
+
+    :name: name of the phase
+    '''
+    if self.phases is not None and name not in self.phases:
+      return
+
+    self.depth -= 1
+    if self.depth == 0:
+      self.profile.disable()
+
+  def dump(self, file_name: str) -> None:
+    '''
+    writes the profile to a file (in the format of pstats)
+
+    :file_name: name of the file
+    '''
+    self.profile.dump_stats(file_name)
+
+
+# profiler of the phases of this process (None if profiling is disabled)
+active: Optional[PhaseProfiler] = None
+
+def get_profiled_phases() -> Optional[Set[str]]:
+  '''
+  returns the phases that are profiled as given by the environment variable UCP_PROFILE
+  returns None if profiling is disabled and an empty set if all phases are profiled
+  '''
+  value: str = os.environ.get(PROFILE_VARIABLE, '').strip()
+
+  if not value:
+    return None
+  if value == 'all':
+    return set()
+
+  return {phase.strip() for phase in value.split(',') if phase.strip()}
+
+def start_profiling(phases: Set[str]) -> PhaseProfiler:
+  '''
+  activates a new profiler for the phases of this process
+
+  :phases: names of the profiled phases (all phases if empty)
+  '''
+  global active
+  active = PhaseProfiler(phases or None)
+
+  return active
+
+def stop_profiling() -> None:
+  '''
+  deactivates the profiler of this process
+  '''
+  global active
+  active = None
+
+def summarize_profiles(file_names: List[str], top: int = 30) -> str:
+  '''
+  returns the functions with the highest cumulative and internal time over several profiles
+
+  :file_names: names of the profile files
+  :top: number of functions that are listed
+  '''
+  stream: io.StringIO = io.StringIO()
+  stats: pstats.Stats = pstats.Stats(*file_names, stream=stream)
+
+  stream.write('{} profiles\n\n'.format(len(file_names)))
+  stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(top)
+  stats.sort_stats(pstats.SortKey.TIME).print_stats(top)
+
+  return stream.getvalue()
+
+def write_profile_summary(path: str, prefix: str, top: int = 30) -> Optional[str]:
+  '''
+  writes the summary of all profiles of the experiments with a prefix to a text file next to them
+  returns the name of the summary file (None if there are no profiles)
+
+  :path: the path where the results and profiles are stored
+  :prefix: the name prefix for the result files
+  :top: number of functions that are listed
+  '''
+  file_names: List[str] = sorted(glob.glob(os.path.join(glob.escape(path), '{}_*{}'.format(prefix, PROFILE_EXTENSION))))
+
+  if not file_names:
+    return None
+
+  summary_file_name: str = os.path.join(path, '{}_profile_summary.txt'.format(prefix))
+  with open(summary_file_name, 'w') as file:
+    file.write(summarize_profiles(file_names, top))
+
+  return summary_file_name
@@ -0,0 +1,68 @@
+#!/bin/python
+# version 3.8 required
+
+import pstats
+import time
+import unittest
+
+from Util import profiling
+from Util.timing import Timings
+
+
+class TestTimings(unittest.TestCase):
+  '''
+  tests the timing of phases
+  '''
+
+  def test_phases(self):
+    timings: Timings = Timings()
+
+    with timings.phase('sleep'):
+      time.sleep(0.01)
+    with timings.phase('sleep'):
+      time.sleep(0.01)
+
+    self.assertGreaterEqual(timings.get_wall('sleep'), 0.02)
+    self.assertLess(timings.to_dict()['sleep']['cpu'], timings.get_wall('sleep'))
+    self.assertEqual(timings.get_wall('missing'), 0)
+
+  def test_exception(self):
+    timings: Timings = Timings()
+
+    with self.assertRaises(ValueError):
+      with timings.phase('fail'):
+        raise ValueError()
+
+    self.assertEqual(set(timings.to_dict()), {'fail'})
+
+  def test_copy(self):
+    timings: Timings = Timings()
+    timings.add('build', 1, 0.5)
+
+    phases = timings.to_dict()
+    timings.add('build', 1, 0.5)
+
+    self.assertEqual(phases, {'build': {'wall': 1, 'cpu': 0.5}})
+    self.assertEqual(timings.to_dict(), {'build': {'wall': 2, 'cpu': 1}})
+
+  def test_profiling(self):
+    timings: Timings = Timings()
+    profiler: profiling.PhaseProfiler = profiling.start_profiling({'solve'})
+
+    try:
+      with timings.phase('solve'):
+        with timings.phase('decode'):
+          time.sleep(0)
+      with timings.phase('build'):
+        time.perf_counter_ns()
+
+    finally:
+      profiling.stop_profiling()
+
+    functions: str = ' '.join(function for _, _, function in pstats.Stats(profiler.profile).stats)
+    self.assertIn('sleep', functions)
+    self.assertNotIn('perf_counter_ns', functions)
+    self.assertEqual(profiler.depth, 0)
+
+if __name__ == '__main__':
+  unittest.main()
@@ -0,0 +1,69 @@
+#!/bin/python
+# version 3.8 required
+
+from contextlib import contextmanager
+import time
+from typing import Dict, Iterator, Optional
+
+from Util import profiling
+
+
+class Timings(object):
+  '''
+  collects the wall-clock and CPU time (in seconds) of the phases of an experiment
+  the times of phases that are entered several times are added up
+  the phases are profiled if a profiler is active (see Util.profiling)
+  '''
+  phases: Dict[str, Dict[str, float]] # wall-clock and CPU time of every phase by name
+
+  def __init__(self) -> None:
+    self.phases = {}
+
+  @contextmanager
+  def phase(self, name: str) -> Iterator[None]:
+    '''
+    measures the time spent inside the context as a phase
+
+    :name: name of the phase
+    '''
+    profiler: Optional[profiling.PhaseProfiler] = profiling.active
+    if profiler is not None:
+      profiler.enable(name)
+
+    wall_start: float = time.perf_counter()
+    cpu_start: float = time.process_time()
+
+    try:
+      yield
+
+    finally:
+      self.add(name, time.perf_counter() - wall_start, time.process_time() - cpu_start)
+
+      if profiler is not None:
+        profiler.disable(name)
+
+  def add(self, name: str, wall: float, cpu: float) -> None:
+    '''
+    adds time to a phase
+
+    :name: name of the phase
+    :wall: wall-clock time in seconds
+    :cpu: CPU time of this process in seconds
+    '''
+    phase: Dict[str, float] = self.phases.setdefault(name, {'wall': 0., 'cpu': 0.})
+    phase['wall'] += wall
+    phase['cpu'] += cpu
+
+  def get_wall(self, name: str) -> float:
+    '''
+    returns the wall-clock time of a phase (0 if it was not measured)
+
+    :name: name of the phase
+    '''
+    return self.phases.get(name, {'wall': 0.})['wall']
+
+  def to_dict(self) -> Dict[str, Dict[str, float]]:
+    '''
+    returns a copy of the times of all phases
+    '''
+    return {name: dict(phase) for name, phase in self.phases.items()}